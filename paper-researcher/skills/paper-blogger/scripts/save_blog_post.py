@@ -14,15 +14,24 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import os
 import re
 import sys
 import tempfile
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 # Constants
-ARXIV_ID_PATTERN = re.compile(r"^\d{4}\.\d{4,5}$")
+ARXIV_ID_PATTERN = re.compile(r"\d{4}\.\d{4,5}")
+ARXIV_ID_MIN_LENGTH = 9  # YYMM.NNNN
+ARXIV_ID_MAX_LENGTH = 10  # YYMM.NNNNN
 
 # Configure logging
 logging.basicConfig(
@@ -33,6 +42,60 @@ logging.basicConfig(
 logger = logging.getLogger("save_blog_post")
 
 
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed.
+
+    Args:
+        data: Raw UTF-8 encoded JSON document
+
+    Returns:
+        Parsed JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a value to indented UTF-8 JSON, using orjson when it is installed.
+
+    Args:
+        obj: JSON-serializable value
+
+    Returns:
+        Encoded JSON document (2-space indent, non-ASCII preserved)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Atomically replace a file with pre-serialized content.
+
+    The payload is handed to a temp file in the target directory in one
+    write and then renamed over the destination, so readers never observe
+    a partially written file.
+
+    Args:
+        path: Destination file path
+        data: Complete file contents
+
+    Raises:
+        OSError: If the temp file cannot be written or renamed
+    """
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp", prefix=f".{path.stem}_")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        tmp_path = None
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
 def validate_arxiv_id(paper_id: str) -> bool:
     """Validate that paper_id matches expected arXiv ID format.
 
@@ -42,7 +105,10 @@ def validate_arxiv_id(paper_id: str) -> bool:
     Returns:
         True if valid arXiv ID format, False otherwise
     """
-    return bool(ARXIV_ID_PATTERN.match(paper_id))
+    # Length check rejects oversized input before running the regex
+    if not ARXIV_ID_MIN_LENGTH <= len(paper_id) <= ARXIV_ID_MAX_LENGTH:
+        return False
+    return ARXIV_ID_PATTERN.fullmatch(paper_id) is not None
 
 
 def load_metadata(paper_id: str, data_dir: Path) -> dict[str, Any] | None:
@@ -66,8 +132,12 @@ def load_metadata(paper_id: str, data_dir: Path) -> dict[str, Any] | None:
         return None
 
     try:
-        with metadata_path.open("r", encoding="utf-8") as f:
-            return json.load(f)  # type: ignore[no-any-return]
+        data = metadata_path.read_bytes()
+        # Metadata is always a JSON object; reject anything else before parsing
+        if not data.lstrip().startswith(b"{"):
+            logger.error("Metadata file is not a JSON object: %s", metadata_path)
+            return None
+        return _json_loads(data)  # type: ignore[no-any-return]
     except json.JSONDecodeError as e:
         logger.error("Invalid JSON in metadata file: %s", e)
         return None
@@ -76,12 +146,12 @@ def load_metadata(paper_id: str, data_dir: Path) -> dict[str, Any] | None:
         return None
 
 
-def save_blog_post(paper_id: str, content: str, data_dir: Path) -> Path | None:
+def save_blog_post(paper_id: str, content: str | bytes, data_dir: Path) -> Path | None:
     """Save blog post content to file.
 
     Args:
         paper_id: The arXiv paper ID
-        content: Blog post content in markdown
+        content: Blog post content in markdown, as text or UTF-8 encoded bytes
         data_dir: Data directory path
 
     Returns:
@@ -96,43 +166,24 @@ def save_blog_post(paper_id: str, content: str, data_dir: Path) -> Path | None:
 
     blog_path = blog_dir / f"{paper_id}.md"
 
-    tmp_path: Path | None = None
     try:
-        # Atomic write using temp file
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            dir=blog_dir,
-            suffix=".md",
-            delete=False,
-            encoding="utf-8",
-        ) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(content)
-
-        # Atomic rename
-        tmp_path.replace(blog_path)
-        tmp_path = None  # Clear so finally block doesn't try to delete
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        _atomic_write_bytes(blog_path, data)
         logger.info("Saved blog post for paper %s to %s", paper_id, blog_path)
         return blog_path
 
     except OSError as e:
         logger.error("Failed to save blog post: %s", e)
         return None
-    finally:
-        # Clean up temp file if it still exists
-        if tmp_path is not None and tmp_path.exists():
-            try:
-                tmp_path.unlink()
-            except OSError:
-                pass
 
 
-def update_metadata(paper_id: str, data_dir: Path) -> bool:
+def update_metadata(paper_id: str, data_dir: Path, now: str | None = None) -> bool:
     """Update has_blog_post status in paper's metadata.json.
 
     Args:
         paper_id: The arXiv paper ID
         data_dir: Data directory path
+        now: ISO timestamp to record (defaults to the current local time)
 
     Returns:
         True if update successful, False otherwise
@@ -148,31 +199,15 @@ def update_metadata(paper_id: str, data_dir: Path) -> bool:
         logger.error("Metadata file not found: %s", metadata_path)
         return False
 
-    tmp_path: Path | None = None
     try:
         # Load existing metadata
-        with metadata_path.open("r", encoding="utf-8") as f:
-            metadata: dict[str, Any] = json.load(f)
+        metadata: dict[str, Any] = _json_loads(metadata_path.read_bytes())
 
         # Update blog post status
         metadata["has_blog_post"] = True
-        metadata["blog_post_generated_at"] = datetime.now().isoformat()
-
-        # Atomic write using temp file
-        paper_dir = metadata_path.parent
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            dir=paper_dir,
-            suffix=".json",
-            delete=False,
-            encoding="utf-8",
-        ) as tmp:
-            tmp_path = Path(tmp.name)
-            json.dump(metadata, tmp, indent=2, ensure_ascii=False)
-
-        # Atomic rename
-        tmp_path.replace(metadata_path)
-        tmp_path = None  # Clear so finally block doesn't try to delete
+        metadata["blog_post_generated_at"] = now or datetime.now().isoformat()
+
+        _atomic_write_bytes(metadata_path, _json_dumps(metadata))
         logger.info("Updated metadata for paper %s", paper_id)
         return True
 
@@ -182,18 +217,37 @@ def update_metadata(paper_id: str, data_dir: Path) -> bool:
     except OSError as e:
         logger.error("Failed to update metadata: %s", e)
         return False
-    finally:
-        # Clean up temp file if it still exists
-        if tmp_path is not None and tmp_path.exists():
-            try:
-                tmp_path.unlink()
-            except OSError:
-                pass
+
+
+@lru_cache(maxsize=4)
+def _load_index_cached(index_path_str: str, mtime_ns: int, size: int) -> dict[str, Any] | None:
+    """Read and parse the papers index, memoized per file version.
+
+    Args:
+        index_path_str: Index file path as a string
+        mtime_ns: Index file modification time (cache key only)
+        size: Index file size in bytes (cache key only)
+
+    Returns:
+        Index dict if successful, None otherwise
+    """
+    try:
+        return _json_loads(Path(index_path_str).read_bytes())  # type: ignore[no-any-return]
+    except json.JSONDecodeError as e:
+        logger.error("Invalid JSON in index file: %s", e)
+        return None
+    except OSError as e:
+        logger.error("Failed to read index: %s", e)
+        return None
 
 
 def load_index(data_dir: Path) -> dict[str, Any] | None:
     """Load papers.json index.
 
+    The parsed index is cached on the file's ``(mtime, size)``, so repeated
+    loads of an unchanged index skip the read and parse. Callers must treat
+    the returned dictionary as read-only.
+
     Args:
         data_dir: Data directory path
 
@@ -202,27 +256,22 @@ def load_index(data_dir: Path) -> dict[str, Any] | None:
     """
     index_path = data_dir / "index" / "papers.json"
 
-    if not index_path.exists():
+    try:
+        stat = index_path.stat()
+    except OSError:
         logger.warning("Index file not found: %s", index_path)
         return None
 
-    try:
-        with index_path.open("r", encoding="utf-8") as f:
-            return json.load(f)  # type: ignore[no-any-return]
-    except json.JSONDecodeError as e:
-        logger.error("Invalid JSON in index file: %s", e)
-        return None
-    except OSError as e:
-        logger.error("Failed to read index: %s", e)
-        return None
+    return _load_index_cached(str(index_path), stat.st_mtime_ns, stat.st_size)
 
 
-def update_index(paper_id: str, data_dir: Path) -> bool:
+def update_index(paper_id: str, data_dir: Path, now: str | None = None) -> bool:
     """Update has_blog_post status in papers.json index.
 
     Args:
         paper_id: The arXiv paper ID
         data_dir: Data directory path
+        now: ISO timestamp to record (defaults to the current local time)
 
     Returns:
         True if update successful, False otherwise
@@ -238,11 +287,11 @@ def update_index(paper_id: str, data_dir: Path) -> bool:
         logger.warning("Index file not found: %s", index_path)
         return False
 
-    tmp_path: Path | None = None
     try:
-        # Load existing index
-        with index_path.open("r", encoding="utf-8") as f:
-            index: dict[str, Any] = json.load(f)
+        # Load a private copy of the index; load_index() results are shared
+        # and must not be mutated. The atomic replace below gives the file a
+        # new mtime, which invalidates any cached load_index() entry.
+        index: dict[str, Any] = _json_loads(index_path.read_bytes())
 
         # Check if paper exists in index
         papers = index.get("papers", {})
@@ -252,23 +301,9 @@ def update_index(paper_id: str, data_dir: Path) -> bool:
 
         # Update blog post status
         papers[paper_id]["has_blog_post"] = True
-        index["updated_at"] = datetime.now().isoformat()
-
-        # Atomic write using temp file
-        index_dir = index_path.parent
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            dir=index_dir,
-            suffix=".json",
-            delete=False,
-            encoding="utf-8",
-        ) as tmp:
-            tmp_path = Path(tmp.name)
-            json.dump(index, tmp, indent=2, ensure_ascii=False)
-
-        # Atomic rename
-        tmp_path.replace(index_path)
-        tmp_path = None  # Clear so finally block doesn't try to delete
+        index["updated_at"] = now or datetime.now().isoformat()
+
+        _atomic_write_bytes(index_path, _json_dumps(index))
         logger.info("Updated index for paper %s", paper_id)
         return True
 
@@ -278,17 +313,15 @@ def update_index(paper_id: str, data_dir: Path) -> bool:
     except OSError as e:
         logger.error("Failed to update index: %s", e)
         return False
-    finally:
-        # Clean up temp file if it still exists
-        if tmp_path is not None and tmp_path.exists():
-            try:
-                tmp_path.unlink()
-            except OSError:
-                pass
 
 
-def main() -> int:
-    """Main entry point."""
+@lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser once and reuse it across calls.
+
+    Returns:
+        Configured argument parser
+    """
     parser = argparse.ArgumentParser(description="Save blog post and update status")
     parser.add_argument(
         "--paper-id",
@@ -313,8 +346,16 @@ def main() -> int:
         default=Path("./data"),
         help="Data directory path (default: ./data)",
     )
+    return parser
 
-    args = parser.parse_args()
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
+    args = _get_parser().parse_args(argv)
 
     # Validate paper ID format
     if not validate_arxiv_id(args.paper_id):
@@ -389,12 +430,16 @@ def main() -> int:
         )
         return 1
 
-    # Get content from argument or file
+    # Get content from argument or file. File content is kept as the raw bytes
+    # so it can be saved without being re-encoded after validation.
     content: str
+    raw_content: str | bytes
     if args.content_file:
         try:
-            content = args.content_file.read_text(encoding="utf-8")
-        except OSError as e:
+            file_bytes = args.content_file.read_bytes()
+            content = file_bytes.decode("utf-8")
+            raw_content = file_bytes
+        except (OSError, UnicodeDecodeError) as e:
             logger.error("Failed to read content file: %s", e)
             print(
                 json.dumps(
@@ -411,7 +456,7 @@ def main() -> int:
             )
             return 1
     else:
-        content = args.content
+        content = raw_content = args.content
 
     # Validate content
     if not content or len(content.strip()) < 100:
@@ -432,7 +477,7 @@ def main() -> int:
         return 1
 
     # Save blog post
-    blog_path = save_blog_post(args.paper_id, content, args.data_dir)
+    blog_path = save_blog_post(args.paper_id, raw_content, args.data_dir)
     if blog_path is None:
         print(
             json.dumps(
@@ -449,11 +494,14 @@ def main() -> int:
         )
         return 1
 
+    # Metadata and index record the same timestamp for this save
+    now = datetime.now().isoformat()
+
     # Update metadata
-    metadata_updated = update_metadata(args.paper_id, args.data_dir)
+    metadata_updated = update_metadata(args.paper_id, args.data_dir, now=now)
 
     # Update index (continue even if metadata update fails)
-    index_updated = update_index(args.paper_id, args.data_dir)
+    index_updated = update_index(args.paper_id, args.data_dir, now=now)
 
     # Report results
     result: dict[str, Any] = {
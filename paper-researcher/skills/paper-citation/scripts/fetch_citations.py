@@ -21,17 +21,29 @@ import sys
 import tempfile
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import requests
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 # Constants
+ARXIV_ID_PATTERN = re.compile(r"^\d{4}\.\d{4,5}$")
 S2_BASE_URL = "https://api.semanticscholar.org/graph/v1"
 REQUEST_DELAY = 3.0  # seconds between requests (100 req/5min = ~3s per request)
 MAX_RETRIES = 3
 BACKOFF_FACTOR = 2
 RATE_LIMIT_WAIT = 60  # seconds to wait on 429
+BATCH_SIZE = 500  # maximum IDs accepted by the S2 /paper/batch endpoint
+# Fields requested for every paper; extract_arxiv_ids needs the nested externalIds
+S2_FIELDS = (
+    "citationCount,referenceCount,externalIds,references.externalIds,citations.externalIds"
+)
 
 # Configure logging
 logging.basicConfig(
@@ -41,6 +53,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger("fetch_citations")
 
+# Shared HTTP session so consecutive S2 requests reuse the TLS connection
+_SESSION = requests.Session()
+
+# Monotonic timestamp of the last S2 request, used by _wait_for_rate_limit
+_last_request_time = float("-inf")
+
 
 def validate_arxiv_id(paper_id: str) -> bool:
     """Validate arXiv ID format.
@@ -53,12 +71,130 @@ def validate_arxiv_id(paper_id: str) -> bool:
     """
     if not paper_id:
         return False
-    return bool(re.match(r"^\d{4}\.\d{4,5}$", paper_id))
+    return bool(ARXIV_ID_PATTERN.match(paper_id))
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed.
+
+    Args:
+        data: Raw UTF-8 encoded JSON document
+
+    Returns:
+        Parsed JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a value to indented UTF-8 JSON, using orjson when it is installed.
+
+    Args:
+        obj: JSON-serializable value
+
+    Returns:
+        Encoded JSON document (2-space indent, non-ASCII preserved)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _response_json(response: requests.Response) -> Any:
+    """Decode an HTTP response body, using orjson when it is installed.
+
+    Args:
+        response: Response whose body is a JSON document
+
+    Returns:
+        Parsed JSON value
+
+    Raises:
+        requests.exceptions.JSONDecodeError: If the body is not valid JSON,
+            matching the contract of ``Response.json()``
+    """
+    try:
+        return _json_loads(response.content)
+    except json.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+
+
+def _wait_for_rate_limit() -> None:
+    """Sleep only as long as needed to keep REQUEST_DELAY between S2 requests.
+
+    Time spent between requests (e.g. writing metadata) counts toward the
+    delay, and no sleep is paid after the final request of a run.
+    """
+    global _last_request_time
+
+    elapsed = time.monotonic() - _last_request_time
+    if elapsed < REQUEST_DELAY:
+        time.sleep(REQUEST_DELAY - elapsed)
+    _last_request_time = time.monotonic()
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Atomically replace a file with pre-serialized content.
+
+    The payload is handed to a temp file in the target directory in one
+    write and then renamed over the destination, so readers never observe
+    a partially written file.
+
+    Args:
+        path: Destination file path
+        data: Complete file contents
+
+    Raises:
+        OSError: If the temp file cannot be written or renamed
+    """
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=path.parent, suffix=path.suffix, prefix=f".{path.stem}_"
+        )
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        tmp_path = None
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+@lru_cache(maxsize=4)
+def _load_index_cached(index_path_str: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    """Read and parse the papers index, memoized per file version.
+
+    Args:
+        index_path_str: Index file path as a string
+        mtime_ns: Index file modification time (cache key only)
+        size: Index file size in bytes (cache key only)
+
+    Returns:
+        Papers index dictionary or empty dict if unreadable
+    """
+    try:
+        result: dict[str, Any] = _json_loads(Path(index_path_str).read_bytes())
+    except (json.JSONDecodeError, OSError) as e:
+        logger.error("Failed to load index: %s", e)
+        return {"papers": {}}
+
+    # Intern paper IDs so lookups against IDs from S2 compare by identity
+    papers = result.get("papers")
+    if isinstance(papers, dict):
+        result["papers"] = {sys.intern(pid): entry for pid, entry in papers.items()}
+    return result
 
 
 def load_index(data_dir: Path) -> dict[str, Any]:
     """Load papers index from data directory.
 
+    The parsed index is cached on the file's ``(mtime, size)``, so repeated
+    loads of an unchanged index skip the read and parse. Callers must treat
+    the returned dictionary as read-only.
+
     Args:
         data_dir: Path to data directory
 
@@ -66,17 +202,13 @@ def load_index(data_dir: Path) -> dict[str, Any]:
         Papers index dictionary or empty dict if not found
     """
     index_path = data_dir / "index" / "papers.json"
-    if not index_path.exists():
+    try:
+        stat = index_path.stat()
+    except FileNotFoundError:
         logger.warning("Papers index not found: %s", index_path)
         return {"papers": {}}
 
-    try:
-        with open(index_path, encoding="utf-8") as f:
-            result: dict[str, Any] = json.load(f)
-            return result
-    except (json.JSONDecodeError, OSError) as e:
-        logger.error("Failed to load index: %s", e)
-        return {"papers": {}}
+    return _load_index_cached(str(index_path), stat.st_mtime_ns, stat.st_size)
 
 
 def fetch_with_retry(arxiv_id: str, max_retries: int = MAX_RETRIES) -> dict[str, Any] | None:
@@ -90,7 +222,7 @@ def fetch_with_retry(arxiv_id: str, max_retries: int = MAX_RETRIES) -> dict[str,
         Citation data dictionary or None if not found
     """
     url = f"{S2_BASE_URL}/paper/arXiv:{arxiv_id}"
-    params = {"fields": "references,citations,citationCount,referenceCount,externalIds"}
+    params = {"fields": S2_FIELDS}
 
     last_exception: Exception | None = None
 
@@ -103,7 +235,8 @@ def fetch_with_retry(arxiv_id: str, max_retries: int = MAX_RETRIES) -> dict[str,
                 max_retries,
             )
 
-            response = requests.get(url, params=params, timeout=30)
+            _wait_for_rate_limit()
+            response = _SESSION.get(url, params=params, timeout=30)
 
             if response.status_code == 404:
                 logger.info("Paper not found in Semantic Scholar: %s", arxiv_id)
@@ -116,10 +249,7 @@ def fetch_with_retry(arxiv_id: str, max_retries: int = MAX_RETRIES) -> dict[str,
 
             response.raise_for_status()
 
-            # Respect rate limiting
-            time.sleep(REQUEST_DELAY)
-
-            result: dict[str, Any] = response.json()
+            result: dict[str, Any] = _response_json(response)
             return result
 
         except requests.RequestException as e:
@@ -142,6 +272,86 @@ def fetch_with_retry(arxiv_id: str, max_retries: int = MAX_RETRIES) -> dict[str,
     return None
 
 
+def fetch_batch(
+    arxiv_ids: list[str], max_retries: int = MAX_RETRIES
+) -> dict[str, dict[str, Any] | None]:
+    """Fetch citation data for several papers in one Semantic Scholar request.
+
+    Uses the ``POST /paper/batch`` endpoint, which accepts up to
+    ``BATCH_SIZE`` IDs and returns results in input order with ``null`` for
+    papers it does not know. If the response is not one entry per ID, the
+    papers are fetched one by one with ``fetch_with_retry`` instead.
+
+    Args:
+        arxiv_ids: arXiv paper IDs (at most ``BATCH_SIZE``)
+        max_retries: Maximum number of retry attempts
+
+    Returns:
+        Mapping of arXiv ID to citation data, or None if not found
+
+    Raises:
+        requests.RequestException: If all retries fail
+    """
+    url = f"{S2_BASE_URL}/paper/batch"
+    params = {"fields": S2_FIELDS}
+    payload = {"ids": [f"arXiv:{arxiv_id}" for arxiv_id in arxiv_ids]}
+
+    last_exception: Exception | None = None
+
+    for attempt in range(max_retries):
+        try:
+            logger.debug(
+                "Fetching citations for %d papers (attempt %d/%d)",
+                len(arxiv_ids),
+                attempt + 1,
+                max_retries,
+            )
+
+            _wait_for_rate_limit()
+            response = _SESSION.post(url, params=params, json=payload, timeout=60)
+
+            if response.status_code == 429:
+                logger.warning("Rate limited, waiting %ds...", RATE_LIMIT_WAIT)
+                time.sleep(RATE_LIMIT_WAIT)
+                continue
+
+            response.raise_for_status()
+
+            entries = _response_json(response)
+            if not isinstance(entries, list) or len(entries) != len(arxiv_ids):
+                # Not one entry per ID (e.g. an error envelope), so results can't be mapped
+                break
+            return {
+                arxiv_id: entry if isinstance(entry, dict) else None
+                for arxiv_id, entry in zip(arxiv_ids, entries, strict=True)
+            }
+
+        except requests.RequestException as e:
+            last_exception = e
+            if attempt < max_retries - 1:
+                delay = REQUEST_DELAY * (BACKOFF_FACTOR**attempt)
+                logger.warning(
+                    "Batch request failed (attempt %d/%d): %s. Retrying in %.1fs",
+                    attempt + 1,
+                    max_retries,
+                    str(e),
+                    delay,
+                )
+                time.sleep(delay)
+            else:
+                logger.error("All %d attempts failed for batch", max_retries)
+    else:
+        if last_exception:
+            raise last_exception
+        return dict.fromkeys(arxiv_ids)
+
+    logger.warning(
+        "Batch response did not match the %d requested IDs, fetching them one by one",
+        len(arxiv_ids),
+    )
+    return {arxiv_id: fetch_with_retry(arxiv_id, max_retries) for arxiv_id in arxiv_ids}
+
+
 def extract_arxiv_ids(papers: list[dict[str, Any]] | None) -> list[str]:
     """Extract arXiv IDs from Semantic Scholar paper references/citations.
 
@@ -149,19 +359,20 @@ def extract_arxiv_ids(papers: list[dict[str, Any]] | None) -> list[str]:
         papers: List of paper objects from S2 API
 
     Returns:
-        List of arXiv IDs
+        List of interned arXiv IDs
     """
     if not papers:
         return []
 
-    arxiv_ids: list[str] = []
-    for paper in papers:
-        external_ids = paper.get("externalIds") or {}
-        arxiv_id = external_ids.get("ArXiv")
-        if arxiv_id and validate_arxiv_id(arxiv_id):
-            arxiv_ids.append(arxiv_id)
-
-    return arxiv_ids
+    # Single pass; walrus bindings avoid repeated dict lookups per reference.
+    # IDs are interned so repeated IDs share one string with the index keys.
+    return [
+        sys.intern(arxiv_id)
+        for paper in papers
+        if (external_ids := paper.get("externalIds"))
+        and (arxiv_id := external_ids.get("ArXiv"))
+        and validate_arxiv_id(arxiv_id)
+    ]
 
 
 def filter_in_collection(arxiv_ids: list[str], index: dict[str, Any]) -> list[str]:
@@ -175,6 +386,8 @@ def filter_in_collection(arxiv_ids: list[str], index: dict[str, Any]) -> list[st
         List of arXiv IDs that are in our collection
     """
     papers_dict = index.get("papers", {})
+    # Dict membership is already a hash probe; a set intersection would lose
+    # the S2 ordering that references_in_collection preserves
     return [aid for aid in arxiv_ids if aid in papers_dict]
 
 
@@ -208,8 +421,7 @@ def update_metadata(
 
     try:
         # Load existing metadata
-        with open(metadata_path, encoding="utf-8") as f:
-            metadata = json.load(f)
+        metadata = _json_loads(metadata_path.read_bytes())
 
         # Build citation data
         if citation_data is None:
@@ -240,29 +452,21 @@ def update_metadata(
                 "cited_by_in_collection": cited_by_in_collection,
             }
 
-        # Atomic write
-        tmp_path = None
-        try:
-            fd, tmp_path = tempfile.mkstemp(
-                dir=paper_dir, suffix=".json", prefix=".metadata_"
-            )
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
-            os.replace(tmp_path, metadata_path)
-            tmp_path = None
-            logger.debug("Updated metadata for %s", paper_id)
-            return True
-        finally:
-            if tmp_path and os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        _atomic_write_bytes(metadata_path, _json_dumps(metadata))
+        logger.debug("Updated metadata for %s", paper_id)
+        return True
 
     except (json.JSONDecodeError, OSError) as e:
         logger.error("Failed to update metadata for %s: %s", paper_id, e)
         return False
 
 
-def main() -> int:
-    """Main entry point."""
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
     parser = argparse.ArgumentParser(
         description="Fetch citation data from Semantic Scholar API"
     )
@@ -283,7 +487,10 @@ def main() -> int:
         help="Path to data directory",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    # Start each run from a fresh read of the index
+    _load_index_cached.cache_clear()
 
     # Validate data directory
     if not args.data_dir.exists():
@@ -352,14 +559,30 @@ def main() -> int:
 
     logger.info("Processing %d papers...", len(paper_ids))
 
+    valid_ids: list[str] = []
     for paper_id in paper_ids:
         if not validate_arxiv_id(paper_id):
             logger.warning("Skipping invalid paper ID: %s", paper_id)
             errors.append(f"Invalid ID: {paper_id}")
             continue
+        valid_ids.append(paper_id)
+
+    for start in range(0, len(valid_ids), BATCH_SIZE):
+        batch = valid_ids[start : start + BATCH_SIZE]
 
         try:
-            citation_data = fetch_with_retry(paper_id)
+            # A single paper keeps the plain GET endpoint
+            if len(batch) == 1:
+                results = {batch[0]: fetch_with_retry(batch[0])}
+            else:
+                results = fetch_batch(batch)
+        except requests.RequestException as e:
+            logger.error("Failed to fetch citations for %d papers: %s", len(batch), e)
+            errors.extend(f"Fetch failed: {paper_id}" for paper_id in batch)
+            continue
+
+        for paper_id in batch:
+            citation_data = results.get(paper_id)
 
             if citation_data is None:
                 papers_not_found += 1
@@ -371,10 +594,6 @@ def main() -> int:
             else:
                 errors.append(f"Failed to update: {paper_id}")
 
-        except requests.RequestException as e:
-            logger.error("Failed to fetch citations for %s: %s", paper_id, e)
-            errors.append(f"Fetch failed: {paper_id}")
-
     # Output results
     output = {
         "success": len(errors) == 0,
@@ -13,6 +13,7 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import io
 import json
 import logging
 import re
@@ -24,12 +25,13 @@ from pathlib import Path
 from typing import Any
 
 # Constants
-ARXIV_ID_PATTERN = re.compile(r"^\d{4}\.\d{4,5}$")
+ARXIV_ID_PATTERN = re.compile(r"\d{4}\.\d{4,5}")
 REQUIRED_MANIFEST_FIELDS = ["version", "created_at", "paper_count"]
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100 MB limit per file
 MAX_TOTAL_SIZE = 500 * 1024 * 1024  # 500 MB total limit
 MAX_FILE_COUNT = 10000  # Maximum files in package
 MAX_COMPRESSION_RATIO = 100  # 100:1 max ratio for ZIP bomb detection
+PRELOAD_MAX_SIZE = 64 * 1024 * 1024  # Packages up to 64 MB are read into memory
 
 # Configure logging
 logging.basicConfig(
@@ -51,7 +53,7 @@ def validate_arxiv_id(paper_id: str) -> bool:
     Returns:
         True if valid arXiv ID format (YYMM.NNNNN), False otherwise
     """
-    return bool(ARXIV_ID_PATTERN.match(paper_id))
+    return ARXIV_ID_PATTERN.fullmatch(paper_id) is not None
 
 
 def validate_zip_path(path: str) -> bool:
@@ -102,6 +104,26 @@ def validate_manifest(manifest: dict[str, Any]) -> tuple[bool, str]:
     return True, ""
 
 
+def load_index_bytes(data: bytes) -> dict[str, Any]:
+    """Parse a serialized paper index.
+
+    Args:
+        data: Raw contents of an index/papers.json file
+
+    Returns:
+        Index dictionary, with missing version/papers keys filled in
+
+    Raises:
+        ValueError: If data is not valid JSON or not a JSON object
+    """
+    index = json.loads(data)
+    if not isinstance(index, dict):
+        raise ValueError("Index must be a JSON object")
+    index.setdefault("version", "1.0")
+    index.setdefault("papers", {})
+    return index
+
+
 def load_index(data_dir: Path) -> dict[str, Any]:
     """Load paper index from disk.
 
@@ -117,11 +139,10 @@ def load_index(data_dir: Path) -> dict[str, Any]:
         return {"version": "1.0", "papers": {}}
 
     try:
-        with index_path.open(encoding="utf-8") as f:
-            index: dict[str, Any] = json.load(f)
-        logger.info("Loaded existing index with %d papers", len(index.get("papers", {})))
+        index = load_index_bytes(index_path.read_bytes())
+        logger.info("Loaded existing index with %d papers", len(index["papers"]))
         return index
-    except (OSError, json.JSONDecodeError) as e:
+    except (OSError, ValueError) as e:
         logger.warning("Failed to load existing index: %s", e)
         return {"version": "1.0", "papers": {}}
 
@@ -166,6 +187,7 @@ def import_package(
     input_path: Path,
     data_dir: Path,
     overwrite: bool,
+    index: dict[str, Any] | None = None,
 ) -> tuple[int, int, int, list[str]]:
     """Import papers from ZIP package.
 
@@ -173,23 +195,34 @@ def import_package(
         input_path: Path to input ZIP file
         data_dir: Path to data directory
         overwrite: Whether to overwrite existing papers
+        index: Existing paper index to merge into (loaded from data_dir if None)
 
     Returns:
         Tuple of (imported_count, skipped_count, annotation_count, imported_ids)
 
     Raises:
         ValueError: If package is invalid
+        zipfile.BadZipFile: If input is not a ZIP archive
         OSError: If file operations fail
     """
     if not input_path.exists():
         raise FileNotFoundError(f"Package not found: {input_path}")
 
+    # Cheap end-of-central-directory check before a full ZipFile parse
+    if not zipfile.is_zipfile(input_path):
+        raise zipfile.BadZipFile(f"Not a ZIP archive: {input_path}")
+
     imported_count = 0
     skipped_count = 0
     annotation_count = 0
     imported_ids: list[str] = []
 
-    with zipfile.ZipFile(input_path, "r") as zf:
+    # Read small packages in one go so entry reads don't each seek the file
+    source: Path | io.BytesIO = input_path
+    if input_path.stat().st_size <= PRELOAD_MAX_SIZE:
+        source = io.BytesIO(input_path.read_bytes())
+
+    with zipfile.ZipFile(source, "r") as zf:
         # Validate package size and file count (ZIP bomb protection)
         file_list = zf.infolist()
         file_count = len(file_list)
@@ -231,25 +264,25 @@ def import_package(
             manifest.get("paper_count", 0),
         )
 
-        # Load existing index
-        index = load_index(data_dir)
+        # Load existing index unless the caller already has it
+        if index is None:
+            index = load_index(data_dir)
         existing_papers = index.get("papers", {})
 
-        # Process each paper in the package
-        paper_entries = [
-            info for info in zf.infolist()
-            if info.filename.startswith("papers/")
-            and info.filename.endswith("/metadata.json")
-        ]
-
-        for entry in paper_entries:
-            # Extract paper ID from path: papers/{paper_id}/metadata.json
-            parts = entry.filename.split("/")
-            if len(parts) != 3:
+        # Group entries by paper in a single pass over the central directory,
+        # so per-paper lookups below don't rescan the whole archive
+        paper_entries: list[tuple[str, zipfile.ZipInfo]] = []
+        paper_files: dict[str, list[zipfile.ZipInfo]] = {}
+        for info in file_list:
+            parts = info.filename.split("/")
+            if len(parts) < 3 or parts[0] != "papers":
                 continue
+            paper_files.setdefault(parts[1], []).append(info)
+            # papers/{paper_id}/metadata.json
+            if len(parts) == 3 and parts[2] == "metadata.json":
+                paper_entries.append((parts[1], info))
 
-            paper_id = parts[1]
-
+        for paper_id, entry in paper_entries:
             # Validate paper ID
             if not validate_arxiv_id(paper_id):
                 logger.warning("Skipping paper with invalid ID: %s", paper_id)
@@ -267,7 +300,7 @@ def import_package(
 
             # Extract metadata.json
             try:
-                metadata_data = zf.read(entry.filename)
+                metadata_data = zf.read(entry)
                 metadata = json.loads(metadata_data.decode("utf-8"))
 
                 # Update metadata with import info
@@ -298,9 +331,20 @@ def import_package(
                 logger.warning("Failed to import metadata for %s: %s", paper_id, e)
                 continue
 
+            # Find this paper's summary and annotation entries
+            summary_name = f"papers/{paper_id}/summary.md"
+            annotations_prefix = f"papers/{paper_id}/annotations/"
+            summary_entry: zipfile.ZipInfo | None = None
+            annotation_entries: list[zipfile.ZipInfo] = []
+            for info in paper_files[paper_id]:
+                name = info.filename
+                if name == summary_name:
+                    summary_entry = info
+                elif name.startswith(annotations_prefix) and name.endswith(".json"):
+                    annotation_entries.append(info)
+
             # Extract summary.md if present
-            summary_entry = f"papers/{paper_id}/summary.md"
-            if summary_entry in zf.namelist():
+            if summary_entry is not None:
                 try:
                     summary_data = zf.read(summary_entry)
                     summary_path = paper_dir / "summary.md"
@@ -309,13 +353,6 @@ def import_package(
                     logger.warning("Failed to import summary for %s: %s", paper_id, e)
 
             # Extract annotations if present
-            annotations_prefix = f"papers/{paper_id}/annotations/"
-            annotation_entries = [
-                info for info in zf.infolist()
-                if info.filename.startswith(annotations_prefix)
-                and info.filename.endswith(".json")
-            ]
-
             if annotation_entries:
                 annotations_dir = paper_dir / "annotations"
                 annotations_dir.mkdir(exist_ok=True)
@@ -323,7 +360,7 @@ def import_package(
                 for ann_entry in annotation_entries:
                     ann_name = Path(ann_entry.filename).name
                     try:
-                        ann_data = zf.read(ann_entry.filename)
+                        ann_data = zf.read(ann_entry)
                         ann_path = annotations_dir / ann_name
                         ann_path.write_bytes(ann_data)
                         annotation_count += 1
@@ -352,8 +389,12 @@ def import_package(
     return imported_count, skipped_count, annotation_count, imported_ids
 
 
-def main() -> int:
-    """Main entry point."""
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
     parser = argparse.ArgumentParser(description="Import shared paper collection")
     parser.add_argument(
         "--input",
@@ -373,7 +414,7 @@ def main() -> int:
         help="Data directory path (default: ./data)",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     try:
         imported, skipped, annotations, paper_ids = import_package(
@@ -15,14 +15,20 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import os
 import re
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 # Constants
-ARXIV_ID_PATTERN = re.compile(r"^\d{4}\.\d{4,5}$")
+ARXIV_ID_PATTERN = re.compile(r"\d{4}\.\d{4,5}")
 VALID_FORMATS = ("json", "markdown", "text")
 
 # Configure logging
@@ -34,6 +40,20 @@ logging.basicConfig(
 logger = logging.getLogger("list_annotations")
 
 
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed.
+
+    Args:
+        data: Raw UTF-8 encoded JSON document
+
+    Returns:
+        Parsed JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def validate_arxiv_id(paper_id: str) -> bool:
     """Validate that paper_id matches expected arXiv ID format.
 
@@ -45,7 +65,7 @@ def validate_arxiv_id(paper_id: str) -> bool:
     Returns:
         True if valid arXiv ID format (YYMM.NNNNN), False otherwise
     """
-    return bool(ARXIV_ID_PATTERN.match(paper_id))
+    return ARXIV_ID_PATTERN.fullmatch(paper_id) is not None
 
 
 def validate_format(format_str: str) -> str:
@@ -88,14 +108,16 @@ def load_annotations(paper_id: str, data_dir: Path) -> list[dict[str, Any]]:
 
     annotations: list[dict[str, Any]] = []
 
-    for annotation_file in annotations_dir.glob("*.json"):
-        try:
-            with annotation_file.open(encoding="utf-8") as f:
-                annotation = json.load(f)
-                annotations.append(annotation)
-        except (OSError, json.JSONDecodeError) as e:
-            logger.warning("Failed to read annotation %s: %s", annotation_file, e)
-            continue
+    with os.scandir(annotations_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            try:
+                with open(entry.path, "rb") as f:
+                    annotations.append(_json_loads(f.read()))
+            except (OSError, ValueError) as e:
+                logger.warning("Failed to read annotation %s: %s", entry.path, e)
+                continue
 
     # Sort by creation date (newest first)
     annotations.sort(
@@ -209,8 +231,12 @@ def format_annotations(
         return "\n".join(lines)
 
 
-def main() -> int:
-    """Main entry point."""
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
     parser = argparse.ArgumentParser(description="List annotations for a paper")
     parser.add_argument(
         "--paper-id",
@@ -231,7 +257,7 @@ def main() -> int:
         help="Data directory path (default: ./data)",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     try:
         # Validate paper ID
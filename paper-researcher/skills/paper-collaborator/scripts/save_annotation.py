@@ -16,17 +16,27 @@ import json
 import logging
 import os
 import re
+import string
 import sys
 import tempfile
 import uuid
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 # Constants
-ARXIV_ID_PATTERN = re.compile(r"^\d{4}\.\d{4,5}$")
+ARXIV_ID_PATTERN = re.compile(r"\d{4}\.\d{4,5}")
+ARXIV_ID_MIN_LENGTH = 9  # YYMM.NNNN
+ARXIV_ID_MAX_LENGTH = 10  # YYMM.NNNNN
 MIN_CONTENT_LENGTH = 1
 MAX_CONTENT_LENGTH = 50000
+USERNAME_ALLOWED_CHARS = string.ascii_letters + string.digits + "_-"
 
 # Configure logging
 logging.basicConfig(
@@ -37,6 +47,60 @@ logging.basicConfig(
 logger = logging.getLogger("save_annotation")
 
 
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed.
+
+    Args:
+        data: Raw UTF-8 encoded JSON document
+
+    Returns:
+        Parsed JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a value to indented UTF-8 JSON, using orjson when it is installed.
+
+    Args:
+        obj: JSON-serializable value
+
+    Returns:
+        Encoded JSON document (2-space indent, non-ASCII preserved)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Atomically replace a file with pre-serialized content.
+
+    The payload is handed to a temp file in the target directory in one
+    write and then renamed over the destination, so readers never observe
+    a partially written file.
+
+    Args:
+        path: Destination file path
+        data: Complete file contents
+
+    Raises:
+        OSError: If the temp file cannot be written or renamed
+    """
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp", prefix=f".{path.stem}_")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        tmp_path = None
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
 def validate_arxiv_id(paper_id: str) -> bool:
     """Validate that paper_id matches expected arXiv ID format.
 
@@ -48,7 +112,21 @@ def validate_arxiv_id(paper_id: str) -> bool:
     Returns:
         True if valid arXiv ID format (YYMM.NNNNN), False otherwise
     """
-    return bool(ARXIV_ID_PATTERN.match(paper_id))
+    # Length check rejects oversized input before running the regex
+    if not ARXIV_ID_MIN_LENGTH <= len(paper_id) <= ARXIV_ID_MAX_LENGTH:
+        return False
+    return ARXIV_ID_PATTERN.fullmatch(paper_id) is not None
+
+
+class _UsernameTranslation(dict[int, int]):
+    """str.translate table mapping every disallowed code point to "_"."""
+
+    def __missing__(self, key: int) -> int:
+        self[key] = ord("_")
+        return ord("_")
+
+
+_USERNAME_TABLE = _UsernameTranslation((ord(c), ord(c)) for c in USERNAME_ALLOWED_CHARS)
 
 
 def sanitize_username(username: str) -> str:
@@ -60,17 +138,48 @@ def sanitize_username(username: str) -> str:
     Returns:
         Sanitized username safe for file paths
     """
-    # Allow only alphanumeric, underscores, hyphens
-    sanitized = re.sub(r"[^a-zA-Z0-9_-]", "_", username)
+    # Allow only ASCII alphanumerics, underscores, hyphens (single C-level pass)
+    sanitized = username.translate(_USERNAME_TABLE)
     # Prevent path traversal
     sanitized = sanitized.replace("..", "_")
     # Limit length
     return sanitized[:50] if sanitized else "anonymous"
 
 
+@lru_cache(maxsize=32)
+def _load_metadata_cached(
+    metadata_path_str: str, mtime_ns: int, size: int
+) -> dict[str, Any] | None:
+    """Read and parse a metadata file, memoized per file version.
+
+    Args:
+        metadata_path_str: Metadata file path as a string
+        mtime_ns: Metadata file modification time (cache key only)
+        size: Metadata file size in bytes (cache key only)
+
+    Returns:
+        Metadata dictionary or None if unreadable
+    """
+    try:
+        data = Path(metadata_path_str).read_bytes()
+        # Metadata is always a JSON object; reject anything else before parsing
+        if not data.lstrip().startswith(b"{"):
+            logger.warning("Metadata %s is not a JSON object", metadata_path_str)
+            return None
+        result: dict[str, Any] = _json_loads(data)
+        return result
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to read metadata %s: %s", metadata_path_str, e)
+        return None
+
+
 def load_metadata(paper_id: str, data_dir: Path) -> dict[str, Any] | None:
     """Load metadata for a paper.
 
+    The parsed metadata is cached on the file's ``(mtime, size)``, so repeated
+    loads of an unchanged file skip the read and parse. Callers must treat
+    the returned dictionary as read-only.
+
     Args:
         paper_id: arXiv paper ID
         data_dir: Path to data directory
@@ -83,25 +192,24 @@ def load_metadata(paper_id: str, data_dir: Path) -> dict[str, Any] | None:
 
     metadata_path = data_dir / "papers" / paper_id / "metadata.json"
 
-    if not metadata_path.exists():
-        return None
-
     try:
-        with metadata_path.open(encoding="utf-8") as f:
-            result: dict[str, Any] = json.load(f)
-            return result
-    except (OSError, json.JSONDecodeError) as e:
-        logger.warning("Failed to read metadata for %s: %s", paper_id, e)
+        stat = metadata_path.stat()
+    except OSError:
         return None
 
+    return _load_metadata_cached(str(metadata_path), stat.st_mtime_ns, stat.st_size)
 
-def update_metadata(paper_id: str, data_dir: Path, annotation_count: int) -> bool:
+
+def update_metadata(
+    paper_id: str, data_dir: Path, annotation_count: int, now: str | None = None
+) -> bool:
     """Update paper metadata with annotation count.
 
     Args:
         paper_id: arXiv paper ID
         data_dir: Path to data directory
         annotation_count: New annotation count
+        now: ISO timestamp to record (defaults to the current UTC time)
 
     Returns:
         True if successful, False otherwise
@@ -114,34 +222,19 @@ def update_metadata(paper_id: str, data_dir: Path, annotation_count: int) -> boo
     if not metadata_path.exists():
         return False
 
-    tmp_path: Path | None = None
     try:
-        with metadata_path.open(encoding="utf-8") as f:
-            metadata = json.load(f)
+        metadata = _json_loads(metadata_path.read_bytes())
 
         metadata["annotation_count"] = annotation_count
-        metadata["last_annotated_at"] = datetime.now(timezone.utc).isoformat()
-
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
-            dir=metadata_path.parent,
-            suffix=".tmp",
-            delete=False,
-        ) as tmp:
-            json.dump(metadata, tmp, indent=2, ensure_ascii=False)
-            tmp_path = Path(tmp.name)
-        tmp_path.replace(metadata_path)
+        metadata["last_annotated_at"] = now or datetime.now(timezone.utc).isoformat()
+
+        # Replacing the file gives it a new mtime, which invalidates any
+        # load_metadata() cache entry for the old version
+        _atomic_write_bytes(metadata_path, _json_dumps(metadata))
         return True
     except (OSError, json.JSONDecodeError) as e:
         logger.error("Failed to update metadata: %s", e)
         return False
-    finally:
-        if tmp_path and tmp_path.exists():
-            try:
-                tmp_path.unlink()
-            except OSError:
-                pass
 
 
 def count_annotations(paper_id: str, data_dir: Path) -> int:
@@ -159,11 +252,12 @@ def count_annotations(paper_id: str, data_dir: Path) -> int:
 
     annotations_dir = data_dir / "papers" / paper_id / "annotations"
 
-    if not annotations_dir.exists():
+    try:
+        with os.scandir(annotations_dir) as entries:
+            return sum(1 for e in entries if e.name.endswith(".json") and e.is_file())
+    except FileNotFoundError:
         return 0
 
-    return len(list(annotations_dir.glob("*.json")))
-
 
 def save_annotation(
     paper_id: str,
@@ -171,7 +265,7 @@ def save_annotation(
     username: str,
     data_dir: Path,
     annotation_type: str = "note",
-) -> tuple[bool, str]:
+) -> tuple[bool, str, Path | None]:
     """Save annotation for a paper.
 
     Args:
@@ -182,15 +276,16 @@ def save_annotation(
         annotation_type: Type of annotation (note, highlight, question, comment)
 
     Returns:
-        Tuple of (success, annotation_id or error_message)
+        Tuple of (success, annotation_id or error_message, path of the saved
+        annotation file or None on failure)
     """
     if not validate_arxiv_id(paper_id):
-        return False, "Invalid paper ID format"
+        return False, "Invalid paper ID format", None
 
     # Check paper exists
     paper_dir = data_dir / "papers" / paper_id
     if not paper_dir.exists():
-        return False, f"Paper {paper_id} not found in collection"
+        return False, f"Paper {paper_id} not found in collection", None
 
     # Create annotations directory
     annotations_dir = paper_dir / "annotations"
@@ -199,7 +294,9 @@ def save_annotation(
     # Generate annotation ID
     annotation_id = str(uuid.uuid4())[:8]
     safe_username = sanitize_username(username)
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    timestamp = now.strftime("%Y%m%d%H%M%S")
     filename = f"{safe_username}_{timestamp}_{annotation_id}.json"
 
     # Build annotation object
@@ -207,47 +304,36 @@ def save_annotation(
         "id": annotation_id,
         "paper_id": paper_id,
         "author": safe_username,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": now_iso,
+        "updated_at": now_iso,
         "type": annotation_type,
         "content": content,
     }
 
     # Save annotation
     annotation_path = annotations_dir / filename
-    tmp_path: Path | None = None
     try:
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
-            dir=annotations_dir,
-            suffix=".tmp",
-            delete=False,
-        ) as tmp:
-            json.dump(annotation, tmp, indent=2, ensure_ascii=False)
-            tmp_path = Path(tmp.name)
-        tmp_path.replace(annotation_path)
+        _atomic_write_bytes(annotation_path, _json_dumps(annotation))
 
         # Update metadata with annotation count
         new_count = count_annotations(paper_id, data_dir)
-        update_metadata(paper_id, data_dir, new_count)
+        update_metadata(paper_id, data_dir, new_count, now=now_iso)
 
         logger.info("Saved annotation %s for paper %s", annotation_id, paper_id)
-        return True, annotation_id
+        return True, annotation_id, annotation_path
 
     except OSError as e:
         logger.error("Failed to save annotation: %s", e)
-        return False, str(e)
-    finally:
-        if tmp_path and tmp_path.exists():
-            try:
-                tmp_path.unlink()
-            except OSError:
-                pass
+        return False, str(e), None
+
 
+@lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser once and reuse it across calls.
 
-def main() -> int:
-    """Main entry point."""
+    Returns:
+        Configured argument parser
+    """
     parser = argparse.ArgumentParser(description="Save annotation for a paper")
     parser.add_argument(
         "--paper-id",
@@ -269,8 +355,7 @@ def main() -> int:
 
     parser.add_argument(
         "--username",
-        default=os.environ.get("USER", "anonymous"),
-        help="Author username",
+        help="Author username (default: $USER)",
     )
     parser.add_argument(
         "--type",
@@ -285,8 +370,20 @@ def main() -> int:
         default=Path("./data"),
         help="Data directory path (default: ./data)",
     )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
+    args = _get_parser().parse_args(argv)
 
-    args = parser.parse_args()
+    # Resolved per call rather than as a parser default, since the parser is cached
+    if args.username is None:
+        args.username = os.environ.get("USER", "anonymous")
 
     try:
         # Validate paper ID
@@ -345,7 +442,7 @@ def main() -> int:
             return 1
 
         # Save annotation
-        success, result = save_annotation(
+        success, result, _ = save_annotation(
             paper_id=args.paper_id,
             content=content,
             username=args.username,
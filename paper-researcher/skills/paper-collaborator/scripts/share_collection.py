@@ -24,8 +24,10 @@ from pathlib import Path
 from typing import Any
 
 # Constants
-ARXIV_ID_PATTERN = re.compile(r"^\d{4}\.\d{4,5}$")
+ARXIV_ID_PATTERN = re.compile(r"\d{4}\.\d{4,5}")
 MANIFEST_VERSION = "1.0"
+USERNAME_UNSAFE_CHARS = re.compile(r"[^a-zA-Z0-9_-]")
+PACKAGE_COMPRESSION = zipfile.ZIP_DEFLATED
 
 # Configure logging
 logging.basicConfig(
@@ -47,7 +49,7 @@ def validate_arxiv_id(paper_id: str) -> bool:
     Returns:
         True if valid arXiv ID format (YYMM.NNNNN), False otherwise
     """
-    return bool(ARXIV_ID_PATTERN.match(paper_id))
+    return ARXIV_ID_PATTERN.fullmatch(paper_id) is not None
 
 
 def sanitize_username(username: str) -> str:
@@ -60,7 +62,7 @@ def sanitize_username(username: str) -> str:
         Sanitized username safe for file paths
     """
     # Allow only alphanumeric, underscores, hyphens (no dots for consistency)
-    sanitized = re.sub(r"[^a-zA-Z0-9_-]", "_", username)
+    sanitized = USERNAME_UNSAFE_CHARS.sub("_", username)
     # Prevent path traversal
     sanitized = sanitized.replace("..", "_")
     # Limit length
@@ -200,7 +202,7 @@ def build_package(
     # Create ZIP package
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
+    with zipfile.ZipFile(output_path, "w", PACKAGE_COMPRESSION) as zf:
         for paper_id in papers_to_export:
             paper_dir = data_dir / "papers" / paper_id
 
@@ -222,12 +224,15 @@ def build_package(
             # Add annotations if requested
             if include_annotations:
                 annotations_dir = paper_dir / "annotations"
-                if annotations_dir.exists() and annotations_dir.is_dir():
-                    for annotation_file in annotations_dir.glob("*.json"):
-                        zf.write(
-                            annotation_file,
-                            f"papers/{paper_id}/annotations/{annotation_file.name}",
-                        )
+                try:
+                    with os.scandir(annotations_dir) as entries:
+                        annotation_files = [
+                            e for e in entries if e.name.endswith(".json") and e.is_file()
+                        ]
+                except (FileNotFoundError, NotADirectoryError):
+                    annotation_files = []
+                for entry in annotation_files:
+                    zf.write(entry.path, f"papers/{paper_id}/annotations/{entry.name}")
 
         # Build partial index for shared papers only
         partial_index: dict[str, Any] = {
@@ -253,8 +258,12 @@ def build_package(
     return len(added_papers), added_papers
 
 
-def main() -> int:
-    """Main entry point."""
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
     parser = argparse.ArgumentParser(description="Share paper collection as ZIP package")
     parser.add_argument(
         "--output",
@@ -294,7 +303,7 @@ def main() -> int:
         help="Data directory path (default: ./data)",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     try:
         # Validate paper IDs if provided
@@ -17,7 +17,7 @@ import logging
 import re
 import sys
 import time
-from datetime import datetime, timedelta
+from datetime import date
 from pathlib import Path
 from typing import Any
 
@@ -31,6 +31,12 @@ REQUEST_DELAY = 3.0  # seconds between requests
 MAX_RETRIES = 3
 BACKOFF_FACTOR = 2
 
+# Characters stripped from topics so they cannot break the query syntax
+TOPIC_SANITIZE_PATTERN = re.compile(r"[^\w\s]")
+
+# arXiv ID embedded in an entry URL (e.g. http://arxiv.org/abs/2401.12345v1)
+ENTRY_ID_PATTERN = re.compile(r"/abs/(\d{4}\.\d{4,5})")
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -68,24 +74,17 @@ def build_query(topic: str, days: int) -> str:
     Returns:
         arXiv query string
     """
-    # Calculate date range
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
-
-    # Format dates for arXiv (YYYYMMDD format)
-    start_str = start_date.strftime("%Y%m%d")
-    end_str = end_date.strftime("%Y%m%d")
+    # Calculate date range, formatted for arXiv (YYYYMMDD); only the date
+    # matters, so step back by ordinal instead of building timedeltas
+    today = date.today()
+    start_str = date.fromordinal(today.toordinal() - days).strftime("%Y%m%d")
+    end_str = today.strftime("%Y%m%d")
 
     # Clean up topic - remove special characters that could break the query
-    clean_topic = re.sub(r"[^\w\s]", "", topic)
-
-    # Build query: search in title and abstract
-    query = f"all:{clean_topic}"
-
-    # Add date filter using submittedDate
-    query = f"{query} AND submittedDate:[{start_str} TO {end_str}]"
+    clean_topic = TOPIC_SANITIZE_PATTERN.sub("", topic)
 
-    return query
+    # Search in title and abstract, filtered by submittedDate
+    return f"all:{clean_topic} AND submittedDate:[{start_str} TO {end_str}]"
 
 
 def fetch_with_retry(query: str, max_results: int = MAX_RESULTS) -> str:
@@ -162,7 +161,7 @@ def parse_response(xml_text: str) -> list[dict[str, Any]]:
         # Extract arXiv ID from the entry ID URL
         # Format: http://arxiv.org/abs/2401.12345v1
         entry_id = entry.get("id", "")
-        arxiv_id_match = re.search(r"(\d{4}\.\d{4,5})", entry_id)
+        arxiv_id_match = ENTRY_ID_PATTERN.search(entry_id)
         if not arxiv_id_match:
             logger.warning("Could not extract arXiv ID from: %s", entry_id)
             continue
@@ -22,8 +22,13 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 # Constants
-ARXIV_ID_PATTERN = re.compile(r"^\d{4}\.\d{4,5}$")
+ARXIV_ID_PATTERN = re.compile(r"\d{4}\.\d{4,5}")
 
 # Configure logging
 logging.basicConfig(
@@ -43,7 +48,25 @@ def validate_arxiv_id(paper_id: str) -> bool:
     Returns:
         True if valid arXiv ID format, False otherwise
     """
-    return bool(ARXIV_ID_PATTERN.match(paper_id))
+    return ARXIV_ID_PATTERN.fullmatch(paper_id) is not None
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed.
+
+    Args:
+        data: Raw UTF-8 encoded JSON document
+
+    Returns:
+        Parsed JSON value
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+            (orjson's error type is a subclass)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def load_index(data_dir: Path) -> dict[str, Any]:
@@ -66,11 +89,10 @@ def load_index(data_dir: Path) -> dict[str, Any]:
         }
 
     try:
-        with index_path.open("r", encoding="utf-8") as f:
-            index: dict[str, Any] = json.load(f)
-            logger.info("Loaded index with %d papers", len(index.get("papers", {})))
-            return index
-    except json.JSONDecodeError as e:
+        index: dict[str, Any] = _json_loads(index_path.read_bytes())
+        logger.info("Loaded index with %d papers", len(index.get("papers", {})))
+        return index
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         logger.warning("Corrupted index file, creating new one: %s", e)
         return {
             "version": "1.0",
@@ -103,12 +125,7 @@ def save_paper(paper: dict[str, Any], data_dir: Path, topic: str | None = None)
     paper_dir = data_dir / "papers" / paper_id
     metadata_path = paper_dir / "metadata.json"
 
-    # Check for duplicate
-    if metadata_path.exists():
-        logger.debug("Paper %s already exists, skipping", paper_id)
-        return False
-
-    # Create paper directory
+    # Ensure the paper directory exists; the exclusive create below is the duplicate check
     paper_dir.mkdir(parents=True, exist_ok=True)
 
     # Add collection metadata
@@ -119,12 +136,15 @@ def save_paper(paper: dict[str, Any], data_dir: Path, topic: str | None = None)
         "has_summary": False,
     }
 
-    # Write metadata
+    # Write metadata; exclusive creation doubles as the duplicate check
     try:
-        with metadata_path.open("w", encoding="utf-8") as f:
+        with metadata_path.open("x", encoding="utf-8") as f:
             json.dump(paper_with_metadata, f, indent=2, ensure_ascii=False)
         logger.debug("Saved paper %s to %s", paper_id, paper_dir)
         return True
+    except FileExistsError:
+        logger.debug("Paper %s already exists, skipping", paper_id)
+        return False
     except OSError as e:
         logger.error("Failed to save paper %s: %s", paper_id, e)
         # Clean up partial write
@@ -142,6 +162,10 @@ def update_index(
     """Update the paper index with new papers.
 
     This function performs an atomic write to prevent index corruption.
+    When every paper is already indexed in a non-empty index and the index
+    file exists, nothing changed, so the file (and ``updated_at``) is left as
+    is. An empty index is always written, since ``load_index`` falls back to
+    one when the file on disk is corrupted and it must be regenerated.
 
     Args:
         index: Existing index dictionary
@@ -156,6 +180,7 @@ def update_index(
     index_path = index_dir / "papers.json"
 
     # Add new papers to index
+    added = 0
     for paper in papers:
         paper_id = paper.get("id", "")
         if not paper_id:
@@ -171,6 +196,11 @@ def update_index(
                 "collected_at": datetime.now().isoformat(),
                 "has_summary": False,
             }
+            added += 1
+
+    if added == 0 and index.get("papers") and index_path.exists():
+        logger.info("Index already up to date with %d papers", len(index.get("papers", {})))
+        return
 
     # Update timestamp
     index["updated_at"] = datetime.now().isoformat()
@@ -199,8 +229,12 @@ def update_index(
         raise
 
 
-def main() -> int:
-    """Main entry point."""
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
     parser = argparse.ArgumentParser(description="Store paper metadata to local filesystem")
     parser.add_argument(
         "--input",
@@ -215,7 +249,7 @@ def main() -> int:
         help="Data directory path (default: ./data)",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Validate input file
     if not args.input.exists():
@@ -12,13 +12,26 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import bisect
+import heapq
 import json
 import logging
+import marshal
+import os
 import re
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 # Constants
 DEFAULT_LIMIT = 10
 MIN_QUERY_LENGTH = 1
@@ -26,13 +39,31 @@ MAX_QUERY_LENGTH = 500
 EXCERPT_CONTEXT = 50  # Characters before and after match
 
 # arXiv ID validation pattern (defense against path traversal)
-ARXIV_ID_PATTERN = re.compile(r"^\d{4}\.\d{4,5}$")
+ARXIV_ID_PATTERN = re.compile(r"\d{4}\.\d{4,5}")
+
+# Query/document tokens: ASCII alphanumeric words, compiled once at import
+TOKEN_PATTERN = re.compile(r"\b[a-z0-9]+\b")
+SINGLE_CHAR_TOKENS = frozenset({"a", "i"})
+# Maximal alphanumeric runs; a query term can only occur inside one of these
+WORD_RUN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Postings sidecar written next to papers.json; bump the version whenever
+# the postings layout changes so older sidecars are rebuilt
+SEARCH_CACHE_NAME = "papers.search-cache"
+SEARCH_CACHE_VERSION = 1
+
+# Read summaries on a thread pool once a query needs at least this many
+PARALLEL_SUMMARY_MIN = 50
+# Summaries are read best-first in batches of this many times the limit
+SUMMARY_BATCH_FACTOR = 4
 
 # Weight factors for different fields
 WEIGHT_TITLE = 3.0
 WEIGHT_ABSTRACT = 2.0
 WEIGHT_SUMMARY = 1.5
 WEIGHT_TOPIC = 1.0
+# Posting field slots: 0 is the title, 1 the abstract, 2 + i the i-th topic
+FIELD_SLOT_WEIGHTS = (WEIGHT_TITLE, WEIGHT_ABSTRACT)
 
 # Configure logging
 logging.basicConfig(
@@ -61,6 +92,58 @@ def positive_int(value: str) -> int:
     return ivalue
 
 
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed.
+
+    Args:
+        data: Raw UTF-8 encoded JSON document
+
+    Returns:
+        Parsed JSON value
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+            (orjson's error type is a subclass)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a value to indented UTF-8 JSON, using orjson when it is installed.
+
+    Args:
+        obj: JSON-serializable value
+
+    Returns:
+        Encoded JSON document (2-space indent, non-ASCII preserved)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _print_json(obj: Any) -> None:
+    """Write a JSON document and a newline to stdout.
+
+    The encoded bytes go straight to the binary buffer when stdout has one,
+    skipping a decode and re-encode through the text layer.
+
+    Args:
+        obj: JSON-serializable value
+    """
+    data = _json_dumps(obj) + b"\n"
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(data.decode("utf-8"))
+        return
+
+    sys.stdout.flush()
+    buffer.write(data)
+    buffer.flush()
+
+
 def validate_arxiv_id(paper_id: str) -> bool:
     """Validate that paper_id matches expected arXiv ID format.
 
@@ -72,12 +155,61 @@ def validate_arxiv_id(paper_id: str) -> bool:
     Returns:
         True if valid arXiv ID format (YYMM.NNNNN), False otherwise
     """
-    return bool(ARXIV_ID_PATTERN.match(paper_id))
+    return ARXIV_ID_PATTERN.fullmatch(paper_id) is not None
+
+
+@lru_cache(maxsize=4)
+def _load_index_cached(index_path_str: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    """Read and parse the papers index, memoized per file version.
+
+    Errors are not cached, so a corrupted index is re-read on the next call.
+
+    Args:
+        index_path_str: Index file path as a string
+        mtime_ns: Index file modification time (cache key only)
+        size: Index file size in bytes (cache key only)
+
+    Returns:
+        Index dictionary with papers
+
+    Raises:
+        json.JSONDecodeError: If index file is not valid JSON
+    """
+    index: dict[str, Any] = _json_loads(Path(index_path_str).read_bytes())
+
+    logger.info("Loaded index with %d papers", len(index.get("papers", {})))
+    return index
+
+
+def _index_cache_key(data_dir: Path) -> tuple[str, int, int]:
+    """Identify the current version of the index file for caching.
+
+    Args:
+        data_dir: Path to data directory
+
+    Returns:
+        Tuple of (index path, mtime_ns, size)
+
+    Raises:
+        FileNotFoundError: If index file does not exist
+    """
+    index_path = data_dir / "index" / "papers.json"
+
+    try:
+        stat = index_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Index file not found: {index_path}") from None
+
+    return str(index_path), stat.st_mtime_ns, stat.st_size
 
 
 def load_index(data_dir: Path) -> dict[str, Any]:
     """Load paper index from disk.
 
+    The parsed index is cached on the file's ``(mtime, size)``, so repeated
+    searches against an unchanged index skip the read and parse. Callers
+    must treat the returned dictionary as read-only.
+
     Args:
         data_dir: Path to data directory
 
@@ -88,16 +220,261 @@ def load_index(data_dir: Path) -> dict[str, Any]:
         FileNotFoundError: If index file does not exist
         json.JSONDecodeError: If index file is not valid JSON
     """
-    index_path = data_dir / "index" / "papers.json"
+    return _load_index_cached(*_index_cache_key(data_dir))
 
-    if not index_path.exists():
-        raise FileNotFoundError(f"Index file not found: {index_path}")
 
-    with index_path.open(encoding="utf-8") as f:
-        index: dict[str, Any] = json.load(f)
+@lru_cache(maxsize=4)
+def _load_search_entries(
+    index_path_str: str, mtime_ns: int, size: int
+) -> tuple[tuple[str, dict[str, Any]], ...]:
+    """List the searchable papers of one index version.
 
-    logger.info("Loaded index with %d papers", len(index.get("papers", {})))
-    return index
+    Paper IDs are validated once per index version rather than per query.
+    Entry positions are the keys used by the postings.
+
+    Args:
+        index_path_str: Index file path as a string
+        mtime_ns: Index file modification time (cache key only)
+        size: Index file size in bytes (cache key only)
+
+    Returns:
+        (paper_id, paper) pairs for papers with valid IDs, in index order
+
+    Raises:
+        json.JSONDecodeError: If index file is not valid JSON
+    """
+    index = _load_index_cached(index_path_str, mtime_ns, size)
+
+    entries: list[tuple[str, dict[str, Any]]] = []
+    for paper_id, paper in index.get("papers", {}).items():
+        # Validate paper ID to prevent path traversal attacks
+        if not validate_arxiv_id(paper_id):
+            logger.warning("Skipping paper with invalid ID: %s", paper_id)
+            continue
+
+        entries.append((paper_id, paper))
+    return tuple(entries)
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Atomically replace a file with pre-serialized content.
+
+    Args:
+        path: Destination file path
+        data: Complete file contents
+
+    Raises:
+        OSError: If the temp file cannot be written or renamed
+    """
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp", prefix=f".{path.stem}_")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        tmp_path = None
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _build_postings(
+    entries: tuple[tuple[str, dict[str, Any]], ...],
+) -> tuple[dict[str, frozenset[tuple[int, int]]], frozenset[int]]:
+    """Build an inverted index over search entries.
+
+    Every maximal alphanumeric run in a paper's title, abstract and topics
+    maps to the ``(entry position, field slot)`` pairs containing it. Query
+    terms are alphanumeric, so a term matches a field exactly when it is a
+    substring of one of the field's runs.
+
+    Summaries live outside the index and may change without it, so papers
+    with a summary are returned separately and always scored.
+
+    Args:
+        entries: Search entries from _load_search_entries
+
+    Returns:
+        Tuple of (run -> field postings, positions of papers with summaries)
+    """
+    postings: dict[str, set[tuple[int, int]]] = {}
+    with_summary: set[int] = set()
+
+    for position, (_, paper) in enumerate(entries):
+        if paper.get("has_summary"):
+            with_summary.add(position)
+        # Lowercase one paper at a time; only the postings are kept
+        fields = (paper.get("title", ""), paper.get("abstract", ""), *paper.get("topics", []))
+        for slot, text in enumerate(fields):
+            for run in WORD_RUN_PATTERN.findall(text.lower()):
+                postings.setdefault(run, set()).add((position, slot))
+
+    return (
+        {run: frozenset(fields) for run, fields in postings.items()},
+        frozenset(with_summary),
+    )
+
+
+def _read_postings_cache(
+    cache_path: Path, mtime_ns: int, size: int
+) -> tuple[dict[str, frozenset[tuple[int, int]]], frozenset[int]] | None:
+    """Read postings saved for this exact version of the index.
+
+    The sidecar is a marshal dump of plain containers and is never executed.
+    Anything unreadable, from another Python or cache version, or built for
+    a different ``(mtime, size)`` of the index is ignored.
+
+    Args:
+        cache_path: Sidecar file path
+        mtime_ns: Current index modification time
+        size: Current index size in bytes
+
+    Returns:
+        Tuple of (run -> field postings, positions of papers with summaries),
+        or None if there is no usable sidecar
+    """
+    try:
+        cached = marshal.loads(cache_path.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    header = (SEARCH_CACHE_VERSION, sys.version_info[:2], mtime_ns, size)
+    if not isinstance(cached, tuple) or len(cached) != 3 or cached[0] != header:
+        return None
+    return cached[1], cached[2]
+
+
+@lru_cache(maxsize=4)
+def _load_postings(
+    index_path_str: str, mtime_ns: int, size: int
+) -> tuple[dict[str, frozenset[tuple[int, int]]], frozenset[int]]:
+    """Load the inverted index for one index version.
+
+    Each search runs in a fresh process, so the postings are saved in a
+    sidecar next to papers.json and reused until the index changes. A
+    sidecar that cannot be written is not an error.
+
+    Args:
+        index_path_str: Index file path as a string
+        mtime_ns: Index file modification time
+        size: Index file size in bytes
+
+    Returns:
+        Tuple of (run -> field postings, positions of papers with summaries)
+
+    Raises:
+        json.JSONDecodeError: If index file is not valid JSON
+    """
+    cache_path = Path(index_path_str).with_name(SEARCH_CACHE_NAME)
+
+    cached = _read_postings_cache(cache_path, mtime_ns, size)
+    if cached is not None:
+        return cached
+
+    postings, with_summary = _build_postings(
+        _load_search_entries(index_path_str, mtime_ns, size)
+    )
+
+    header = (SEARCH_CACHE_VERSION, sys.version_info[:2], mtime_ns, size)
+    try:
+        _atomic_write_bytes(cache_path, marshal.dumps((header, postings, with_summary)))
+    except OSError as e:
+        logger.warning("Could not save search cache %s: %s", cache_path, e)
+
+    return postings, with_summary
+
+
+@lru_cache(maxsize=4)
+def _load_vocabulary(
+    index_path_str: str, mtime_ns: int, size: int
+) -> tuple[str, tuple[int, ...], tuple[frozenset[tuple[int, int]], ...]]:
+    """Lay the postings' runs out in one newline-separated string.
+
+    Finding a term then takes a few ``str.find`` calls over the whole
+    vocabulary rather than a Python-level substring test per run. Terms
+    never contain a newline, so a match cannot span two runs.
+
+    Args:
+        index_path_str: Index file path as a string
+        mtime_ns: Index file modification time (cache key only)
+        size: Index file size in bytes (cache key only)
+
+    Returns:
+        Tuple of (joined runs, start offset of each run, postings of each run)
+
+    Raises:
+        json.JSONDecodeError: If index file is not valid JSON
+    """
+    postings, _ = _load_postings(index_path_str, mtime_ns, size)
+
+    starts: list[int] = []
+    offset = 0
+    for run in postings:
+        starts.append(offset)
+        offset += len(run) + 1
+
+    return "\n".join(postings), tuple(starts), tuple(postings.values())
+
+
+def _find_runs(term: str, vocabulary: str, starts: tuple[int, ...]) -> list[int]:
+    """Find the runs of the vocabulary that contain a term.
+
+    Args:
+        term: Query term
+        vocabulary: Joined runs from _load_vocabulary
+        starts: Start offset of each run
+
+    Returns:
+        Indexes of the matching runs, in vocabulary order
+    """
+    found: list[int] = []
+    pos = vocabulary.find(term)
+    while pos != -1:
+        run = bisect.bisect_right(starts, pos) - 1
+        found.append(run)
+        # Continue from the next run; one hit per run is enough
+        if run + 1 == len(starts):
+            break
+        pos = vocabulary.find(term, starts[run + 1])
+    return found
+
+
+def _score_index_fields(
+    query_terms: list[str], cache_key: tuple[str, int, int]
+) -> dict[int, float]:
+    """Score the indexed fields of every candidate paper term-at-a-time.
+
+    Gives the same title, abstract and topic scores as calculate_relevance,
+    but walks the postings of each query term instead of every paper's text.
+    Each field collects a bitmask with one bit per query term, so a term
+    hitting several words of a field still counts once, and the field's
+    score is its weight times the number of bits set.
+
+    Args:
+        query_terms: List of query terms
+        cache_key: Index version from _index_cache_key
+
+    Returns:
+        Entry position -> score, covering every paper that matched a term
+        and every paper with a summary
+    """
+    _, with_summary = _load_postings(*cache_key)
+    vocabulary, starts, run_postings = _load_vocabulary(*cache_key)
+
+    # One bit per query term, duplicates included, as calculate_relevance counts
+    term_masks: dict[tuple[int, int], int] = {}
+    for bit, term in enumerate(query_terms):
+        term_bit = 1 << bit
+        for run in _find_runs(term, vocabulary, starts):
+            for field in run_postings[run]:
+                term_masks[field] = term_masks.get(field, 0) | term_bit
+
+    scores = dict.fromkeys(with_summary, 0.0)
+    for (position, slot), mask in term_masks.items():
+        weight = FIELD_SLOT_WEIGHTS[slot] if slot < 2 else WEIGHT_TOPIC
+        scores[position] = scores.get(position, 0.0) + weight * mask.bit_count()
+
+    return scores
 
 
 def load_summary(paper_id: str, data_dir: Path) -> str | None:
@@ -115,14 +492,17 @@ def load_summary(paper_id: str, data_dir: Path) -> str | None:
         logger.warning("Invalid arXiv ID format: %s, skipping summary load", paper_id)
         return None
 
-    summary_path = data_dir / "papers" / paper_id / "summary.md"
-
-    if not summary_path.exists():
-        return None
+    # Called per candidate paper, so build the path as a plain string rather
+    # than through several Path objects
+    summary_path = os.path.join(data_dir, "papers", paper_id, "summary.md")
 
+    # Read directly instead of stat-ing first; a missing file is just no summary
     try:
-        return summary_path.read_text(encoding="utf-8")
-    except OSError as e:
+        with open(summary_path, "rb") as f:
+            return f.read().decode("utf-8")
+    except FileNotFoundError:
+        return None
+    except (OSError, UnicodeDecodeError) as e:
         logger.warning("Failed to read summary for %s: %s", paper_id, e)
         return None
 
@@ -138,16 +518,13 @@ def tokenize(text: str) -> list[str]:
     Returns:
         List of lowercase word tokens
     """
-    # Convert to lowercase
-    text = text.lower()
-
-    # Remove punctuation and split into words
-    words = re.findall(r"\b[a-z0-9]+\b", text)
-
-    # Filter out very short words (single chars except common ones)
-    words = [w for w in words if len(w) > 1 or w in ("a", "i")]
-
-    return words
+    # Lowercase, drop punctuation and filter out very short words
+    # (single chars except common ones) in one pass
+    return [
+        w
+        for w in TOKEN_PATTERN.findall(text.lower())
+        if len(w) > 1 or w in SINGLE_CHAR_TOKENS
+    ]
 
 
 def count_matches(text: str, query_terms: list[str]) -> int:
@@ -164,19 +541,21 @@ def count_matches(text: str, query_terms: list[str]) -> int:
     return sum(1 for term in query_terms if term in text_lower)
 
 
-def calculate_relevance(
+def _score_lowered(
     query_terms: list[str],
-    paper: dict[str, Any],
+    title: str,
+    abstract: str,
     summary: str | None,
+    topics: tuple[str, ...],
 ) -> float:
-    """Calculate relevance score for a paper.
-
-    Score is based on weighted matches across title, abstract, summary, and topics.
+    """Weighted relevance score over already-lowercased fields.
 
     Args:
         query_terms: List of query terms
-        paper: Paper metadata dictionary
-        summary: Summary content or None
+        title: Lowercased title
+        abstract: Lowercased abstract
+        summary: Lowercased summary or None
+        topics: Lowercased topics
 
     Returns:
         Relevance score (0.0 if no matches)
@@ -184,32 +563,66 @@ def calculate_relevance(
     if not query_terms:
         return 0.0
 
-    score = 0.0
-
     # Title matches (highest weight)
-    title = paper.get("title", "")
-    title_matches = count_matches(title, query_terms)
-    score += title_matches * WEIGHT_TITLE
+    score = sum(1 for term in query_terms if term in title) * WEIGHT_TITLE
 
     # Abstract matches
-    abstract = paper.get("abstract", "")
-    abstract_matches = count_matches(abstract, query_terms)
-    score += abstract_matches * WEIGHT_ABSTRACT
+    score += sum(1 for term in query_terms if term in abstract) * WEIGHT_ABSTRACT
 
     # Summary matches
     if summary:
-        summary_matches = count_matches(summary, query_terms)
-        score += summary_matches * WEIGHT_SUMMARY
+        score += sum(1 for term in query_terms if term in summary) * WEIGHT_SUMMARY
 
     # Topic matches
-    topics = paper.get("topics", [])
     for topic in topics:
-        topic_matches = count_matches(topic, query_terms)
-        score += topic_matches * WEIGHT_TOPIC
+        score += sum(1 for term in query_terms if term in topic) * WEIGHT_TOPIC
 
     return score
 
 
+def calculate_relevance(
+    query_terms: list[str],
+    paper: dict[str, Any],
+    summary: str | None,
+) -> float:
+    """Calculate relevance score for a paper.
+
+    Score is based on weighted matches across title, abstract, summary, and topics.
+
+    Args:
+        query_terms: List of query terms
+        paper: Paper metadata dictionary
+        summary: Summary content or None
+
+    Returns:
+        Relevance score (0.0 if no matches)
+    """
+    return _score_lowered(
+        query_terms,
+        paper.get("title", "").lower(),
+        paper.get("abstract", "").lower(),
+        summary.lower() if summary else None,
+        tuple(topic.lower() for topic in paper.get("topics", [])),
+    )
+
+
+@lru_cache(maxsize=32)
+def _terms_pattern(query_terms: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile an alternation matching any of the query terms.
+
+    At a given position the regex engine tries alternatives in order, so
+    the earliest match goes to the first listed term, as with a per-term
+    find loop.
+
+    Args:
+        query_terms: Query terms in query order
+
+    Returns:
+        Compiled pattern
+    """
+    return re.compile("|".join(map(re.escape, query_terms)))
+
+
 def extract_excerpt(
     query_terms: list[str],
     text: str,
@@ -232,25 +645,18 @@ def extract_excerpt(
 
     text_lower = text.lower()
 
-    # Find first matching term
-    best_pos = len(text)
-    matched_term = ""
+    # Find first matching term in a single scan
+    match = _terms_pattern(tuple(query_terms)).search(text_lower)
 
-    for term in query_terms:
-        pos = text_lower.find(term)
-        if pos != -1 and pos < best_pos:
-            best_pos = pos
-            matched_term = term
-
-    if best_pos == len(text):
+    if match is None:
         # No match found, return start of text
         if len(text) <= max_length:
             return text.strip()
         return text[:max_length].strip() + "..."
 
     # Calculate excerpt boundaries
-    start = max(0, best_pos - EXCERPT_CONTEXT)
-    end = min(len(text), best_pos + len(matched_term) + EXCERPT_CONTEXT)
+    start = max(0, match.start() - EXCERPT_CONTEXT)
+    end = min(len(text), match.end() + EXCERPT_CONTEXT)
 
     # Extend to word boundaries
     if start > 0:
@@ -273,10 +679,34 @@ def extract_excerpt(
     return f"{prefix}{excerpt}{suffix}"
 
 
+def load_summaries(
+    paper_ids: list[str],
+    data_dir: Path,
+    parallel: bool = True,
+) -> list[str | None]:
+    """Load summaries for several papers.
+
+    Reading is I/O bound, so large batches are read on a thread pool.
+
+    Args:
+        paper_ids: arXiv paper IDs
+        data_dir: Path to data directory
+        parallel: Use a thread pool for batches of PARALLEL_SUMMARY_MIN or more
+
+    Returns:
+        Summary content or None for each paper, in the order given
+    """
+    if parallel and len(paper_ids) >= PARALLEL_SUMMARY_MIN:
+        with ThreadPoolExecutor() as executor:
+            return list(executor.map(load_summary, paper_ids, repeat(data_dir)))
+    return [load_summary(paper_id, data_dir) for paper_id in paper_ids]
+
+
 def search_papers(
     query: str,
     data_dir: Path,
     limit: int = DEFAULT_LIMIT,
+    parallel: bool = True,
 ) -> tuple[list[dict[str, Any]], int]:
     """Search papers and return ranked results.
 
@@ -284,6 +714,7 @@ def search_papers(
         query: Search query string
         data_dir: Path to data directory
         limit: Maximum number of results to return
+        parallel: Read candidate summaries on a thread pool when there are many
 
     Returns:
         Tuple of (list of result dicts, total paper count)
@@ -299,8 +730,9 @@ def search_papers(
     if len(query) > MAX_QUERY_LENGTH:
         raise ValueError(f"Query too long (max {MAX_QUERY_LENGTH} characters)")
 
-    # Load index
-    index = load_index(data_dir)
+    # Load index and its precomputed search fields
+    cache_key = _index_cache_key(data_dir)
+    index = _load_index_cached(*cache_key)
     papers = index.get("papers", {})
     total_papers = len(papers)
 
@@ -314,34 +746,57 @@ def search_papers(
 
     logger.info("Searching for terms: %s", query_terms)
 
-    # Score all papers
+    # Score indexed fields from the postings, then add summary matches
+    entries = _load_search_entries(*cache_key)
+    field_scores = _score_index_fields(query_terms, cache_key)
+
+    # Papers without a summary already have their final score
+    final_scores: dict[int, tuple[float, str | None]] = {}
+    pending: list[int] = []
+    for position, score in field_scores.items():
+        if entries[position][1].get("has_summary"):
+            pending.append(position)
+        elif score > 0:
+            final_scores[position] = (score, None)
+
+    # Read summaries best-first and stop once no unread paper can reach the
+    # top results even if its summary matched every term
+    summary_bonus = len(query_terms) * WEIGHT_SUMMARY
+    pending.sort(key=lambda p: (-field_scores[p], p))
+    batch_size = max(SUMMARY_BATCH_FACTOR * limit, 1)
+
+    for start in range(0, len(pending), batch_size):
+        if len(final_scores) >= limit > 0:
+            threshold = heapq.nlargest(limit, (score for score, _ in final_scores.values()))[-1]
+            if field_scores[pending[start]] + summary_bonus < threshold:
+                break
+
+        batch = pending[start : start + batch_size]
+        paper_ids = [entries[position][0] for position in batch]
+        summaries = load_summaries(paper_ids, data_dir, parallel)
+        for position, summary in zip(batch, summaries, strict=True):
+            score = field_scores[position]
+            if summary:
+                score += count_matches(summary, query_terms) * WEIGHT_SUMMARY
+            if score > 0:
+                # Store summary to avoid duplicate file I/O during result building
+                final_scores[position] = (score, summary)
+
+    # Visit papers in index order so equal scores keep a stable ranking
     scored_papers: list[tuple[float, str, dict[str, Any], str | None]] = []
+    for position in sorted(final_scores):
+        paper_id, paper = entries[position]
+        score, summary = final_scores[position]
+        scored_papers.append((score, paper_id, paper, summary))
 
-    for paper_id, paper in papers.items():
-        # Validate paper ID to prevent path traversal attacks
-        if not validate_arxiv_id(paper_id):
-            logger.warning("Skipping paper with invalid ID: %s", paper_id)
-            continue
-
-        # Load summary if available
-        summary = None
-        if paper.get("has_summary"):
-            summary = load_summary(paper_id, data_dir)
-
-        # Calculate relevance
-        score = calculate_relevance(query_terms, paper, summary)
-
-        if score > 0:
-            # Store summary to avoid duplicate file I/O during result building
-            scored_papers.append((score, paper_id, paper, summary))
-
-    # Sort by score (descending)
-    scored_papers.sort(key=lambda x: x[0], reverse=True)
+    # Select the top results by score (descending); nlargest keeps index
+    # order among equal scores, like a stable sort, without sorting them all
+    top_papers = heapq.nlargest(limit, scored_papers, key=lambda x: x[0])
 
     # Build results
     results: list[dict[str, Any]] = []
 
-    for score, paper_id, paper, summary in scored_papers[:limit]:
+    for score, paper_id, paper, summary in top_papers:
         # Extract excerpt from abstract or summary (use cached summary)
         excerpt_text = paper.get("abstract", "")
         if summary:
@@ -400,7 +855,7 @@ def main() -> int:
             "results": results,
         }
 
-        print(json.dumps(output, indent=2, ensure_ascii=False))
+        _print_json(output)
         return 0
 
     except FileNotFoundError as e:
@@ -20,8 +20,13 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 # Constants
-ARXIV_ID_PATTERN = re.compile(r"^\d{4}\.\d{4,5}$")
+ARXIV_ID_PATTERN = re.compile(r"\d{4}\.\d{4,5}")
 
 # Configure logging
 logging.basicConfig(
@@ -41,7 +46,39 @@ def validate_arxiv_id(paper_id: str) -> bool:
     Returns:
         True if valid arXiv ID format, False otherwise
     """
-    return bool(ARXIV_ID_PATTERN.match(paper_id))
+    return ARXIV_ID_PATTERN.fullmatch(paper_id) is not None
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed.
+
+    Args:
+        data: Raw UTF-8 encoded JSON document
+
+    Returns:
+        Parsed JSON value
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+            (orjson's error type is a subclass)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a value to indented UTF-8 JSON, using orjson when it is installed.
+
+    Args:
+        obj: JSON-serializable value
+
+    Returns:
+        Encoded JSON document (2-space indent, non-ASCII preserved)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
 
 
 def update_metadata(paper_id: str, data_dir: Path) -> bool:
@@ -68,8 +105,7 @@ def update_metadata(paper_id: str, data_dir: Path) -> bool:
     tmp_path: Path | None = None
     try:
         # Load existing metadata
-        with metadata_path.open("r", encoding="utf-8") as f:
-            metadata: dict[str, Any] = json.load(f)
+        metadata: dict[str, Any] = _json_loads(metadata_path.read_bytes())
 
         # Update summary status
         metadata["has_summary"] = True
@@ -78,14 +114,13 @@ def update_metadata(paper_id: str, data_dir: Path) -> bool:
         # Atomic write using temp file
         paper_dir = metadata_path.parent
         with tempfile.NamedTemporaryFile(
-            mode="w",
+            mode="wb",
             dir=paper_dir,
             suffix=".json",
             delete=False,
-            encoding="utf-8",
         ) as tmp:
             tmp_path = Path(tmp.name)
-            json.dump(metadata, tmp, indent=2, ensure_ascii=False)
+            tmp.write(_json_dumps(metadata))
 
         # Atomic rename
         tmp_path.replace(metadata_path)
@@ -93,7 +128,7 @@ def update_metadata(paper_id: str, data_dir: Path) -> bool:
         logger.info("Updated metadata for paper %s", paper_id)
         return True
 
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         logger.error("Invalid JSON in metadata file: %s", e)
         return False
     except OSError as e:
@@ -132,8 +167,7 @@ def update_index(paper_id: str, data_dir: Path) -> bool:
     tmp_path: Path | None = None
     try:
         # Load existing index
-        with index_path.open("r", encoding="utf-8") as f:
-            index: dict[str, Any] = json.load(f)
+        index: dict[str, Any] = _json_loads(index_path.read_bytes())
 
         # Check if paper exists in index
         papers = index.get("papers", {})
@@ -148,14 +182,13 @@ def update_index(paper_id: str, data_dir: Path) -> bool:
         # Atomic write using temp file
         index_dir = index_path.parent
         with tempfile.NamedTemporaryFile(
-            mode="w",
+            mode="wb",
             dir=index_dir,
             suffix=".json",
             delete=False,
-            encoding="utf-8",
         ) as tmp:
             tmp_path = Path(tmp.name)
-            json.dump(index, tmp, indent=2, ensure_ascii=False)
+            tmp.write(_json_dumps(index))
 
         # Atomic rename
         tmp_path.replace(index_path)
@@ -163,7 +196,7 @@ def update_index(paper_id: str, data_dir: Path) -> bool:
         logger.info("Updated index for paper %s", paper_id)
         return True
 
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         logger.error("Invalid JSON in index file: %s", e)
         return False
     except OSError as e:
@@ -178,8 +211,12 @@ def update_index(paper_id: str, data_dir: Path) -> bool:
                 pass
 
 
-def main() -> int:
-    """Main entry point."""
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
     parser = argparse.ArgumentParser(description="Update paper summary status")
     parser.add_argument(
         "--paper-id",
@@ -194,7 +231,7 @@ def main() -> int:
         help="Data directory path (default: ./data)",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Validate paper ID format
     if not validate_arxiv_id(args.paper_id):
@@ -2,18 +2,35 @@
 
 from __future__ import annotations
 
+import io
 import json
-import tempfile
-from collections.abc import Generator
+import os
+import shutil
+import sys
+import zipfile
+from collections.abc import Callable, Generator
+from functools import cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
+if TYPE_CHECKING:
+    import responses
 
-@pytest.fixture
+SKILLS_DIR = Path(__file__).parent.parent / "skills"
+
+# Make the script directories importable once for every test module that uses them
+for _skill in ("paper-collaborator", "paper-blogger", "paper-collector", "paper-summarizer"):
+    sys.path.insert(0, str(SKILLS_DIR / _skill / "scripts"))
+
+
+@pytest.fixture(scope="session")
 def sample_paper() -> dict[str, Any]:
-    """Sample paper metadata for testing."""
+    """Sample paper metadata for testing, shared by every test; never modify.
+
+    Tests that need a variant build a new dict, e.g. ``{**sample_paper, ...}``.
+    """
     return {
         "id": "2401.12345",
         "title": "Test Paper: A Study on LLM Agents",
@@ -29,9 +46,9 @@ def sample_paper() -> dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_papers() -> list[dict[str, Any]]:
-    """List of sample papers for testing."""
+    """List of sample papers for testing, shared by every test; never modify."""
     return [
         {
             "id": "2401.12345",
@@ -64,13 +81,300 @@ def sample_papers() -> list[dict[str, Any]]:
 
 
 @pytest.fixture
-def temp_data_dir() -> Generator[Path, None, None]:
-    """Create a temporary data directory for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        data_dir = Path(tmpdir)
-        (data_dir / "papers").mkdir(parents=True)
-        (data_dir / "index").mkdir(parents=True)
-        yield data_dir
+def temp_data_dir(tmp_path: Path) -> Path:
+    """Create a temporary data directory for testing.
+
+    The directory is inside pytest's per-test ``tmp_path``, so it is unique
+    under ``pytest -n auto`` and kept after a failure for inspection. It lives
+    under ``TMPDIR``, which CI may point at a tmpfs mount, so tests must not
+    assume disk-level semantics.
+    """
+    data_dir = tmp_path / "temp_data"
+    os.makedirs(data_dir / "papers")
+    os.makedirs(data_dir / "index")
+    return data_dir
+
+
+@pytest.fixture(scope="session")
+def _paper_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Data directory skeleton with one summarized, indexed paper, built once."""
+    data_dir = tmp_path_factory.mktemp("paper_template")
+    paper_dir = data_dir / "papers" / "2401.12345"
+    os.makedirs(paper_dir)
+    os.makedirs(data_dir / "index")
+
+    metadata: dict[str, Any] = {"id": "2401.12345", "title": "Test", "has_summary": True}
+    (paper_dir / "metadata.json").write_bytes(json.dumps(metadata).encode("utf-8"))
+    (paper_dir / "summary.md").write_bytes(b"# Summary")
+
+    index_data: dict[str, Any] = {
+        "version": "1.0",
+        "papers": {"2401.12345": {"title": "Test", "has_summary": True}},
+    }
+    (data_dir / "index" / "papers.json").write_bytes(json.dumps(index_data).encode("utf-8"))
+    return data_dir
+
+
+@pytest.fixture
+def paper_data_dir(tmp_path: Path, _paper_template: Path) -> Path:
+    """Data directory pre-seeded with paper 2401.12345.
+
+    The paper has metadata.json (title "Test", has_summary true), summary.md
+    and an entry in index/papers.json. Each test gets its own copy of a
+    template built once per session.
+    """
+    data_dir = tmp_path / "data"
+    shutil.copytree(_paper_template, data_dir)
+    return data_dir
+
+
+@pytest.fixture(scope="session")
+def prebuilt_data_dir(tmp_path_factory: pytest.TempPathFactory, _paper_template: Path) -> Path:
+    """Shareable collection built once per session from the paper template.
+
+    Holds the same paper 2401.12345 as ``paper_data_dir`` plus
+    annotations/test_annotation.json. Every test sees the same directory, so
+    tests must only read from it and write their outputs elsewhere.
+    """
+    data_dir = tmp_path_factory.mktemp("prebuilt") / "data"
+    shutil.copytree(_paper_template, data_dir)
+
+    annotations_dir = data_dir / "papers" / "2401.12345" / "annotations"
+    os.makedirs(annotations_dir)
+    annotation: dict[str, Any] = {"id": "abc123", "content": "Test note"}
+    (annotations_dir / "test_annotation.json").write_bytes(json.dumps(annotation).encode("utf-8"))
+    return data_dir
+
+
+VALID_ARXIV_IDS = ["2401.12345", "2401.1234"]
+INVALID_ARXIV_IDS = [
+    "../etc/passwd",
+    "2401.12345/../..",
+    "invalid",
+    "240112345",
+    "2401.abcde",
+    "",
+    "2401.12345\n",
+]
+
+
+@pytest.fixture(params=VALID_ARXIV_IDS)
+def valid_arxiv_id(request: pytest.FixtureRequest) -> str:
+    """Well-formed arXiv IDs, one per parametrized test run."""
+    return str(request.param)
+
+
+@pytest.fixture(params=INVALID_ARXIV_IDS)
+def invalid_arxiv_id(request: pytest.FixtureRequest) -> str:
+    """Malformed or unsafe arXiv IDs, one per parametrized test run."""
+    return str(request.param)
+
+
+@pytest.fixture
+def seed_paper(temp_data_dir: Path) -> Callable[..., Path]:
+    """Factory that seeds a paper directory inside ``temp_data_dir``.
+
+    The returned callable takes a paper ID plus keyword options:
+    ``metadata`` (written to metadata.json), ``summary`` (written to
+    summary.md), ``with_index`` (adds the paper to index/papers.json) and
+    ``with_annotations`` (creates annotations/). It returns the paper
+    directory.
+    """
+
+    def _seed(
+        paper_id: str = "2401.12345",
+        *,
+        metadata: dict[str, Any] | None = None,
+        summary: str | None = None,
+        with_index: bool = False,
+        with_annotations: bool = False,
+    ) -> Path:
+        paper_dir = temp_data_dir / "papers" / paper_id
+        os.makedirs(paper_dir / "annotations" if with_annotations else paper_dir, exist_ok=True)
+
+        if metadata is not None:
+            (paper_dir / "metadata.json").write_bytes(json.dumps(metadata).encode("utf-8"))
+
+        if summary is not None:
+            (paper_dir / "summary.md").write_bytes(summary.encode("utf-8"))
+
+        if with_index:
+            title = (metadata or {}).get("title", "")
+            index_data: dict[str, Any] = {
+                "version": "1.0",
+                "papers": {paper_id: {"title": title}},
+            }
+            (temp_data_dir / "index" / "papers.json").write_bytes(
+                json.dumps(index_data).encode("utf-8")
+            )
+
+        return paper_dir
+
+    return _seed
+
+
+# Fixed timestamp for package entries so the generated ZIPs are reproducible
+PACKAGE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def _pack_entries(entries: dict[str, str]) -> bytes:
+    """Pack entries into an uncompressed ZIP with fixed timestamps, in memory."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED, allowZip64=False) as zf:
+        for name, data in entries.items():
+            info = zipfile.ZipInfo(name, date_time=PACKAGE_DATE_TIME)
+            info.compress_type = zipfile.ZIP_STORED
+            zf.writestr(info, data)
+    return buffer.getvalue()
+
+
+# Payloads that are identical in every package, encoded once at import time
+PACKAGE_SUMMARY_MD = "# Summary\n\nTest summary."
+PACKAGE_ANNOTATION_JSON = json.dumps({"id": "abc", "content": "Note"})
+
+
+@cache
+def _package_metadata_json(paper_id: str) -> str:
+    """Encoded metadata.json for a packaged paper, cached per paper ID."""
+    metadata: dict[str, Any] = {
+        "id": paper_id,
+        "title": f"Paper {paper_id}",
+        "authors": ["Test Author"],
+        "abstract": "Test abstract",
+        "collected_at": "2026-01-27T10:00:00Z",
+    }
+    return json.dumps(metadata)
+
+
+@cache
+def _build_test_package(
+    paper_ids: tuple[str, ...],
+    include_summary: bool = False,
+    include_annotations: bool = False,
+) -> bytes:
+    """Build a collection package ZIP in the layout produced by share_collection.py.
+
+    Entries are staged in a dict and packed in one pass. Results are cached
+    per package shape, so identical packages are only encoded once per session.
+    """
+    manifest: dict[str, Any] = {
+        "version": "1.0",
+        "created_at": "2026-01-27T10:00:00Z",
+        "created_by": "test",
+        "paper_count": len(paper_ids),
+    }
+    entries = {"manifest.json": json.dumps(manifest)}
+
+    for paper_id in paper_ids:
+        entries[f"papers/{paper_id}/metadata.json"] = _package_metadata_json(paper_id)
+
+        if include_summary:
+            entries[f"papers/{paper_id}/summary.md"] = PACKAGE_SUMMARY_MD
+
+        if include_annotations:
+            entries[f"papers/{paper_id}/annotations/note.json"] = PACKAGE_ANNOTATION_JSON
+
+    index_data: dict[str, Any] = {
+        "version": "1.0",
+        "papers": {pid: {"title": f"Paper {pid}"} for pid in paper_ids},
+    }
+    entries["index/papers.json"] = json.dumps(index_data)
+
+    return _pack_entries(entries)
+
+
+# Package fixtures are built once per session and shared between tests, so
+# tests must only read them (import_package never modifies its input).
+
+
+@pytest.fixture(scope="session")
+def package_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Session-wide directory holding the prebuilt test packages."""
+    return tmp_path_factory.mktemp("packages")
+
+
+@pytest.fixture(scope="session")
+def basic_zip(package_dir: Path) -> Path:
+    """Package with a single paper and no summaries or annotations."""
+    output_path = package_dir / "basic.zip"
+    output_path.write_bytes(_build_test_package(("2401.12345",)))
+    return output_path
+
+
+@pytest.fixture(scope="session")
+def summary_zip(package_dir: Path) -> Path:
+    """Package with a single paper and its summary."""
+    output_path = package_dir / "summary.zip"
+    output_path.write_bytes(_build_test_package(("2401.12345",), include_summary=True))
+    return output_path
+
+
+@pytest.fixture(scope="session")
+def annotations_zip(package_dir: Path) -> Path:
+    """Package with a single paper and one annotation."""
+    output_path = package_dir / "annotations.zip"
+    output_path.write_bytes(_build_test_package(("2401.12345",), include_annotations=True))
+    return output_path
+
+
+@pytest.fixture(scope="session")
+def multi_paper_zip(package_dir: Path) -> Path:
+    """Package with three papers, each with a summary and an annotation."""
+    output_path = package_dir / "multi_paper.zip"
+    output_path.write_bytes(
+        _build_test_package(
+            ("2401.12345", "2401.12346", "2401.12347"),
+            include_summary=True,
+            include_annotations=True,
+        )
+    )
+    return output_path
+
+
+@pytest.fixture(scope="session")
+def no_manifest_zip(package_dir: Path) -> Path:
+    """Package that is missing its manifest.json."""
+    output_path = package_dir / "no_manifest.zip"
+    output_path.write_bytes(_pack_entries({"papers/2401.12345/metadata.json": "{}"}))
+    return output_path
+
+
+@pytest.fixture(scope="session")
+def traversal_zip(package_dir: Path) -> Path:
+    """Package containing an entry that escapes the extraction directory."""
+    manifest: dict[str, Any] = {
+        "version": "1.0",
+        "created_at": "2026-01-27",
+        "paper_count": 1,
+    }
+    output_path = package_dir / "traversal.zip"
+    output_path.write_bytes(
+        _pack_entries(
+            {"manifest.json": json.dumps(manifest), "../../../etc/passwd": "malicious"}
+        )
+    )
+    return output_path
+
+
+@pytest.fixture(scope="session")
+def _responses_mock() -> Generator[responses.RequestsMock, None, None]:
+    """Start a single ``responses`` mock shared by the whole test session."""
+    import responses
+
+    mock = responses.RequestsMock(assert_all_requests_are_fired=False)
+    mock.start()
+    yield mock
+    mock.stop(allow_assert=False)
+
+
+@pytest.fixture
+def mocked_responses(
+    _responses_mock: responses.RequestsMock,
+) -> Generator[responses.RequestsMock, None, None]:
+    """Shared ``responses`` mock with a clean registry and call log per test."""
+    _responses_mock.reset()
+    yield _responses_mock
+    _responses_mock.reset()
 
 
 @pytest.fixture
@@ -410,6 +410,7 @@ class TestBuildDigestContent:
         assert "No papers collected in this time period" in content
 
 
+@pytest.mark.cli
 class TestCliArguments:
     """Tests for CLI argument parsing."""
 
@@ -455,6 +456,7 @@ class TestCliArguments:
             assert result == 1  # Should fail
 
 
+@pytest.mark.cli
 class TestMainFunction:
     """Tests for main function integration."""
 
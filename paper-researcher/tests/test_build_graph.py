@@ -212,6 +212,7 @@ class TestSaveIndex:
         assert (data_dir / "index" / "citations.json").exists()
 
 
+@pytest.mark.cli
 class TestCliArguments:
     """Tests for CLI argument parsing."""
 
@@ -500,6 +500,7 @@ class TestExportCsv:
         assert "Jones" in rows[0]["authors"]
 
 
+@pytest.mark.cli
 class TestCliArguments:
     """Tests for CLI argument parsing."""
 
@@ -2,16 +2,11 @@
 
 from __future__ import annotations
 
-import sys
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 import responses
-
-# Add scripts directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "paper-collector" / "scripts"))
-
 from fetch_arxiv import (
     ARXIV_BASE_URL,
     build_query,
@@ -44,6 +39,15 @@ class TestBuildQuery:
         assert " TO " in query
         assert "]" in query
 
+    def test_date_range_values(self) -> None:
+        """Test that the range runs from N days ago through today."""
+        from datetime import date, timedelta
+
+        query = build_query("test", 7)
+        today = date.today()
+        start = today - timedelta(days=7)
+        assert f"[{start:%Y%m%d} TO {today:%Y%m%d}]" in query
+
     def test_different_days(self) -> None:
         """Test query with different day ranges."""
         query_7 = build_query("test", 7)
@@ -113,10 +117,11 @@ class TestParseResponse:
 class TestRetryLogic:
     """Tests for retry logic in fetch_with_retry."""
 
-    @responses.activate
-    def test_successful_request(self, arxiv_response_xml: str) -> None:
+    def test_successful_request(
+        self, arxiv_response_xml: str, mocked_responses: responses.RequestsMock
+    ) -> None:
         """Test successful request without retries."""
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             ARXIV_BASE_URL,
             body=arxiv_response_xml,
@@ -125,17 +130,19 @@ class TestRetryLogic:
 
         from fetch_arxiv import fetch_with_retry
 
-        result = fetch_with_retry("test query", 10)
+        with patch("fetch_arxiv.time.sleep"):
+            result = fetch_with_retry("test query", 10)
         assert result == arxiv_response_xml
-        assert len(responses.calls) == 1
+        assert len(mocked_responses.calls) == 1
 
-    @responses.activate
-    def test_retry_on_503(self, arxiv_response_xml: str) -> None:
+    def test_retry_on_503(
+        self, arxiv_response_xml: str, mocked_responses: responses.RequestsMock
+    ) -> None:
         """Test retry on 503 error."""
         # First two calls fail, third succeeds
-        responses.add(responses.GET, ARXIV_BASE_URL, status=503)
-        responses.add(responses.GET, ARXIV_BASE_URL, status=503)
-        responses.add(
+        mocked_responses.add(responses.GET, ARXIV_BASE_URL, status=503)
+        mocked_responses.add(responses.GET, ARXIV_BASE_URL, status=503)
+        mocked_responses.add(
             responses.GET,
             ARXIV_BASE_URL,
             body=arxiv_response_xml,
@@ -148,14 +155,13 @@ class TestRetryLogic:
             result = fetch_with_retry("test query", 10)
 
         assert result == arxiv_response_xml
-        assert len(responses.calls) == 3
+        assert len(mocked_responses.calls) == 3
 
-    @responses.activate
-    def test_all_retries_fail(self) -> None:
+    def test_all_retries_fail(self, mocked_responses: responses.RequestsMock) -> None:
         """Test that exception is raised when all retries fail."""
-        responses.add(responses.GET, ARXIV_BASE_URL, status=503)
-        responses.add(responses.GET, ARXIV_BASE_URL, status=503)
-        responses.add(responses.GET, ARXIV_BASE_URL, status=503)
+        mocked_responses.add(responses.GET, ARXIV_BASE_URL, status=503)
+        mocked_responses.add(responses.GET, ARXIV_BASE_URL, status=503)
+        mocked_responses.add(responses.GET, ARXIV_BASE_URL, status=503)
 
         import requests
         from fetch_arxiv import fetch_with_retry
@@ -168,22 +174,21 @@ class TestRetryLogic:
 class TestErrorHandling:
     """Tests for error handling."""
 
-    @responses.activate
-    def test_network_timeout(self) -> None:
+    def test_network_timeout(self, mocked_responses: responses.RequestsMock) -> None:
         """Test handling of network timeout."""
         import requests
 
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             ARXIV_BASE_URL,
             body=requests.exceptions.Timeout("Connection timed out"),
         )
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             ARXIV_BASE_URL,
             body=requests.exceptions.Timeout("Connection timed out"),
         )
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             ARXIV_BASE_URL,
             body=requests.exceptions.Timeout("Connection timed out"),
@@ -203,6 +208,7 @@ class TestErrorHandling:
         assert papers == []
 
 
+@pytest.mark.cli
 class TestCliArguments:
     """Tests for CLI argument parsing."""
 
@@ -212,10 +218,14 @@ class TestCliArguments:
             with patch("sys.argv", ["fetch_arxiv.py"]):
                 main()
 
-    @responses.activate
-    def test_all_arguments(self, arxiv_response_xml: str, tmp_path: Path) -> None:
+    def test_all_arguments(
+        self,
+        arxiv_response_xml: str,
+        tmp_path: Path,
+        mocked_responses: responses.RequestsMock,
+    ) -> None:
         """Test all CLI arguments work correctly."""
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             ARXIV_BASE_URL,
             body=arxiv_response_xml,
@@ -253,10 +263,11 @@ class TestCliArguments:
         assert data["query"] == "LLM agents"
         assert data["days"] == 14
 
-    @responses.activate
-    def test_default_arguments(self, arxiv_response_xml: str) -> None:
+    def test_default_arguments(
+        self, arxiv_response_xml: str, mocked_responses: responses.RequestsMock
+    ) -> None:
         """Test default values for optional arguments."""
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             ARXIV_BASE_URL,
             body=arxiv_response_xml,
@@ -272,8 +283,8 @@ class TestCliArguments:
 
         assert exit_code == 0
         # Verify the call was made with expected default parameters
-        assert len(responses.calls) == 1
-        call = responses.calls[0]
+        assert len(mocked_responses.calls) == 1
+        call = mocked_responses.calls[0]
         assert call.request.url is not None
         assert "max_results=50" in call.request.url
         assert "start=0" in call.request.url
@@ -9,7 +9,9 @@ from typing import Any
 from unittest.mock import patch
 
 import pytest
+import requests
 import responses
+from responses import matchers
 
 # Add scripts directory to path for imports
 sys.path.insert(
@@ -18,6 +20,7 @@ sys.path.insert(
 
 from fetch_citations import (
     S2_BASE_URL,
+    S2_FIELDS,
     extract_arxiv_ids,
     filter_in_collection,
     load_index,
@@ -76,6 +79,22 @@ class TestExtractArxivIds:
         ids = extract_arxiv_ids(papers)
         assert ids == ["2301.5432"]
 
+    def test_skip_null_external_ids(self) -> None:
+        """Test that references with null externalIds are skipped."""
+        papers: list[dict[str, Any]] = [
+            {"paperId": "abc", "externalIds": None},
+            {"paperId": "def"},
+            {"paperId": "ghi", "externalIds": {"ArXiv": "2312.9876"}},
+        ]
+        assert extract_arxiv_ids(papers) == ["2312.9876"]
+
+    def test_ids_are_interned(self) -> None:
+        """Test that extracted IDs are interned strings."""
+        arxiv_id = "".join(["2301.", "5432"])  # built at runtime, not a constant
+        papers = [{"paperId": "abc", "externalIds": {"ArXiv": arxiv_id}}]
+        ids = extract_arxiv_ids(papers)
+        assert ids[0] is sys.intern("2301.5432")
+
     def test_empty_list(self) -> None:
         """Test empty input returns empty list."""
         assert extract_arxiv_ids([]) == []
@@ -101,6 +120,13 @@ class TestFilterInCollection:
         filtered = filter_in_collection(arxiv_ids, index)
         assert filtered == ["2301.5432", "2312.9876"]
 
+    def test_preserves_input_order(self) -> None:
+        """Test that filtered IDs keep the order they were given in."""
+        index: dict[str, Any] = {"papers": {"2301.5432": {}, "2312.9876": {}}}
+        arxiv_ids = ["2312.9876", "2401.1234", "2301.5432"]
+        filtered = filter_in_collection(arxiv_ids, index)
+        assert filtered == ["2312.9876", "2301.5432"]
+
     def test_empty_collection(self) -> None:
         """Test with empty collection."""
         index: dict[str, Any] = {"papers": {}}
@@ -141,6 +167,24 @@ class TestLoadIndex:
         result = load_index(temp_data_dir)
         assert result == {"papers": {}}
 
+    def test_repeated_load_is_cached(self, temp_data_dir: Path) -> None:
+        """Test that repeated loads reuse the parsed index."""
+        index_path = temp_data_dir / "index" / "papers.json"
+        index_path.write_text(json.dumps({"papers": {"2401.12345": {}}}))
+
+        first = load_index(temp_data_dir)
+        second = load_index(temp_data_dir)
+        assert second is first
+
+    def test_changed_index_is_reloaded(self, temp_data_dir: Path) -> None:
+        """Test that rewriting the index invalidates the cached copy."""
+        index_path = temp_data_dir / "index" / "papers.json"
+        index_path.write_text(json.dumps({"papers": {"2401.12345": {}}}))
+        assert list(load_index(temp_data_dir)["papers"]) == ["2401.12345"]
+
+        index_path.write_text(json.dumps({"papers": {"2401.12345": {}, "2401.12346": {}}}))
+        assert list(load_index(temp_data_dir)["papers"]) == ["2401.12345", "2401.12346"]
+
 
 class TestUpdateMetadata:
     """Tests for update_metadata function."""
@@ -189,6 +233,19 @@ class TestUpdateMetadata:
         updated = json.loads((paper_dir / "metadata.json").read_text())
         assert updated["citation_data"]["source"] == "unavailable"
 
+    def test_update_leaves_no_temp_files(self, temp_data_dir: Path) -> None:
+        """Test that the atomic write cleans up its temp file."""
+        paper_dir = temp_data_dir / "papers" / "2401.12345"
+        paper_dir.mkdir(parents=True)
+        metadata = {"id": "2401.12345", "title": "Test Paper"}
+        (paper_dir / "metadata.json").write_text(json.dumps(metadata))
+
+        index: dict[str, Any] = {"papers": {"2401.12345": {}}}
+
+        result = update_metadata("2401.12345", None, temp_data_dir, index)
+        assert result is True
+        assert [p.name for p in paper_dir.iterdir()] == ["metadata.json"]
+
     def test_invalid_paper_id(self, temp_data_dir: Path) -> None:
         """Test with invalid paper ID."""
         index: dict[str, Any] = {"papers": {}}
@@ -202,11 +259,36 @@ class TestUpdateMetadata:
         assert result is False
 
 
+class TestRateLimit:
+    """Tests for _wait_for_rate_limit function."""
+
+    def test_sleeps_only_remaining_delay(self) -> None:
+        """Test that only the unelapsed part of REQUEST_DELAY is slept."""
+        import fetch_citations
+
+        with patch.object(fetch_citations, "_last_request_time", 100.0):
+            with patch("fetch_citations.time.monotonic", return_value=101.0):
+                with patch("fetch_citations.time.sleep") as mock_sleep:
+                    fetch_citations._wait_for_rate_limit()
+
+        mock_sleep.assert_called_once_with(fetch_citations.REQUEST_DELAY - 1.0)
+
+    def test_no_sleep_after_delay_elapsed(self) -> None:
+        """Test that no sleep happens once REQUEST_DELAY has passed."""
+        import fetch_citations
+
+        with patch.object(fetch_citations, "_last_request_time", 100.0):
+            with patch("fetch_citations.time.monotonic", return_value=200.0):
+                with patch("fetch_citations.time.sleep") as mock_sleep:
+                    fetch_citations._wait_for_rate_limit()
+
+        mock_sleep.assert_not_called()
+
+
 class TestFetchWithRetry:
     """Tests for fetch_with_retry function."""
 
-    @responses.activate
-    def test_successful_fetch(self) -> None:
+    def test_successful_fetch(self, mocked_responses: responses.RequestsMock) -> None:
         """Test successful fetch from S2 API."""
         s2_response: dict[str, Any] = {
             "paperId": "abc",
@@ -215,7 +297,7 @@ class TestFetchWithRetry:
             "references": [],
             "citations": [],
         }
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             f"{S2_BASE_URL}/paper/arXiv:2401.12345",
             json=s2_response,
@@ -230,10 +312,33 @@ class TestFetchWithRetry:
         assert result is not None
         assert result["citationCount"] == 10
 
-    @responses.activate
-    def test_not_found_returns_none(self) -> None:
+    def test_requests_nested_external_ids(self, mocked_responses: responses.RequestsMock) -> None:
+        """Test a single-paper fetch asks for the IDs extract_arxiv_ids reads."""
+        mocked_responses.add(
+            responses.GET,
+            f"{S2_BASE_URL}/paper/arXiv:2401.12345",
+            json={"paperId": "abc"},
+            status=200,
+            match=[
+                matchers.query_param_matcher(
+                    {
+                        "fields": "citationCount,referenceCount,externalIds,"
+                        "references.externalIds,citations.externalIds"
+                    }
+                )
+            ],
+        )
+
+        from fetch_citations import fetch_with_retry
+
+        with patch("fetch_citations.time.sleep"):
+            result = fetch_with_retry("2401.12345")
+
+        assert result == {"paperId": "abc"}
+
+    def test_not_found_returns_none(self, mocked_responses: responses.RequestsMock) -> None:
         """Test 404 returns None."""
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             f"{S2_BASE_URL}/paper/arXiv:2401.99999",
             status=404,
@@ -246,6 +351,24 @@ class TestFetchWithRetry:
 
         assert result is None
 
+    def test_invalid_json_raises_request_exception(
+        self, mocked_responses: responses.RequestsMock
+    ) -> None:
+        """Test that an undecodable body surfaces as a RequestException."""
+        mocked_responses.add(
+            responses.GET,
+            f"{S2_BASE_URL}/paper/arXiv:2401.12345",
+            body="not valid json {{{",
+            status=200,
+        )
+
+        import requests
+        from fetch_citations import fetch_with_retry
+
+        with patch("fetch_citations.time.sleep"):
+            with pytest.raises(requests.RequestException):
+                fetch_with_retry("2401.12345")
+
     @responses.activate
     def test_rate_limited_retries(self) -> None:
         """Test 429 rate limit handling."""
@@ -270,6 +393,75 @@ class TestFetchWithRetry:
         assert len(responses.calls) == 2
 
 
+class TestFetchBatch:
+    """Tests for fetch_batch function."""
+
+    def test_batch_maps_results_to_ids(self, mocked_responses: responses.RequestsMock) -> None:
+        """Test batch results are keyed by input ID with None for unknown papers."""
+        mocked_responses.add(
+            responses.POST,
+            f"{S2_BASE_URL}/paper/batch",
+            json=[{"paperId": "abc", "citationCount": 7}, None],
+            status=200,
+        )
+
+        from fetch_citations import fetch_batch
+
+        with patch("fetch_citations.time.sleep"):
+            result = fetch_batch(["2401.12345", "2401.99999"])
+
+        assert result["2401.12345"] is not None
+        assert result["2401.12345"]["citationCount"] == 7
+        assert result["2401.99999"] is None
+        body = mocked_responses.calls[0].request.body
+        assert isinstance(body, (bytes, str))
+        assert json.loads(body) == {"ids": ["arXiv:2401.12345", "arXiv:2401.99999"]}
+
+    def test_batch_rate_limited_retries(self, mocked_responses: responses.RequestsMock) -> None:
+        """Test 429 rate limit handling for batch requests."""
+        mocked_responses.add(responses.POST, f"{S2_BASE_URL}/paper/batch", status=429)
+        mocked_responses.add(
+            responses.POST,
+            f"{S2_BASE_URL}/paper/batch",
+            json=[{"paperId": "abc"}, {"paperId": "def"}],
+            status=200,
+        )
+
+        from fetch_citations import fetch_batch
+
+        with patch("fetch_citations.time.sleep"):
+            result = fetch_batch(["2401.12345", "2401.12346"])
+
+        assert all(value is not None for value in result.values())
+        assert len(mocked_responses.calls) == 2
+
+    @pytest.mark.parametrize(
+        "body",
+        [{"error": "Internal error"}, [{"paperId": "abc"}]],
+        ids=["object", "length-mismatch"],
+    )
+    def test_unexpected_body_falls_back_to_single_fetches(
+        self, mocked_responses: responses.RequestsMock, body: Any
+    ) -> None:
+        """Test a batch body that isn't one entry per ID is refetched paper by paper."""
+        mocked_responses.add(responses.POST, f"{S2_BASE_URL}/paper/batch", json=body)
+        mocked_responses.add(
+            responses.GET,
+            f"{S2_BASE_URL}/paper/arXiv:2401.12345",
+            json={"paperId": "abc", "citationCount": 7},
+        )
+        mocked_responses.add(responses.GET, f"{S2_BASE_URL}/paper/arXiv:2401.12346", status=404)
+
+        from fetch_citations import fetch_batch
+
+        with patch("fetch_citations.time.sleep"):
+            result = fetch_batch(["2401.12345", "2401.12346"])
+
+        assert result == {"2401.12345": {"paperId": "abc", "citationCount": 7}, "2401.12346": None}
+        assert [call.request.method for call in mocked_responses.calls] == ["POST", "GET", "GET"]
+
+
+@pytest.mark.cli
 class TestCliArguments:
     """Tests for CLI argument parsing."""
 
@@ -302,3 +494,120 @@ class TestCliArguments:
                 "sys.argv", ["fetch_citations.py", "--paper-id", "2401.12345"]
             ):
                 main()
+
+
+def _seed_collection(data_dir: Path, paper_ids: list[str]) -> None:
+    """Write an index and a minimal metadata.json for each paper ID."""
+    index: dict[str, Any] = {"version": "1.0", "papers": {}}
+    for paper_id in paper_ids:
+        index["papers"][paper_id] = {"title": f"Paper {paper_id}"}
+        if validate_arxiv_id(paper_id):
+            paper_dir = data_dir / "papers" / paper_id
+            paper_dir.mkdir(parents=True)
+            (paper_dir / "metadata.json").write_bytes(json.dumps({"id": paper_id}).encode())
+    (data_dir / "index" / "papers.json").write_bytes(json.dumps(index).encode())
+
+
+def _s2_paper(*reference_ids: str) -> dict[str, Any]:
+    """S2 paper object whose references point at the given arXiv IDs."""
+    return {
+        "citationCount": 1,
+        "referenceCount": len(reference_ids),
+        "references": [{"externalIds": {"ArXiv": ref}} for ref in reference_ids],
+        "citations": [],
+    }
+
+
+@pytest.mark.cli
+class TestMainBatching:
+    """Tests for the chunked fetch loop in main."""
+
+    @pytest.fixture(autouse=True)
+    def _small_batches(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Use two-paper batches and skip the rate-limit and retry sleeps."""
+        monkeypatch.setattr("fetch_citations.BATCH_SIZE", 2)
+        monkeypatch.setattr("fetch_citations.time.sleep", lambda _seconds: None)
+
+    def test_all_papers_fetched_in_chunks(
+        self,
+        temp_data_dir: Path,
+        mocked_responses: responses.RequestsMock,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test --all splits IDs into batches and fetches a final single ID on its own."""
+        paper_ids = [f"2401.0000{i}" for i in range(1, 6)]
+        _seed_collection(temp_data_dir, paper_ids)
+
+        batch_url = f"{S2_BASE_URL}/paper/batch"
+        for chunk in (paper_ids[0:2], paper_ids[2:4]):
+            mocked_responses.add(
+                responses.POST,
+                batch_url,
+                json=[_s2_paper(paper_ids[4]), None],
+                match=[matchers.json_params_matcher({"ids": [f"arXiv:{i}" for i in chunk]})],
+            )
+        mocked_responses.add(
+            responses.GET,
+            f"{S2_BASE_URL}/paper/arXiv:{paper_ids[4]}",
+            json=_s2_paper(paper_ids[0]),
+            match=[matchers.query_param_matcher({"fields": S2_FIELDS})],
+        )
+
+        exit_code = main(["--all", "--data-dir", str(temp_data_dir)])
+
+        assert exit_code == 0
+        assert [call.request.method for call in mocked_responses.calls] == ["POST", "POST", "GET"]
+        output = json.loads(capsys.readouterr().out)
+        assert output == {
+            "success": True,
+            "papers_processed": 5,
+            "papers_with_citations": 3,
+            "papers_not_found": 2,
+            "errors": [],
+        }
+
+        # The single-ID chunk fills its in-collection references like a batch does
+        for paper_id, expected in ((paper_ids[0], [paper_ids[4]]), (paper_ids[4], [paper_ids[0]])):
+            metadata_path = temp_data_dir / "papers" / paper_id / "metadata.json"
+            citation_data = json.loads(metadata_path.read_bytes())["citation_data"]
+            assert citation_data["references_in_collection"] == expected
+
+    def test_invalid_ids_and_failed_batch_reported(
+        self,
+        temp_data_dir: Path,
+        mocked_responses: responses.RequestsMock,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test invalid IDs are dropped before batching and a failed batch errors every ID."""
+        paper_ids = ["2401.00001", "bad-id", "2401.00002", "2401.00003"]
+        _seed_collection(temp_data_dir, paper_ids)
+
+        mocked_responses.add(
+            responses.POST,
+            f"{S2_BASE_URL}/paper/batch",
+            body=requests.ConnectionError("connection reset"),
+        )
+        mocked_responses.add(
+            responses.GET,
+            f"{S2_BASE_URL}/paper/arXiv:2401.00003",
+            status=404,
+        )
+
+        exit_code = main(["--all", "--data-dir", str(temp_data_dir)])
+
+        assert exit_code == 1
+        body = mocked_responses.calls[0].request.body
+        assert isinstance(body, (bytes, str))
+        assert json.loads(body) == {"ids": ["arXiv:2401.00001", "arXiv:2401.00002"]}
+        output = json.loads(capsys.readouterr().out)
+        assert output == {
+            "success": False,
+            "papers_processed": 1,
+            "papers_with_citations": 0,
+            "papers_not_found": 1,
+            "errors": [
+                "Invalid ID: bad-id",
+                "Fetch failed: 2401.00001",
+                "Fetch failed: 2401.00002",
+            ],
+        }
@@ -3,22 +3,18 @@
 from __future__ import annotations
 
 import json
-import sys
+import os
 import zipfile
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 from unittest.mock import patch
 
 import pytest
-
-# Add scripts directory to path for imports
-sys.path.insert(
-    0, str(Path(__file__).parent.parent / "skills" / "paper-collaborator" / "scripts")
-)
-
 from import_collection import (
     import_package,
     load_index,
+    load_index_bytes,
     main,
     save_index,
     validate_arxiv_id,
@@ -26,20 +22,37 @@ from import_collection import (
     validate_zip_path,
 )
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    """Write a test fixture as JSON, using orjson when it is installed."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj))
+    else:
+        path.write_bytes(json.dumps(obj).encode("utf-8"))
+
+
+def _loads(data: str | bytes) -> Any:
+    """Parse a JSON document, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class TestValidateArxivId:
     """Tests for validate_arxiv_id function."""
 
-    def test_valid_id(self) -> None:
+    def test_valid_id(self, valid_arxiv_id: str) -> None:
         """Test valid arXiv IDs."""
-        assert validate_arxiv_id("2401.12345") is True
-        assert validate_arxiv_id("2401.1234") is True
+        assert validate_arxiv_id(valid_arxiv_id) is True
 
-    def test_invalid_id(self) -> None:
+    def test_invalid_id(self, invalid_arxiv_id: str) -> None:
         """Test invalid arXiv IDs."""
-        assert validate_arxiv_id("../etc/passwd") is False
-        assert validate_arxiv_id("invalid") is False
-        assert validate_arxiv_id("") is False
+        assert validate_arxiv_id(invalid_arxiv_id) is False
 
 
 class TestValidateZipPath:
@@ -126,17 +139,9 @@ class TestValidateManifest:
 class TestLoadIndex:
     """Tests for load_index function."""
 
-    def test_load_existing_index(self, temp_data_dir: Path) -> None:
+    def test_load_existing_index(self, prebuilt_data_dir: Path) -> None:
         """Test loading existing index."""
-        index_dir = temp_data_dir / "index"
-        index_dir.mkdir(parents=True, exist_ok=True)
-        index_data: dict[str, Any] = {
-            "version": "1.0",
-            "papers": {"2401.12345": {"title": "Test"}},
-        }
-        (index_dir / "papers.json").write_text(json.dumps(index_data), encoding="utf-8")
-
-        index = load_index(temp_data_dir)
+        index = load_index(prebuilt_data_dir)
         assert "2401.12345" in index["papers"]
 
     def test_missing_index_returns_empty(self, temp_data_dir: Path) -> None:
@@ -145,6 +150,27 @@ class TestLoadIndex:
         assert index["papers"] == {}
 
 
+class TestLoadIndexBytes:
+    """Tests for load_index_bytes function."""
+
+    def test_fills_defaults(self) -> None:
+        """Test missing version and papers keys are filled in."""
+        index = load_index_bytes(b"{}")
+        assert index == {"version": "1.0", "papers": {}}
+
+    def test_non_object_rejected(self) -> None:
+        """Test a JSON document that is not an object is rejected."""
+        with pytest.raises(ValueError):
+            load_index_bytes(b"[]")
+
+    def test_non_object_index_on_disk_returns_empty(self, temp_data_dir: Path) -> None:
+        """Test load_index falls back to an empty index for a non-object file."""
+        (temp_data_dir / "index" / "papers.json").write_bytes(b"[]")
+
+        index = load_index(temp_data_dir)
+        assert index["papers"] == {}
+
+
 class TestSaveIndex:
     """Tests for save_index function."""
 
@@ -160,7 +186,7 @@ class TestSaveIndex:
         index_path = temp_data_dir / "index" / "papers.json"
         assert index_path.exists()
 
-        saved = json.loads(index_path.read_text(encoding="utf-8"))
+        saved = _loads(index_path.read_bytes())
         assert "2401.12345" in saved["papers"]
         assert "updated_at" in saved
 
@@ -168,65 +194,10 @@ class TestSaveIndex:
 class TestImportPackage:
     """Tests for import_package function."""
 
-    def create_test_package(
-        self,
-        output_path: Path,
-        paper_ids: list[str],
-        include_summary: bool = False,
-        include_annotations: bool = False,
-    ) -> None:
-        """Helper to create test ZIP package."""
-        with zipfile.ZipFile(output_path, "w") as zf:
-            # Add manifest
-            manifest: dict[str, Any] = {
-                "version": "1.0",
-                "created_at": "2026-01-27T10:00:00Z",
-                "created_by": "test",
-                "paper_count": len(paper_ids),
-            }
-            zf.writestr("manifest.json", json.dumps(manifest))
-
-            # Add papers
-            for paper_id in paper_ids:
-                metadata: dict[str, Any] = {
-                    "id": paper_id,
-                    "title": f"Paper {paper_id}",
-                    "authors": ["Test Author"],
-                    "abstract": "Test abstract",
-                    "collected_at": "2026-01-27T10:00:00Z",
-                }
-                zf.writestr(
-                    f"papers/{paper_id}/metadata.json",
-                    json.dumps(metadata),
-                )
-
-                if include_summary:
-                    zf.writestr(
-                        f"papers/{paper_id}/summary.md",
-                        "# Summary\n\nTest summary.",
-                    )
-
-                if include_annotations:
-                    annotation: dict[str, Any] = {"id": "abc", "content": "Note"}
-                    zf.writestr(
-                        f"papers/{paper_id}/annotations/note.json",
-                        json.dumps(annotation),
-                    )
-
-            # Add index
-            index_data: dict[str, Any] = {
-                "version": "1.0",
-                "papers": {pid: {"title": f"Paper {pid}"} for pid in paper_ids},
-            }
-            zf.writestr("index/papers.json", json.dumps(index_data))
-
-    def test_import_basic_package(self, temp_data_dir: Path) -> None:
+    def test_import_basic_package(self, temp_data_dir: Path, basic_zip: Path) -> None:
         """Test importing a basic package."""
-        package_path = temp_data_dir / "test.zip"
-        self.create_test_package(package_path, ["2401.12345"])
-
         imported, skipped, annotations, ids = import_package(
-            package_path, temp_data_dir, overwrite=False
+            basic_zip, temp_data_dir, overwrite=False
         )
 
         assert imported == 1
@@ -238,26 +209,18 @@ class TestImportPackage:
         assert paper_dir.exists()
         assert (paper_dir / "metadata.json").exists()
 
-    def test_import_with_summaries(self, temp_data_dir: Path) -> None:
+    def test_import_with_summaries(self, temp_data_dir: Path, summary_zip: Path) -> None:
         """Test importing package with summaries."""
-        package_path = temp_data_dir / "test.zip"
-        self.create_test_package(package_path, ["2401.12345"], include_summary=True)
-
-        import_package(package_path, temp_data_dir, overwrite=False)
+        import_package(summary_zip, temp_data_dir, overwrite=False)
 
         # Verify summary was imported
         summary_path = temp_data_dir / "papers" / "2401.12345" / "summary.md"
         assert summary_path.exists()
 
-    def test_import_with_annotations(self, temp_data_dir: Path) -> None:
+    def test_import_with_annotations(self, temp_data_dir: Path, annotations_zip: Path) -> None:
         """Test importing package with annotations."""
-        package_path = temp_data_dir / "test.zip"
-        self.create_test_package(
-            package_path, ["2401.12345"], include_annotations=True
-        )
-
         imported, skipped, annotations, ids = import_package(
-            package_path, temp_data_dir, overwrite=False
+            annotations_zip, temp_data_dir, overwrite=False
         )
 
         assert annotations == 1
@@ -265,59 +228,81 @@ class TestImportPackage:
         # Verify annotation was imported
         ann_dir = temp_data_dir / "papers" / "2401.12345" / "annotations"
         assert ann_dir.exists()
-        assert len(list(ann_dir.glob("*.json"))) == 1
+        assert len([e for e in os.scandir(ann_dir) if e.name.endswith(".json")]) == 1
 
-    def test_skip_duplicate_papers(self, temp_data_dir: Path) -> None:
-        """Test skipping duplicate papers."""
-        # Create existing paper
-        paper_dir = temp_data_dir / "papers" / "2401.12345"
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": "2401.12345", "title": "Existing Paper"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
-
-        # Create index
-        index_dir = temp_data_dir / "index"
-        index_dir.mkdir(parents=True, exist_ok=True)
-        index_data: dict[str, Any] = {
-            "version": "1.0",
-            "papers": {"2401.12345": {"title": "Existing Paper"}},
-        }
-        (index_dir / "papers.json").write_text(json.dumps(index_data), encoding="utf-8")
+    def test_import_multiple_papers(self, temp_data_dir: Path, multi_paper_zip: Path) -> None:
+        """Test each paper receives only its own summary and annotations."""
+        imported, skipped, annotations, ids = import_package(
+            multi_paper_zip, temp_data_dir, overwrite=False
+        )
+
+        assert imported == 3
+        assert annotations == 3
+        for paper_id in ("2401.12345", "2401.12346", "2401.12347"):
+            paper_dir = temp_data_dir / "papers" / paper_id
+            assert (paper_dir / "summary.md").exists()
+            assert [p.name for p in (paper_dir / "annotations").iterdir()] == ["note.json"]
+
+    def test_import_without_preloading(self, temp_data_dir: Path, summary_zip: Path) -> None:
+        """Test packages above the preload limit are read from disk."""
+        with patch("import_collection.PRELOAD_MAX_SIZE", 0):
+            imported, skipped, annotations, ids = import_package(
+                summary_zip, temp_data_dir, overwrite=False
+            )
+
+        assert imported == 1
+        assert (temp_data_dir / "papers" / "2401.12345" / "summary.md").exists()
 
-        # Create package with same paper
-        package_path = temp_data_dir / "test.zip"
-        self.create_test_package(package_path, ["2401.12345"])
+    def test_skip_duplicate_papers(
+        self, temp_data_dir: Path, basic_zip: Path, seed_paper: Callable[..., Path]
+    ) -> None:
+        """Test skipping duplicate papers."""
+        # Create existing paper and its index entry
+        seed_paper(
+            "2401.12345",
+            metadata={"id": "2401.12345", "title": "Existing Paper"},
+            with_index=True,
+        )
 
+        # Import package with same paper
         imported, skipped, annotations, ids = import_package(
-            package_path, temp_data_dir, overwrite=False
+            basic_zip, temp_data_dir, overwrite=False
         )
 
         assert imported == 0
         assert skipped == 1
 
-    def test_overwrite_duplicate_papers(self, temp_data_dir: Path) -> None:
-        """Test overwriting duplicate papers."""
-        # Create existing paper
-        paper_dir = temp_data_dir / "papers" / "2401.12345"
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": "2401.12345", "title": "Existing Paper"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
-
-        # Create index
-        index_dir = temp_data_dir / "index"
-        index_dir.mkdir(parents=True, exist_ok=True)
-        index_data: dict[str, Any] = {
+    def test_skip_duplicates_from_given_index(
+        self, temp_data_dir: Path, basic_zip: Path
+    ) -> None:
+        """Test an index passed by the caller is used instead of the one on disk."""
+        index: dict[str, Any] = {
             "version": "1.0",
             "papers": {"2401.12345": {"title": "Existing Paper"}},
         }
-        (index_dir / "papers.json").write_text(json.dumps(index_data), encoding="utf-8")
 
-        # Create package with same paper
-        package_path = temp_data_dir / "test.zip"
-        self.create_test_package(package_path, ["2401.12345"])
+        imported, skipped, annotations, ids = import_package(
+            basic_zip, temp_data_dir, overwrite=False, index=index
+        )
+
+        assert imported == 0
+        assert skipped == 1
+        assert not (temp_data_dir / "papers" / "2401.12345").exists()
+
+    def test_overwrite_duplicate_papers(
+        self, temp_data_dir: Path, basic_zip: Path, seed_paper: Callable[..., Path]
+    ) -> None:
+        """Test overwriting duplicate papers."""
+        # Create existing paper and its index entry
+        seed_paper(
+            "2401.12345",
+            metadata={"id": "2401.12345", "title": "Existing Paper"},
+            with_index=True,
+        )
 
+        # Import package with same paper
         imported, skipped, annotations, ids = import_package(
-            package_path, temp_data_dir, overwrite=True
+            basic_zip, temp_data_dir, overwrite=True
         )
 
         assert imported == 1
@@ -330,108 +315,64 @@ class TestImportPackage:
         with pytest.raises(FileNotFoundError):
             import_package(package_path, temp_data_dir, overwrite=False)
 
-    def test_invalid_package_no_manifest(self, temp_data_dir: Path) -> None:
-        """Test error for package without manifest."""
-        package_path = temp_data_dir / "test.zip"
+    def test_not_a_zip(self, temp_data_dir: Path) -> None:
+        """Test error for a file that is not a ZIP archive."""
+        package_path = temp_data_dir / "bad.zip"
+        package_path.write_text("not a zip file")
 
-        with zipfile.ZipFile(package_path, "w") as zf:
-            zf.writestr("papers/2401.12345/metadata.json", "{}")
+        with pytest.raises(zipfile.BadZipFile):
+            import_package(package_path, temp_data_dir, overwrite=False)
 
+    def test_invalid_package_no_manifest(self, temp_data_dir: Path, no_manifest_zip: Path) -> None:
+        """Test error for package without manifest."""
         with pytest.raises(ValueError, match="manifest"):
-            import_package(package_path, temp_data_dir, overwrite=False)
+            import_package(no_manifest_zip, temp_data_dir, overwrite=False)
 
-    def test_path_traversal_rejected(self, temp_data_dir: Path) -> None:
+    def test_path_traversal_rejected(self, temp_data_dir: Path, traversal_zip: Path) -> None:
         """Test path traversal in ZIP is rejected."""
-        package_path = temp_data_dir / "test.zip"
-
-        with zipfile.ZipFile(package_path, "w") as zf:
-            manifest: dict[str, Any] = {
-                "version": "1.0",
-                "created_at": "2026-01-27",
-                "paper_count": 1,
-            }
-            zf.writestr("manifest.json", json.dumps(manifest))
-            zf.writestr("../../../etc/passwd", "malicious")
-
         with pytest.raises(ValueError, match="Invalid path"):
-            import_package(package_path, temp_data_dir, overwrite=False)
+            import_package(traversal_zip, temp_data_dir, overwrite=False)
 
 
+@pytest.mark.cli
 class TestMainFunction:
     """Tests for CLI interface."""
 
-    def create_test_package(self, output_path: Path) -> None:
-        """Helper to create test package."""
-        with zipfile.ZipFile(output_path, "w") as zf:
-            manifest: dict[str, Any] = {
-                "version": "1.0",
-                "created_at": "2026-01-27",
-                "paper_count": 1,
-            }
-            zf.writestr("manifest.json", json.dumps(manifest))
-
-            metadata: dict[str, Any] = {
-                "id": "2401.12345",
-                "title": "Test Paper",
-                "authors": [],
-                "abstract": "",
-                "collected_at": "2026-01-27",
-            }
-            zf.writestr("papers/2401.12345/metadata.json", json.dumps(metadata))
-
-            index_data: dict[str, Any] = {
-                "version": "1.0",
-                "papers": {"2401.12345": {"title": "Test"}},
-            }
-            zf.writestr("index/papers.json", json.dumps(index_data))
-
-    def test_valid_import(self, temp_data_dir: Path) -> None:
+    def test_valid_import(self, temp_data_dir: Path, basic_zip: Path) -> None:
         """Test valid import."""
-        package_path = temp_data_dir / "test.zip"
-        self.create_test_package(package_path)
-
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "import_collection.py",
                 "--input",
-                str(package_path),
+                str(basic_zip),
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 0
+            ]
+        )
+        assert result == 0
 
     def test_missing_file(self, temp_data_dir: Path) -> None:
         """Test error for missing file."""
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "import_collection.py",
                 "--input",
                 str(temp_data_dir / "nonexistent.zip"),
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
 
     def test_invalid_zip(self, temp_data_dir: Path) -> None:
         """Test error for invalid ZIP."""
         bad_file = temp_data_dir / "bad.zip"
         bad_file.write_text("not a zip file")
 
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "import_collection.py",
                 "--input",
                 str(bad_file),
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
@@ -3,18 +3,11 @@
 from __future__ import annotations
 
 import json
-import sys
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
-from unittest.mock import patch
 
 import pytest
-
-# Add scripts directory to path for imports
-sys.path.insert(
-    0, str(Path(__file__).parent.parent / "skills" / "paper-collaborator" / "scripts")
-)
-
 from list_annotations import (
     format_annotation_markdown,
     format_annotation_text,
@@ -25,19 +18,37 @@ from list_annotations import (
     validate_format,
 )
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    """Write a test fixture as JSON, using orjson when it is installed."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj))
+    else:
+        path.write_bytes(json.dumps(obj).encode("utf-8"))
+
+
+def _loads(data: str | bytes) -> Any:
+    """Parse a JSON document, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class TestValidateArxivId:
     """Tests for validate_arxiv_id function."""
 
-    def test_valid_id(self) -> None:
+    def test_valid_id(self, valid_arxiv_id: str) -> None:
         """Test valid arXiv IDs."""
-        assert validate_arxiv_id("2401.12345") is True
-        assert validate_arxiv_id("2401.1234") is True
+        assert validate_arxiv_id(valid_arxiv_id) is True
 
-    def test_invalid_id(self) -> None:
+    def test_invalid_id(self, invalid_arxiv_id: str) -> None:
         """Test invalid arXiv IDs."""
-        assert validate_arxiv_id("../etc/passwd") is False
-        assert validate_arxiv_id("invalid") is False
+        assert validate_arxiv_id(invalid_arxiv_id) is False
 
 
 class TestValidateFormat:
@@ -61,18 +72,16 @@ class TestValidateFormat:
 class TestLoadAnnotations:
     """Tests for load_annotations function."""
 
-    def test_load_empty(self, temp_data_dir: Path) -> None:
+    def test_load_empty(self, temp_data_dir: Path, seed_paper: Callable[..., Path]) -> None:
         """Test loading with no annotations."""
-        paper_dir = temp_data_dir / "papers" / "2401.12345"
-        paper_dir.mkdir(parents=True)
+        seed_paper("2401.12345")
 
         annotations = load_annotations("2401.12345", temp_data_dir)
         assert annotations == []
 
-    def test_load_multiple(self, temp_data_dir: Path) -> None:
+    def test_load_multiple(self, temp_data_dir: Path, seed_paper: Callable[..., Path]) -> None:
         """Test loading multiple annotations."""
-        ann_dir = temp_data_dir / "papers" / "2401.12345" / "annotations"
-        ann_dir.mkdir(parents=True)
+        ann_dir = seed_paper("2401.12345", with_annotations=True) / "annotations"
 
         # Create annotations with different timestamps
         for i in range(3):
@@ -81,9 +90,7 @@ class TestLoadAnnotations:
                 "content": f"Note {i}",
                 "created_at": f"2026-01-2{i}T10:00:00Z",
             }
-            (ann_dir / f"note_{i}.json").write_text(
-                json.dumps(annotation), encoding="utf-8"
-            )
+            _write_json(ann_dir / f"note_{i}.json", annotation)
 
         annotations = load_annotations("2401.12345", temp_data_dir)
         assert len(annotations) == 3
@@ -96,14 +103,15 @@ class TestLoadAnnotations:
         annotations = load_annotations("../invalid", temp_data_dir)
         assert annotations == []
 
-    def test_load_skips_invalid_json(self, temp_data_dir: Path) -> None:
+    def test_load_skips_invalid_json(
+        self, temp_data_dir: Path, seed_paper: Callable[..., Path]
+    ) -> None:
         """Test that invalid JSON files are skipped."""
-        ann_dir = temp_data_dir / "papers" / "2401.12345" / "annotations"
-        ann_dir.mkdir(parents=True)
+        ann_dir = seed_paper("2401.12345", with_annotations=True) / "annotations"
 
         # Create valid annotation
         valid: dict[str, Any] = {"id": "valid", "content": "Valid note"}
-        (ann_dir / "valid.json").write_text(json.dumps(valid), encoding="utf-8")
+        _write_json(ann_dir / "valid.json", valid)
 
         # Create invalid JSON
         (ann_dir / "invalid.json").write_text("not valid json", encoding="utf-8")
@@ -112,6 +120,28 @@ class TestLoadAnnotations:
         assert len(annotations) == 1
         assert annotations[0]["id"] == "valid"
 
+    def test_load_skips_non_utf8_file(
+        self, temp_data_dir: Path, seed_paper: Callable[..., Path]
+    ) -> None:
+        """Test that annotation files which are not UTF-8 are skipped."""
+        ann_dir = seed_paper("2401.12345", with_annotations=True) / "annotations"
+        (ann_dir / "latin1.json").write_bytes(b'{"id": "caf\xe9"}')
+
+        annotations = load_annotations("2401.12345", temp_data_dir)
+        assert annotations == []
+
+    def test_load_ignores_non_json_entries(
+        self, temp_data_dir: Path, seed_paper: Callable[..., Path]
+    ) -> None:
+        """Test that directories and non-JSON files are ignored."""
+        ann_dir = seed_paper("2401.12345", with_annotations=True) / "annotations"
+        _write_json(ann_dir / "note.json", {"id": "note"})
+        (ann_dir / "readme.txt").write_text("not an annotation", encoding="utf-8")
+        (ann_dir / "nested.json").mkdir()
+
+        annotations = load_annotations("2401.12345", temp_data_dir)
+        assert [a["id"] for a in annotations] == ["note"]
+
 
 class TestFormatAnnotationText:
     """Tests for format_annotation_text function."""
@@ -160,7 +190,7 @@ class TestFormatAnnotations:
         ]
 
         result = format_annotations(annotations, "2401.12345", "json")
-        parsed: dict[str, Any] = json.loads(result)
+        parsed: dict[str, Any] = _loads(result)
 
         assert parsed["paper_id"] == "2401.12345"
         assert parsed["count"] == 2
@@ -187,106 +217,90 @@ class TestFormatAnnotations:
         assert "Total: 1" in result
 
 
+@pytest.mark.cli
 class TestMainFunction:
     """Tests for CLI interface."""
 
-    def test_list_annotations(self, temp_data_dir: Path) -> None:
+    def test_list_annotations(self, temp_data_dir: Path, seed_paper: Callable[..., Path]) -> None:
         """Test listing annotations."""
         # Create paper with annotations
-        ann_dir = temp_data_dir / "papers" / "2401.12345" / "annotations"
-        ann_dir.mkdir(parents=True)
+        ann_dir = seed_paper("2401.12345", with_annotations=True) / "annotations"
         annotation: dict[str, Any] = {"id": "ann1", "content": "Test note"}
-        (ann_dir / "note.json").write_text(json.dumps(annotation), encoding="utf-8")
+        _write_json(ann_dir / "note.json", annotation)
 
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "list_annotations.py",
                 "--paper-id",
                 "2401.12345",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 0
+            ]
+        )
+        assert result == 0
 
-    def test_list_empty(self, temp_data_dir: Path) -> None:
+    def test_list_empty(self, temp_data_dir: Path, seed_paper: Callable[..., Path]) -> None:
         """Test listing with no annotations."""
-        paper_dir = temp_data_dir / "papers" / "2401.12345"
-        paper_dir.mkdir(parents=True)
+        seed_paper("2401.12345")
 
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "list_annotations.py",
                 "--paper-id",
                 "2401.12345",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 0
+            ]
+        )
+        assert result == 0
 
     def test_invalid_paper_id(self, temp_data_dir: Path) -> None:
         """Test invalid paper ID."""
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "list_annotations.py",
                 "--paper-id",
                 "../invalid",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
 
     def test_paper_not_found(self, temp_data_dir: Path) -> None:
         """Test paper not in collection."""
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "list_annotations.py",
                 "--paper-id",
                 "2401.12345",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
 
-    def test_json_format_output(self, temp_data_dir: Path) -> None:
+    def test_json_format_output(self, temp_data_dir: Path, seed_paper: Callable[..., Path]) -> None:
         """Test JSON format output."""
         # Create paper with annotations
-        ann_dir = temp_data_dir / "papers" / "2401.12345" / "annotations"
-        ann_dir.mkdir(parents=True)
+        ann_dir = seed_paper("2401.12345", with_annotations=True) / "annotations"
         annotation: dict[str, Any] = {"id": "ann1", "content": "Test note"}
-        (ann_dir / "note.json").write_text(json.dumps(annotation), encoding="utf-8")
+        _write_json(ann_dir / "note.json", annotation)
 
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "list_annotations.py",
                 "--paper-id",
                 "2401.12345",
                 "--format",
                 "json",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 0
+            ]
+        )
+        assert result == 0
 
-    def test_markdown_format_output(self, temp_data_dir: Path) -> None:
+    def test_markdown_format_output(
+        self, temp_data_dir: Path, seed_paper: Callable[..., Path]
+    ) -> None:
         """Test Markdown format output."""
         # Create paper with annotations
-        ann_dir = temp_data_dir / "papers" / "2401.12345" / "annotations"
-        ann_dir.mkdir(parents=True)
+        ann_dir = seed_paper("2401.12345", with_annotations=True) / "annotations"
         annotation: dict[str, Any] = {
             "id": "ann1",
             "type": "note",
@@ -294,19 +308,16 @@ class TestMainFunction:
             "content": "Test note",
             "created_at": "2026-01-27T10:00:00Z",
         }
-        (ann_dir / "note.json").write_text(json.dumps(annotation), encoding="utf-8")
+        _write_json(ann_dir / "note.json", annotation)
 
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "list_annotations.py",
                 "--paper-id",
                 "2401.12345",
                 "--format",
                 "markdown",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 0
+            ]
+        )
+        assert result == 0
@@ -3,16 +3,12 @@
 from __future__ import annotations
 
 import json
-import sys
+import os
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
-from unittest.mock import patch
-
-# Add scripts directory to path for imports
-sys.path.insert(
-    0, str(Path(__file__).parent.parent / "skills" / "paper-collaborator" / "scripts")
-)
 
+import pytest
 from save_annotation import (
     count_annotations,
     load_metadata,
@@ -27,16 +23,17 @@ from save_annotation import (
 class TestValidateArxivId:
     """Tests for validate_arxiv_id function."""
 
-    def test_valid_id(self) -> None:
+    def test_valid_id(self, valid_arxiv_id: str) -> None:
         """Test valid arXiv IDs."""
-        assert validate_arxiv_id("2401.12345") is True
-        assert validate_arxiv_id("2401.1234") is True
+        assert validate_arxiv_id(valid_arxiv_id) is True
 
-    def test_invalid_id(self) -> None:
+    def test_invalid_id(self, invalid_arxiv_id: str) -> None:
         """Test invalid arXiv IDs."""
-        assert validate_arxiv_id("../etc/passwd") is False
-        assert validate_arxiv_id("invalid") is False
-        assert validate_arxiv_id("") is False
+        assert validate_arxiv_id(invalid_arxiv_id) is False
+
+    def test_oversized_id_rejected(self) -> None:
+        """Test IDs longer than any valid arXiv ID are rejected."""
+        assert validate_arxiv_id("2401.12345" * 1000) is False
 
 
 class TestSanitizeUsername:
@@ -52,6 +49,11 @@ class TestSanitizeUsername:
         assert sanitize_username("user@email") == "user_email"
         assert sanitize_username("user name") == "user_name"
 
+    def test_non_ascii_characters(self) -> None:
+        """Test non-ASCII characters are replaced like other disallowed characters."""
+        assert sanitize_username("café-user") == "caf_-user"
+        assert sanitize_username("研究者") == "___"
+
     def test_path_traversal(self) -> None:
         """Test path traversal is prevented."""
         result = sanitize_username("../etc/passwd")
@@ -65,17 +67,40 @@ class TestSanitizeUsername:
 class TestLoadMetadata:
     """Tests for load_metadata function."""
 
-    def test_load_existing(self, temp_data_dir: Path) -> None:
+    def test_load_existing(self, paper_data_dir: Path) -> None:
         """Test loading existing metadata."""
-        paper_dir = temp_data_dir / "papers" / "2401.12345"
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": "2401.12345", "title": "Test"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
-
-        result = load_metadata("2401.12345", temp_data_dir)
+        result = load_metadata("2401.12345", paper_data_dir)
         assert result is not None
         assert result["title"] == "Test"
 
+    def test_repeated_load_is_cached(self, paper_data_dir: Path) -> None:
+        """Test an unchanged metadata file is parsed only once."""
+        first = load_metadata("2401.12345", paper_data_dir)
+        second = load_metadata("2401.12345", paper_data_dir)
+        assert first is second
+
+    def test_load_after_update(self, paper_data_dir: Path) -> None:
+        """Test updated metadata is reloaded rather than served from cache."""
+        before = load_metadata("2401.12345", paper_data_dir)
+        assert before is not None
+        assert "annotation_count" not in before
+
+        update_metadata("2401.12345", paper_data_dir, 2)
+
+        after = load_metadata("2401.12345", paper_data_dir)
+        assert after is not None
+        assert after["annotation_count"] == 2
+
+    def test_invalid_json_returns_none(
+        self, temp_data_dir: Path, seed_paper: Callable[..., Path]
+    ) -> None:
+        """Test None for a corrupted metadata file."""
+        paper_dir = seed_paper("2401.12345")
+        (paper_dir / "metadata.json").write_text("not valid json", encoding="utf-8")
+
+        result = load_metadata("2401.12345", temp_data_dir)
+        assert result is None
+
     def test_missing_paper(self, temp_data_dir: Path) -> None:
         """Test None for missing paper."""
         result = load_metadata("2401.12345", temp_data_dir)
@@ -86,22 +111,30 @@ class TestLoadMetadata:
         result = load_metadata("../invalid", temp_data_dir)
         assert result is None
 
+    def test_non_object_json_returns_none(
+        self, temp_data_dir: Path, seed_paper: Callable[..., Path]
+    ) -> None:
+        """Test None for metadata that is valid JSON but not an object."""
+        paper_dir = seed_paper("2401.12345")
+        (paper_dir / "metadata.json").write_bytes(b"  null")
+
+        result = load_metadata("2401.12345", temp_data_dir)
+        assert result is None
+
 
 class TestCountAnnotations:
     """Tests for count_annotations function."""
 
-    def test_count_zero(self, temp_data_dir: Path) -> None:
+    def test_count_zero(self, temp_data_dir: Path, seed_paper: Callable[..., Path]) -> None:
         """Test count with no annotations."""
-        paper_dir = temp_data_dir / "papers" / "2401.12345"
-        paper_dir.mkdir(parents=True)
+        seed_paper("2401.12345")
 
         count = count_annotations("2401.12345", temp_data_dir)
         assert count == 0
 
-    def test_count_multiple(self, temp_data_dir: Path) -> None:
+    def test_count_multiple(self, temp_data_dir: Path, seed_paper: Callable[..., Path]) -> None:
         """Test count with multiple annotations."""
-        ann_dir = temp_data_dir / "papers" / "2401.12345" / "annotations"
-        ann_dir.mkdir(parents=True)
+        ann_dir = seed_paper("2401.12345", with_annotations=True) / "annotations"
 
         for i in range(3):
             (ann_dir / f"note_{i}.json").write_text("{}", encoding="utf-8")
@@ -109,18 +142,27 @@ class TestCountAnnotations:
         count = count_annotations("2401.12345", temp_data_dir)
         assert count == 3
 
+    def test_count_ignores_other_entries(
+        self, temp_data_dir: Path, seed_paper: Callable[..., Path]
+    ) -> None:
+        """Test non-JSON files and directories are not counted."""
+        ann_dir = seed_paper("2401.12345", with_annotations=True) / "annotations"
+        (ann_dir / "note.json").write_text("{}", encoding="utf-8")
+        (ann_dir / "note.json.tmp").write_text("{}", encoding="utf-8")
+        (ann_dir / "nested.json").mkdir()
+
+        count = count_annotations("2401.12345", temp_data_dir)
+        assert count == 1
+
 
 class TestUpdateMetadata:
     """Tests for update_metadata function."""
 
-    def test_update_success(self, temp_data_dir: Path) -> None:
+    def test_update_success(self, paper_data_dir: Path) -> None:
         """Test successful metadata update."""
-        paper_dir = temp_data_dir / "papers" / "2401.12345"
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": "2401.12345", "title": "Test"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+        paper_dir = paper_data_dir / "papers" / "2401.12345"
 
-        result = update_metadata("2401.12345", temp_data_dir, 5)
+        result = update_metadata("2401.12345", paper_data_dir, 5)
         assert result is True
 
         # Verify update
@@ -142,33 +184,47 @@ class TestUpdateMetadata:
 class TestSaveAnnotation:
     """Tests for save_annotation function."""
 
-    def test_save_success(self, temp_data_dir: Path) -> None:
+    def test_save_success(self, paper_data_dir: Path) -> None:
         """Test successful annotation save."""
-        # Create paper
-        paper_dir = temp_data_dir / "papers" / "2401.12345"
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": "2401.12345", "title": "Test"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+        paper_dir = paper_data_dir / "papers" / "2401.12345"
 
-        success, result = save_annotation(
+        success, result, annotation_path = save_annotation(
             paper_id="2401.12345",
             content="This is a test note.",
             username="researcher",
-            data_dir=temp_data_dir,
+            data_dir=paper_data_dir,
             annotation_type="note",
         )
 
         assert success is True
         assert len(result) == 8  # UUID prefix
 
-        # Verify annotation file created
-        ann_dir = paper_dir / "annotations"
-        assert ann_dir.exists()
-        assert len(list(ann_dir.glob("*.json"))) == 1
+        # Verify annotation file created, named after the returned ID
+        assert annotation_path is not None
+        assert annotation_path.is_file()
+        assert annotation_path.parent == paper_dir / "annotations"
+        assert annotation_path.name.endswith(f"_{result}.json")
+
+    def test_save_uses_one_timestamp(self, paper_data_dir: Path) -> None:
+        """Test the annotation and metadata record the same save time."""
+        success, _, annotation_path = save_annotation(
+            paper_id="2401.12345",
+            content="This is a test note.",
+            username="researcher",
+            data_dir=paper_data_dir,
+        )
+
+        assert success is True
+        assert annotation_path is not None
+        annotation = json.loads(annotation_path.read_bytes())
+        metadata = load_metadata("2401.12345", paper_data_dir)
+        assert metadata is not None
+        assert annotation["created_at"] == annotation["updated_at"]
+        assert metadata["last_annotated_at"] == annotation["created_at"]
 
     def test_save_paper_not_found(self, temp_data_dir: Path) -> None:
         """Test save for non-existent paper."""
-        success, error = save_annotation(
+        success, error, annotation_path = save_annotation(
             paper_id="2401.12345",
             content="Note",
             username="test",
@@ -177,10 +233,11 @@ class TestSaveAnnotation:
 
         assert success is False
         assert "not found" in error
+        assert annotation_path is None
 
     def test_save_invalid_paper_id(self, temp_data_dir: Path) -> None:
         """Test save with invalid paper ID."""
-        success, error = save_annotation(
+        success, error, annotation_path = save_annotation(
             paper_id="../invalid",
             content="Note",
             username="test",
@@ -189,141 +246,107 @@ class TestSaveAnnotation:
 
         assert success is False
         assert "Invalid" in error
+        assert annotation_path is None
 
 
+@pytest.mark.cli
 class TestMainFunction:
     """Tests for CLI interface."""
 
-    def test_valid_annotation(self, temp_data_dir: Path) -> None:
+    def test_valid_annotation(self, paper_data_dir: Path) -> None:
         """Test valid annotation save."""
-        # Create paper
-        paper_dir = temp_data_dir / "papers" / "2401.12345"
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": "2401.12345", "title": "Test"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
-
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "save_annotation.py",
                 "--paper-id",
                 "2401.12345",
                 "--content",
                 "Test annotation content",
                 "--data-dir",
-                str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 0
+                str(paper_data_dir),
+            ]
+        )
+        assert result == 0
 
     def test_invalid_paper_id(self, temp_data_dir: Path) -> None:
         """Test invalid paper ID."""
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "save_annotation.py",
                 "--paper-id",
                 "../invalid",
                 "--content",
                 "Note",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
 
     def test_paper_not_found(self, temp_data_dir: Path) -> None:
         """Test paper not found."""
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "save_annotation.py",
                 "--paper-id",
                 "2401.12345",
                 "--content",
                 "Note",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
 
     def test_empty_content(self, temp_data_dir: Path) -> None:
         """Test empty content rejected."""
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "save_annotation.py",
                 "--paper-id",
                 "2401.12345",
                 "--content",
                 "",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
 
-    def test_content_file(self, temp_data_dir: Path) -> None:
+    def test_content_file(self, paper_data_dir: Path) -> None:
         """Test content from file."""
-        # Create paper
-        paper_dir = temp_data_dir / "papers" / "2401.12345"
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": "2401.12345", "title": "Test"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
-
         # Create content file
-        content_file = temp_data_dir / "notes.txt"
+        content_file = paper_data_dir / "notes.txt"
         content_file.write_text("Content from file", encoding="utf-8")
 
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "save_annotation.py",
                 "--paper-id",
                 "2401.12345",
                 "--content-file",
                 str(content_file),
                 "--data-dir",
-                str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 0
+                str(paper_data_dir),
+            ]
+        )
+        assert result == 0
 
     def test_content_file_not_found(self, temp_data_dir: Path) -> None:
         """Test content file not found."""
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "save_annotation.py",
                 "--paper-id",
                 "2401.12345",
                 "--content-file",
                 str(temp_data_dir / "nonexistent.txt"),
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
 
-    def test_annotation_type(self, temp_data_dir: Path) -> None:
+    def test_annotation_type(self, paper_data_dir: Path) -> None:
         """Test different annotation types."""
-        # Create paper
-        paper_dir = temp_data_dir / "papers" / "2401.12345"
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": "2401.12345", "title": "Test"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
-
-        with patch(
-            "sys.argv",
+        paper_dir = paper_data_dir / "papers" / "2401.12345"
+
+        result = main(
             [
-                "save_annotation.py",
                 "--paper-id",
                 "2401.12345",
                 "--content",
@@ -331,16 +354,35 @@ class TestMainFunction:
                 "--type",
                 "question",
                 "--data-dir",
-                str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 0
+                str(paper_data_dir),
+            ]
+        )
+        assert result == 0
 
         # Verify annotation type
-        ann_dir = paper_dir / "annotations"
-        ann_files = list(ann_dir.glob("*.json"))
+        with os.scandir(paper_dir / "annotations") as entries:
+            ann_files = [e.path for e in entries if e.name.endswith(".json")]
         assert len(ann_files) == 1
 
-        ann_data: dict[str, Any] = json.loads(ann_files[0].read_text(encoding="utf-8"))
+        ann_data: dict[str, Any] = json.loads(Path(ann_files[0]).read_bytes())
         assert ann_data["type"] == "question"
+
+    def test_username_defaults_to_user_env(
+        self, paper_data_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test $USER is read on each call even though the parser is cached."""
+        argv = [
+            "--paper-id",
+            "2401.12345",
+            "--content",
+            "Test annotation content",
+            "--data-dir",
+            str(paper_data_dir),
+        ]
+        for user in ("alice", "bob"):
+            monkeypatch.setenv("USER", user)
+            assert main(argv) == 0
+
+        with os.scandir(paper_data_dir / "papers" / "2401.12345" / "annotations") as entries:
+            authors = sorted(json.loads(Path(e.path).read_bytes())["author"] for e in entries)
+        assert authors == ["alice", "bob"]
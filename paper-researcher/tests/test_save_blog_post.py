@@ -3,17 +3,12 @@
 from __future__ import annotations
 
 import json
-import sys
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
-from unittest.mock import patch
 
-# Add the scripts directory to the path
-sys.path.insert(
-    0, str(Path(__file__).parent.parent / "skills" / "paper-blogger" / "scripts")
-)
-
-from save_blog_post import (  # noqa: E402
+import pytest
+from save_blog_post import (
     load_index,
     load_metadata,
     main,
@@ -27,47 +22,24 @@ from save_blog_post import (  # noqa: E402
 class TestValidateArxivId:
     """Tests for validate_arxiv_id function."""
 
-    def test_valid_4digit_id(self) -> None:
-        """Test valid 4-digit arXiv ID."""
-        assert validate_arxiv_id("2401.1234") is True
-
-    def test_valid_5digit_id(self) -> None:
-        """Test valid 5-digit arXiv ID."""
-        assert validate_arxiv_id("2401.12345") is True
-
-    def test_invalid_format_no_dot(self) -> None:
-        """Test invalid format without dot."""
-        assert validate_arxiv_id("240112345") is False
+    def test_valid_id(self, valid_arxiv_id: str) -> None:
+        """Test valid arXiv IDs."""
+        assert validate_arxiv_id(valid_arxiv_id) is True
 
-    def test_invalid_format_letters(self) -> None:
-        """Test invalid format with letters."""
-        assert validate_arxiv_id("2401.abcde") is False
-
-    def test_invalid_format_path_traversal(self) -> None:
-        """Test path traversal attempt is rejected."""
-        assert validate_arxiv_id("../etc/passwd") is False
-        assert validate_arxiv_id("2401.12345/../..") is False
-
-    def test_empty_string(self) -> None:
-        """Test empty string is rejected."""
-        assert validate_arxiv_id("") is False
+    def test_invalid_id(self, invalid_arxiv_id: str) -> None:
+        """Test invalid arXiv IDs."""
+        assert validate_arxiv_id(invalid_arxiv_id) is False
 
 
 class TestLoadMetadata:
     """Tests for load_metadata function."""
 
-    def test_load_existing_metadata(self, temp_data_dir: Path) -> None:
+    def test_load_existing_metadata(
+        self, temp_data_dir: Path, seed_paper: Callable[..., Path]
+    ) -> None:
         """Test loading existing metadata."""
         paper_id = "2401.12345"
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-
-        metadata = {
-            "id": paper_id,
-            "title": "Test Paper",
-            "has_summary": True,
-        }
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata))
+        seed_paper(paper_id, metadata={"id": paper_id, "title": "Test Paper", "has_summary": True})
 
         result = load_metadata(paper_id, temp_data_dir)
         assert result is not None
@@ -79,16 +51,25 @@ class TestLoadMetadata:
         result = load_metadata("2401.12345", temp_data_dir)
         assert result is None
 
-    def test_load_invalid_json(self, temp_data_dir: Path) -> None:
+    def test_load_invalid_json(self, temp_data_dir: Path, seed_paper: Callable[..., Path]) -> None:
         """Test loading invalid JSON returns None."""
         paper_id = "2401.12345"
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
+        paper_dir = seed_paper(paper_id)
         (paper_dir / "metadata.json").write_text("not valid json")
 
         result = load_metadata(paper_id, temp_data_dir)
         assert result is None
 
+    def test_load_non_object_json(
+        self, temp_data_dir: Path, seed_paper: Callable[..., Path]
+    ) -> None:
+        """Test metadata that is valid JSON but not an object returns None."""
+        paper_dir = seed_paper("2401.12345")
+        (paper_dir / "metadata.json").write_bytes(b'["2401.12345"]')
+
+        result = load_metadata("2401.12345", temp_data_dir)
+        assert result is None
+
     def test_load_with_invalid_paper_id(self, temp_data_dir: Path) -> None:
         """Test loading with invalid paper ID returns None."""
         result = load_metadata("../invalid", temp_data_dir)
@@ -135,6 +116,21 @@ class TestSaveBlogPost:
         assert result is not None
         assert result.read_text() == new_content
 
+    def test_save_leaves_no_temp_files(self, temp_data_dir: Path) -> None:
+        """Test that the atomic write leaves only the blog post behind."""
+        result = save_blog_post("2401.12345", "# Caf\u00e9", temp_data_dir)
+        assert result is not None
+        assert result.read_text(encoding="utf-8") == "# Caf\u00e9"
+        assert [p.name for p in (temp_data_dir / "blog-posts").iterdir()] == ["2401.12345.md"]
+
+    def test_save_bytes_content(self, temp_data_dir: Path) -> None:
+        """Test that UTF-8 bytes are written unchanged."""
+        content = "# Caf\u00e9\n".encode()
+
+        result = save_blog_post("2401.12345", content, temp_data_dir)
+        assert result is not None
+        assert result.read_bytes() == content
+
     def test_save_with_invalid_paper_id(self, temp_data_dir: Path) -> None:
         """Test saving with invalid paper ID returns None."""
         result = save_blog_post("../invalid", "content", temp_data_dir)
@@ -144,14 +140,12 @@ class TestSaveBlogPost:
 class TestUpdateMetadata:
     """Tests for update_metadata function."""
 
-    def test_update_existing_metadata(self, temp_data_dir: Path) -> None:
+    def test_update_existing_metadata(
+        self, temp_data_dir: Path, seed_paper: Callable[..., Path]
+    ) -> None:
         """Test updating existing metadata."""
         paper_id = "2401.12345"
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-
-        metadata: dict[str, Any] = {"id": paper_id, "title": "Test"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata))
+        paper_dir = seed_paper(paper_id, metadata={"id": paper_id, "title": "Test"})
 
         result = update_metadata(paper_id, temp_data_dir)
         assert result is True
@@ -188,6 +182,26 @@ class TestLoadIndex:
         assert result["version"] == "1.0"
         assert "2401.12345" in result["papers"]
 
+    def test_repeated_load_is_cached(self, paper_data_dir: Path) -> None:
+        """Test an unchanged index file is parsed only once."""
+        first = load_index(paper_data_dir)
+        second = load_index(paper_data_dir)
+        assert first is not None
+        assert first is second
+
+    def test_load_after_update(self, paper_data_dir: Path) -> None:
+        """Test an updated index is reloaded rather than served from cache."""
+        before = load_index(paper_data_dir)
+        assert before is not None
+        assert "has_blog_post" not in before["papers"]["2401.12345"]
+
+        assert update_index("2401.12345", paper_data_dir) is True
+
+        after = load_index(paper_data_dir)
+        assert after is not None
+        assert after["papers"]["2401.12345"]["has_blog_post"] is True
+        assert "has_blog_post" not in before["papers"]["2401.12345"]
+
     def test_load_nonexistent_index(self, temp_data_dir: Path) -> None:
         """Test loading non-existent index returns None."""
         result = load_index(temp_data_dir)
@@ -228,147 +242,179 @@ class TestUpdateIndex:
         assert result is False
 
 
+@pytest.mark.cli
 class TestCliArguments:
     """Tests for CLI argument parsing."""
 
-    def test_valid_arguments_with_content(self, temp_data_dir: Path) -> None:
+    def test_valid_arguments_with_content(self, paper_data_dir: Path) -> None:
         """Test valid CLI arguments with --content."""
-        # Set up paper with summary
+        # Paper with summary and index entry comes from paper_data_dir
         paper_id = "2401.12345"
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": paper_id, "has_summary": True}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata))
-        (paper_dir / "summary.md").write_text("# Summary")
-
-        # Set up index
-        index: dict[str, Any] = {"version": "1.0", "papers": {paper_id: {}}}
-        (temp_data_dir / "index" / "papers.json").write_text(json.dumps(index))
 
         content = "# Blog Post\n\n" + "x" * 100  # Ensure min length
 
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "save_blog_post.py",
                 "--paper-id",
                 paper_id,
                 "--content",
                 content,
                 "--data-dir",
-                str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 0
+                str(paper_data_dir),
+            ]
+        )
+        assert result == 0
 
     def test_invalid_paper_id(self) -> None:
         """Test invalid paper ID format."""
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "save_blog_post.py",
                 "--paper-id",
                 "invalid",
                 "--content",
                 "test content",
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
 
     def test_paper_not_found(self, temp_data_dir: Path) -> None:
         """Test paper not found error."""
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "save_blog_post.py",
                 "--paper-id",
                 "2401.12345",
                 "--content",
                 "test content",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
 
-    def test_no_summary_error(self, temp_data_dir: Path) -> None:
+    def test_no_summary_error(self, temp_data_dir: Path, seed_paper: Callable[..., Path]) -> None:
         """Test paper without summary error."""
         paper_id = "2401.12345"
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": paper_id, "has_summary": False}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata))
+        seed_paper(paper_id, metadata={"id": paper_id, "has_summary": False})
 
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "save_blog_post.py",
                 "--paper-id",
                 paper_id,
                 "--content",
                 "test content",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
+
+    def test_summary_not_flagged_error(
+        self, temp_data_dir: Path, seed_paper: Callable[..., Path]
+    ) -> None:
+        """Test a summary.md without has_summary in metadata is rejected."""
+        paper_id = "2401.12345"
+        seed_paper(paper_id, metadata={"id": paper_id, "has_summary": False}, summary="# Summary")
 
-    def test_content_too_short(self, temp_data_dir: Path) -> None:
+        result = main(
+            [
+                "--paper-id",
+                paper_id,
+                "--content",
+                "# Blog Post\n\n" + "x" * 100,
+                "--data-dir",
+                str(temp_data_dir),
+            ]
+        )
+        assert result == 1
+
+    def test_content_too_short(self, paper_data_dir: Path) -> None:
         """Test content too short error."""
         paper_id = "2401.12345"
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": paper_id, "has_summary": True}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata))
-        (paper_dir / "summary.md").write_text("# Summary")
-
-        with patch(
-            "sys.argv",
+
+        result = main(
             [
-                "save_blog_post.py",
                 "--paper-id",
                 paper_id,
                 "--content",
                 "short",  # Less than 100 chars
                 "--data-dir",
-                str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+                str(paper_data_dir),
+            ]
+        )
+        assert result == 1
 
-    def test_content_file_argument(self, temp_data_dir: Path) -> None:
+    def test_content_file_argument(self, paper_data_dir: Path) -> None:
         """Test --content-file argument."""
         paper_id = "2401.12345"
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": paper_id, "has_summary": True}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata))
-        (paper_dir / "summary.md").write_text("# Summary")
-
-        # Set up index
-        index: dict[str, Any] = {"version": "1.0", "papers": {paper_id: {}}}
-        (temp_data_dir / "index" / "papers.json").write_text(json.dumps(index))
 
         # Create content file
-        content_file = temp_data_dir / "blog_content.md"
+        content_file = paper_data_dir / "blog_content.md"
         content_file.write_text("# Blog Post\n\n" + "x" * 100)
 
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "save_blog_post.py",
                 "--paper-id",
                 paper_id,
                 "--content-file",
                 str(content_file),
                 "--data-dir",
-                str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 0
+                str(paper_data_dir),
+            ]
+        )
+        assert result == 0
+
+    def test_content_file_is_copied_verbatim(self, paper_data_dir: Path) -> None:
+        """Test --content-file bytes are saved without re-encoding."""
+        content = ("# Caf\u00e9\r\n\r\n" + "x" * 100).encode("utf-8")
+        content_file = paper_data_dir / "blog_content.md"
+        content_file.write_bytes(content)
+
+        result = main(
+            [
+                "--paper-id",
+                "2401.12345",
+                "--content-file",
+                str(content_file),
+                "--data-dir",
+                str(paper_data_dir),
+            ]
+        )
+        assert result == 0
+        saved = paper_data_dir / "blog-posts" / "2401.12345.md"
+        assert saved.read_bytes() == content
+
+    def test_content_file_not_utf8(self, paper_data_dir: Path) -> None:
+        """Test a content file that is not UTF-8 is reported as a file error."""
+        content_file = paper_data_dir / "blog_content.md"
+        content_file.write_bytes(b"caf\xe9 " + b"x" * 100)
+
+        result = main(
+            [
+                "--paper-id",
+                "2401.12345",
+                "--content-file",
+                str(content_file),
+                "--data-dir",
+                str(paper_data_dir),
+            ]
+        )
+        assert result == 1
+
+    def test_metadata_and_index_share_timestamp(self, paper_data_dir: Path) -> None:
+        """Test metadata and index record the same save time."""
+        result = main(
+            [
+                "--paper-id",
+                "2401.12345",
+                "--content",
+                "# Blog Post\n\n" + "x" * 100,
+                "--data-dir",
+                str(paper_data_dir),
+            ]
+        )
+        assert result == 0
+
+        paper_dir = paper_data_dir / "papers" / "2401.12345"
+        metadata = json.loads((paper_dir / "metadata.json").read_bytes())
+        index = json.loads((paper_data_dir / "index" / "papers.json").read_bytes())
+        assert metadata["blog_post_generated_at"] == index["updated_at"]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import shutil
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -17,10 +18,17 @@ sys.path.insert(
 )
 
 from search_index import (
+    SEARCH_CACHE_NAME,
+    _find_runs,
+    _index_cache_key,
+    _load_postings,
+    _load_search_entries,
+    _score_index_fields,
     calculate_relevance,
     count_matches,
     extract_excerpt,
     load_index,
+    load_summaries,
     load_summary,
     main,
     positive_int,
@@ -30,6 +38,49 @@ from search_index import (
 )
 
 
+@pytest.fixture(scope="session")
+def populated_index(
+    tmp_path_factory: pytest.TempPathFactory, sample_papers: list[dict[str, Any]]
+) -> Path:
+    """Data directory with the sample papers indexed, built once per session.
+
+    Shared by every test that requests it, so tests must not modify it;
+    use mutable_index instead.
+    """
+    data_dir = tmp_path_factory.mktemp("search_index")
+    (data_dir / "papers").mkdir()
+    (data_dir / "index").mkdir()
+
+    now = datetime.now().isoformat()
+    index = {
+        "version": "1.0",
+        "updated_at": now,
+        "papers": {
+            paper["id"]: {
+                "title": paper["title"],
+                "authors": paper["authors"],
+                "abstract": paper["abstract"],
+                "topics": ["test topic"],
+                "collected_at": now,
+                "has_summary": False,
+            }
+            for paper in sample_papers
+        },
+    }
+    index_path = data_dir / "index" / "papers.json"
+    with index_path.open("w") as f:
+        json.dump(index, f)
+    return data_dir
+
+
+@pytest.fixture
+def mutable_index(tmp_path: Path, populated_index: Path) -> Path:
+    """Private copy of populated_index for tests that modify the data."""
+    data_dir = tmp_path / "data"
+    shutil.copytree(populated_index, data_dir)
+    return data_dir
+
+
 class TestPositiveInt:
     """Tests for positive_int argparse type."""
 
@@ -83,6 +134,14 @@ class TestValidateArxivId:
         for malicious_id in malicious_ids:
             assert not validate_arxiv_id(malicious_id)
 
+    def test_shared_valid_ids(self, valid_arxiv_id: str) -> None:
+        """Test the shared valid arXiv IDs are accepted."""
+        assert validate_arxiv_id(valid_arxiv_id) is True
+
+    def test_shared_invalid_ids(self, invalid_arxiv_id: str) -> None:
+        """Test the shared invalid arXiv IDs, including a trailing newline, are rejected."""
+        assert validate_arxiv_id(invalid_arxiv_id) is False
+
 
 class TestLoadIndex:
     """Tests for load_index function."""
@@ -111,6 +170,33 @@ class TestLoadIndex:
         assert result["version"] == "1.0"
         assert "2401.12345" in result["papers"]
 
+    def test_load_non_ascii_index(self, temp_data_dir: Path) -> None:
+        """Test that UTF-8 content is decoded from the raw index bytes."""
+        index_data = {"version": "1.0", "papers": {"2401.12345": {"title": "Café ∑ 研究"}}}
+        index_path = temp_data_dir / "index" / "papers.json"
+        index_path.write_bytes(json.dumps(index_data, ensure_ascii=False).encode("utf-8"))
+
+        result = load_index(temp_data_dir)
+
+        assert result["papers"]["2401.12345"]["title"] == "Café ∑ 研究"
+
+    def test_repeated_load_is_cached(self, temp_data_dir: Path) -> None:
+        """Test an unchanged index file is parsed only once."""
+        index_path = temp_data_dir / "index" / "papers.json"
+        index_path.write_text(json.dumps({"version": "1.0", "papers": {}}))
+
+        assert load_index(temp_data_dir) is load_index(temp_data_dir)
+
+    def test_load_after_index_change(self, temp_data_dir: Path) -> None:
+        """Test a rewritten index is reloaded rather than served from cache."""
+        index_path = temp_data_dir / "index" / "papers.json"
+        index_path.write_text(json.dumps({"version": "1.0", "papers": {}}))
+        assert load_index(temp_data_dir)["papers"] == {}
+
+        index_path.write_text(json.dumps({"version": "1.0", "papers": {"2401.12345": {}}}))
+
+        assert "2401.12345" in load_index(temp_data_dir)["papers"]
+
     def test_load_missing_index_raises_error(self, temp_data_dir: Path) -> None:
         """Test that missing index file raises FileNotFoundError."""
         with pytest.raises(FileNotFoundError):
@@ -146,6 +232,14 @@ class TestLoadSummary:
         result = load_summary("2401.99999", temp_data_dir)
         assert result is None
 
+    def test_non_utf8_summary_returns_none(self, temp_data_dir: Path) -> None:
+        """Test a summary that is not valid UTF-8 is skipped instead of raising."""
+        paper_dir = temp_data_dir / "papers" / "2401.12345"
+        paper_dir.mkdir(parents=True)
+        (paper_dir / "summary.md").write_bytes(b"caf\xe9")
+
+        assert load_summary("2401.12345", temp_data_dir) is None
+
     def test_malicious_paper_id_rejected(self, temp_data_dir: Path) -> None:
         """Test that path traversal attempts are rejected."""
         malicious_ids = [
@@ -158,6 +252,25 @@ class TestLoadSummary:
             assert result is None
 
 
+class TestLoadSummaries:
+    """Tests for load_summaries function."""
+
+    def test_parallel_matches_serial(self, temp_data_dir: Path) -> None:
+        """Test a thread-pool batch returns the same summaries, in order."""
+        paper_ids = [f"2401.{n:05d}" for n in range(60)]
+        for paper_id in paper_ids[::2]:
+            paper_dir = temp_data_dir / "papers" / paper_id
+            paper_dir.mkdir(parents=True)
+            (paper_dir / "summary.md").write_text(f"Summary of {paper_id}")
+
+        parallel = load_summaries(paper_ids, temp_data_dir)
+        serial = load_summaries(paper_ids, temp_data_dir, parallel=False)
+
+        assert parallel == serial
+        assert parallel[0] == "Summary of 2401.00000"
+        assert parallel[1] is None
+
+
 class TestTokenize:
     """Tests for tokenize function."""
 
@@ -317,35 +430,17 @@ class TestExtractExcerpt:
         result = extract_excerpt([], "some text")
         assert result == ""
 
+    def test_excerpt_centers_on_earliest_term(self) -> None:
+        """Test the excerpt is built around whichever term occurs first."""
+        text = "B" * 100 + " Attention here " + "C" * 100 + " transformers there"
+        result = extract_excerpt(["transformers", "attention"], text)
+        assert "Attention" in result
+        assert "transformers" not in result
+
 
 class TestSearchPapers:
     """Tests for search_papers function."""
 
-    @pytest.fixture
-    def populated_index(
-        self, temp_data_dir: Path, sample_papers: list[dict[str, Any]]
-    ) -> Path:
-        """Create a populated paper index for search tests."""
-        index = {
-            "version": "1.0",
-            "updated_at": datetime.now().isoformat(),
-            "papers": {
-                paper["id"]: {
-                    "title": paper["title"],
-                    "authors": paper["authors"],
-                    "abstract": paper["abstract"],
-                    "topics": ["test topic"],
-                    "collected_at": datetime.now().isoformat(),
-                    "has_summary": False,
-                }
-                for paper in sample_papers
-            },
-        }
-        index_path = temp_data_dir / "index" / "papers.json"
-        with index_path.open("w") as f:
-            json.dump(index, f)
-        return temp_data_dir
-
     def test_search_returns_results(self, populated_index: Path) -> None:
         """Test that search returns matching results."""
         results, total = search_papers("LLM Agents", populated_index, limit=10)
@@ -361,6 +456,13 @@ class TestSearchPapers:
         scores = [r["score"] for r in results]
         assert scores == sorted(scores, reverse=True)
 
+    def test_search_ties_keep_index_order(self, populated_index: Path) -> None:
+        """Test papers with equal scores are returned in index order."""
+        results, _ = search_papers("test topic", populated_index, limit=2)
+
+        assert [r["score"] for r in results] == [results[0]["score"]] * 2
+        assert [r["id"] for r in results] == ["2401.12345", "2401.12346"]
+
     def test_search_respects_limit(self, populated_index: Path) -> None:
         """Test that search respects the limit parameter."""
         results, _ = search_papers("paper", populated_index, limit=1)
@@ -377,6 +479,19 @@ class TestSearchPapers:
         with pytest.raises(FileNotFoundError):
             search_papers("test", temp_data_dir)
 
+    def test_search_entries_built_once_per_index(self, mutable_index: Path) -> None:
+        """Test the search entries are reused until the index changes."""
+        search_papers("LLM Agents", mutable_index)
+        misses_before = _load_search_entries.cache_info().misses
+
+        search_papers("reasoning", mutable_index)
+        assert _load_search_entries.cache_info().misses == misses_before
+
+        index_path = mutable_index / "index" / "papers.json"
+        index_path.write_text(index_path.read_text() + "\n")
+        search_papers("reasoning", mutable_index)
+        assert _load_search_entries.cache_info().misses == misses_before + 1
+
     def test_search_no_matches(self, populated_index: Path) -> None:
         """Test search with no matching results."""
         results, total = search_papers("xyznonexistent", populated_index)
@@ -384,40 +499,166 @@ class TestSearchPapers:
         assert len(results) == 0
         assert total == 3  # Total papers still counted
 
+    def test_search_no_matches_scores_nothing(self, populated_index: Path) -> None:
+        """Test no paper is scored when no query term appears in the index."""
+        with patch("search_index.extract_excerpt") as excerpt:
+            results, _ = search_papers("xyznonexistent", populated_index)
 
-class TestCliArguments:
-    """Tests for CLI argument parsing."""
+        assert results == []
+        excerpt.assert_not_called()
+        assert _score_index_fields(["xyznonexistent"], _index_cache_key(populated_index)) == {}
 
-    def test_missing_query_exits(self) -> None:
-        """Test that missing query argument causes exit."""
-        with pytest.raises(SystemExit):
-            with patch("sys.argv", ["search_index.py"]):
-                main()
+    def test_find_runs_matches_substrings(self) -> None:
+        """Test every run containing the term is found once, including the last."""
+        runs = ["agent", "agents", "planning", "multiagent"]
+        starts = (0, 6, 13, 22)
 
-    def test_successful_search(
-        self, temp_data_dir: Path, sample_papers: list[dict[str, Any]]
+        assert _find_runs("agent", "\n".join(runs), starts) == [0, 1, 3]
+        assert _find_runs("plan", "\n".join(runs), starts) == [2]
+        assert _find_runs("xyz", "\n".join(runs), starts) == []
+
+    def test_search_scores_match_calculate_relevance(
+        self, populated_index: Path, sample_papers: list[dict[str, Any]]
     ) -> None:
-        """Test full CLI workflow with valid arguments."""
-        # Create index
+        """Test indexed scoring agrees with calculate_relevance for every paper."""
+        query_terms = tokenize("LLM agents reasoning test agent paper paper")
+        scores = _score_index_fields(query_terms, _index_cache_key(populated_index))
+
+        for position, paper in enumerate(sample_papers):
+            indexed = {**paper, "topics": ["test topic"]}
+            assert scores.get(position, 0.0) == calculate_relevance(query_terms, indexed, None)
+
+    def test_search_matches_inside_words(self, populated_index: Path) -> None:
+        """Test a query term still matches as a substring of a longer word."""
+        results, _ = search_papers("agen", populated_index, limit=10)
+
+        assert results
+
+    def test_search_matches_summary_only(self, mutable_index: Path) -> None:
+        """Test papers matching only in their summary are still found."""
+        index_path = mutable_index / "index" / "papers.json"
+        index = json.loads(index_path.read_text())
+        index["papers"]["2401.12345"]["has_summary"] = True
+        index_path.write_text(json.dumps(index))
+        paper_dir = mutable_index / "papers" / "2401.12345"
+        paper_dir.mkdir(parents=True, exist_ok=True)
+        (paper_dir / "summary.md").write_text("Covers zyzzyva pipelines.")
+
+        results, _ = search_papers("zyzzyva", mutable_index)
+
+        assert [r["id"] for r in results] == ["2401.12345"]
+
+
+class TestSummaryLoading:
+    """Tests for best-first summary loading in search_papers."""
+
+    @pytest.fixture
+    def summarized_index(self, temp_data_dir: Path) -> Path:
+        """Index 30 summarized papers; three mention agents in the title."""
+        papers: dict[str, Any] = {}
+        for n in range(30):
+            paper_id = f"2401.{n:05d}"
+            title = f"Paper {n} on agents" if n < 3 else f"Paper {n}"
+            papers[paper_id] = {"title": title, "abstract": "", "has_summary": True}
+            paper_dir = temp_data_dir / "papers" / paper_id
+            paper_dir.mkdir()
+            summary = "Compares agents." if n in (1, 20) else "Unrelated."
+            (paper_dir / "summary.md").write_text(summary)
+
+        index = {"version": "1.0", "papers": papers}
+        (temp_data_dir / "index" / "papers.json").write_text(json.dumps(index))
+        return temp_data_dir
+
+    def test_reads_only_needed_summaries(self, summarized_index: Path) -> None:
+        """Test summaries of papers that cannot reach the top are not read."""
+        with patch("search_index.load_summary", wraps=load_summary) as loader:
+            results, _ = search_papers("agents", summarized_index, limit=1)
+
+        assert [r["id"] for r in results] == ["2401.00001"]
+        assert loader.call_count == 4
+
+    def test_matches_exhaustive_ranking(self, summarized_index: Path) -> None:
+        """Test results equal scoring every paper with its summary."""
+        index = json.loads((summarized_index / "index" / "papers.json").read_text())
+        scores = {
+            paper_id: calculate_relevance(
+                ["agents"], paper, load_summary(paper_id, summarized_index)
+            )
+            for paper_id, paper in index["papers"].items()
+        }
+        ranked = sorted(scores, key=lambda paper_id: scores[paper_id], reverse=True)
+        expected_ids = [paper_id for paper_id in ranked if scores[paper_id] > 0]
+
+        for limit in (1, 2, 3, 4, 10):
+            results, _ = search_papers("agents", summarized_index, limit=limit)
+            assert [r["id"] for r in results] == expected_ids[:limit]
+
+
+class TestPostingsCache:
+    """Tests for the postings sidecar next to papers.json."""
+
+    @pytest.fixture
+    def index_dir(self, temp_data_dir: Path, sample_papers: list[dict[str, Any]]) -> Path:
+        """Write a small index and return its directory."""
         index = {
             "version": "1.0",
-            "updated_at": datetime.now().isoformat(),
             "papers": {
-                paper["id"]: {
-                    "title": paper["title"],
-                    "authors": paper["authors"],
-                    "abstract": paper["abstract"],
-                    "topics": ["test topic"],
-                    "collected_at": datetime.now().isoformat(),
-                    "has_summary": False,
-                }
+                paper["id"]: {"title": paper["title"], "abstract": paper["abstract"]}
                 for paper in sample_papers
             },
         }
-        index_path = temp_data_dir / "index" / "papers.json"
-        with index_path.open("w") as f:
-            json.dump(index, f)
+        index_dir = temp_data_dir / "index"
+        (index_dir / "papers.json").write_text(json.dumps(index))
+        return index_dir
+
+    def test_sidecar_reused_by_new_process(self, index_dir: Path) -> None:
+        """Test a fresh process loads the postings without rebuilding them."""
+        first, _ = search_papers("LLM Agents", index_dir.parent)
+        assert (index_dir / SEARCH_CACHE_NAME).exists()
+
+        _load_postings.cache_clear()
+        with patch("search_index._build_postings", side_effect=AssertionError) as build:
+            second, _ = search_papers("LLM Agents", index_dir.parent)
+
+        build.assert_not_called()
+        assert second == first
+
+    def test_stale_sidecar_rebuilt(self, index_dir: Path) -> None:
+        """Test a sidecar from an older index version is not used."""
+        search_papers("LLM Agents", index_dir.parent)
+        index_path = index_dir / "papers.json"
+        index = json.loads(index_path.read_text())
+        index["papers"]["2401.12345"]["title"] = "Zyzzyva"
+        index_path.write_text(json.dumps(index))
+
+        _load_postings.cache_clear()
+        results, _ = search_papers("zyzzyva", index_dir.parent)
+
+        assert [r["id"] for r in results] == ["2401.12345"]
+
+    def test_corrupt_sidecar_ignored(self, index_dir: Path) -> None:
+        """Test an unreadable sidecar falls back to building the postings."""
+        expected, _ = search_papers("LLM Agents", index_dir.parent)
+        (index_dir / SEARCH_CACHE_NAME).write_bytes(b"not a marshal dump")
 
+        _load_postings.cache_clear()
+        results, _ = search_papers("LLM Agents", index_dir.parent)
+
+        assert results == expected
+
+
+@pytest.mark.cli
+class TestCliArguments:
+    """Tests for CLI argument parsing."""
+
+    def test_missing_query_exits(self) -> None:
+        """Test that missing query argument causes exit."""
+        with pytest.raises(SystemExit):
+            with patch("sys.argv", ["search_index.py"]):
+                main()
+
+    def test_successful_search(self, populated_index: Path) -> None:
+        """Test full CLI workflow with valid arguments."""
         with patch(
             "sys.argv",
             [
@@ -425,7 +666,7 @@ class TestCliArguments:
                 "--query",
                 "LLM Agents",
                 "--data-dir",
-                str(temp_data_dir),
+                str(populated_index),
                 "--limit",
                 "5",
             ],
@@ -450,30 +691,8 @@ class TestCliArguments:
 
         assert exit_code == 1
 
-    def test_custom_limit(
-        self, temp_data_dir: Path, sample_papers: list[dict[str, Any]], capsys: Any
-    ) -> None:
+    def test_custom_limit(self, populated_index: Path, capsys: Any) -> None:
         """Test that custom limit is respected."""
-        # Create index with multiple papers
-        index = {
-            "version": "1.0",
-            "updated_at": datetime.now().isoformat(),
-            "papers": {
-                paper["id"]: {
-                    "title": paper["title"],
-                    "authors": paper["authors"],
-                    "abstract": paper["abstract"],
-                    "topics": ["test topic"],
-                    "collected_at": datetime.now().isoformat(),
-                    "has_summary": False,
-                }
-                for paper in sample_papers
-            },
-        }
-        index_path = temp_data_dir / "index" / "papers.json"
-        with index_path.open("w") as f:
-            json.dump(index, f)
-
         with patch(
             "sys.argv",
             [
@@ -481,7 +700,7 @@ class TestCliArguments:
                 "--query",
                 "Test Paper",
                 "--data-dir",
-                str(temp_data_dir),
+                str(populated_index),
                 "--limit",
                 "1",
             ],
@@ -492,3 +711,17 @@ class TestCliArguments:
         captured = capsys.readouterr()
         output = json.loads(captured.out)
         assert len(output["results"]) <= 1
+
+    def test_output_preserves_non_ascii(self, populated_index: Path, capsys: Any) -> None:
+        """Test the JSON output keeps non-ASCII text and ends with a newline."""
+        with patch(
+            "sys.argv",
+            ["search_index.py", "--query", "agents café", "--data-dir", str(populated_index)],
+        ):
+            exit_code = main()
+
+        assert exit_code == 0
+        captured = capsys.readouterr()
+        assert '"agents café"' in captured.out
+        assert captured.out.endswith("}\n")
+        assert json.loads(captured.out)["query"] == "agents café"
@@ -3,19 +3,11 @@
 from __future__ import annotations
 
 import json
-import sys
 import zipfile
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any
-from unittest.mock import patch
 
 import pytest
-
-# Add scripts directory to path for imports
-sys.path.insert(
-    0, str(Path(__file__).parent.parent / "skills" / "paper-collaborator" / "scripts")
-)
-
 from share_collection import (
     build_package,
     create_manifest,
@@ -26,78 +18,76 @@ from share_collection import (
     validate_arxiv_id,
 )
 
+# Index with no papers, encoded once for the tests that need it
+_EMPTY_INDEX_BYTES = json.dumps({"version": "1.0", "papers": {}}).encode("utf-8")
 
-class TestValidateArxivId:
-    """Tests for validate_arxiv_id function."""
 
-    def test_valid_id_4_digits(self) -> None:
-        """Test valid arXiv ID with 4 digits after dot."""
-        assert validate_arxiv_id("2401.1234") is True
+@pytest.fixture
+def stored_packages(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Build packages without compression; these tests only inspect entry names."""
+    monkeypatch.setattr("share_collection.PACKAGE_COMPRESSION", zipfile.ZIP_STORED)
+
 
-    def test_valid_id_5_digits(self) -> None:
-        """Test valid arXiv ID with 5 digits after dot."""
-        assert validate_arxiv_id("2401.12345") is True
+def _zip_names(path: Path) -> list[str]:
+    """Entry names of a built package, read from its central directory."""
+    with zipfile.ZipFile(path, "r") as zf:
+        return zf.namelist()
 
-    def test_invalid_path_traversal(self) -> None:
-        """Test that path traversal attempts are rejected."""
-        assert validate_arxiv_id("../etc/passwd") is False
-        assert validate_arxiv_id("..") is False
 
-    def test_invalid_format(self) -> None:
-        """Test invalid formats are rejected."""
-        assert validate_arxiv_id("invalid") is False
-        assert validate_arxiv_id("2401.123") is False
-        assert validate_arxiv_id("2401.123456") is False
-        assert validate_arxiv_id("") is False
+class TestValidateArxivId:
+    """Tests for validate_arxiv_id function."""
+
+    @pytest.mark.parametrize(
+        ("arxiv_id", "expected"),
+        [
+            ("2401.1234", True),
+            ("2401.12345", True),
+            ("../etc/passwd", False),
+            ("..", False),
+            ("invalid", False),
+            ("2401.123", False),
+            ("2401.123456", False),
+            ("", False),
+            ("2401.12345\n", False),
+        ],
+    )
+    def test_validate(self, arxiv_id: str, expected: bool) -> None:
+        """Test IDs with 4 or 5 digits after the dot pass and others are rejected."""
+        assert validate_arxiv_id(arxiv_id) is expected
 
 
 class TestSanitizeUsername:
     """Tests for sanitize_username function."""
 
-    def test_valid_username(self) -> None:
-        """Test valid usernames pass through."""
-        assert sanitize_username("researcher") == "researcher"
-        assert sanitize_username("user_name") == "user_name"
-        assert sanitize_username("user-name") == "user-name"
-
-    def test_special_characters_replaced(self) -> None:
-        """Test special characters are replaced."""
-        assert sanitize_username("user@email.com") == "user_email_com"
-        assert sanitize_username("user name") == "user_name"
-        assert sanitize_username("user.name") == "user_name"  # Dots also replaced
+    @pytest.mark.parametrize(
+        ("username", "expected"),
+        [
+            ("researcher", "researcher"),
+            ("user_name", "user_name"),
+            ("user-name", "user-name"),
+            ("user@email.com", "user_email_com"),
+            ("user name", "user_name"),
+            ("user.name", "user_name"),  # Dots also replaced
+            ("..", "__"),
+            ("", "anonymous"),
+            ("a" * 100, "a" * 50),  # Length limited
+        ],
+    )
+    def test_sanitize(self, username: str, expected: str) -> None:
+        """Test valid names pass through and unsafe characters are replaced."""
+        assert sanitize_username(username) == expected
 
     def test_path_traversal_prevented(self) -> None:
         """Test path traversal is prevented."""
         assert ".." not in sanitize_username("../etc/passwd")
-        assert sanitize_username("..") == "__"
-
-    def test_empty_username(self) -> None:
-        """Test empty username returns anonymous."""
-        assert sanitize_username("") == "anonymous"
-
-    def test_length_limited(self) -> None:
-        """Test username length is limited."""
-        long_name = "a" * 100
-        assert len(sanitize_username(long_name)) == 50
 
 
 class TestLoadIndex:
     """Tests for load_index function."""
 
-    def test_load_existing_index(self, temp_data_dir: Path) -> None:
+    def test_load_existing_index(self, prebuilt_data_dir: Path) -> None:
         """Test loading existing index."""
-        # Create index
-        index_dir = temp_data_dir / "index"
-        index_dir.mkdir(parents=True, exist_ok=True)
-        index_path = index_dir / "papers.json"
-        index_data: dict[str, Any] = {
-            "version": "1.0",
-            "papers": {"2401.12345": {"title": "Test Paper"}},
-        }
-        index_path.write_text(json.dumps(index_data), encoding="utf-8")
-
-        # Load index
-        index = load_index(temp_data_dir)
+        index = load_index(prebuilt_data_dir)
         assert index["version"] == "1.0"
         assert "2401.12345" in index["papers"]
 
@@ -110,18 +100,11 @@ class TestLoadIndex:
 class TestLoadPaperMetadata:
     """Tests for load_paper_metadata function."""
 
-    def test_load_existing_paper(self, temp_data_dir: Path) -> None:
+    def test_load_existing_paper(self, prebuilt_data_dir: Path) -> None:
         """Test loading existing paper metadata."""
-        # Create paper
-        paper_dir = temp_data_dir / "papers" / "2401.12345"
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": "2401.12345", "title": "Test Paper"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
-
-        # Load metadata
-        result = load_paper_metadata("2401.12345", temp_data_dir)
+        result = load_paper_metadata("2401.12345", prebuilt_data_dir)
         assert result is not None
-        assert result["title"] == "Test Paper"
+        assert result["title"] == "Test"
 
     def test_missing_paper(self, temp_data_dir: Path) -> None:
         """Test None returned for missing paper."""
@@ -156,16 +139,14 @@ class TestCreateManifest:
         assert "created_at" in manifest
 
 
+@pytest.mark.usefixtures("stored_packages")
 class TestBuildPackage:
     """Tests for build_package function."""
 
     def test_build_empty_collection(self, temp_data_dir: Path) -> None:
         """Test building package with no papers."""
         # Create empty index
-        index_dir = temp_data_dir / "index"
-        index_dir.mkdir(parents=True, exist_ok=True)
-        index_data: dict[str, Any] = {"version": "1.0", "papers": {}}
-        (index_dir / "papers.json").write_text(json.dumps(index_data), encoding="utf-8")
+        (temp_data_dir / "index" / "papers.json").write_bytes(_EMPTY_INDEX_BYTES)
 
         output_path = temp_data_dir / "test.zip"
         count, ids = build_package(
@@ -182,191 +163,148 @@ class TestBuildPackage:
         assert ids == []
         assert not output_path.exists()
 
-    def test_build_with_papers(self, temp_data_dir: Path) -> None:
-        """Test building package with papers."""
-        # Create paper
+    @pytest.mark.parametrize(
+        ("include_summaries", "include_annotations", "expected", "excluded"),
+        [
+            (False, False, "metadata.json", "summary.md"),
+            (True, False, "summary.md", "annotations/"),
+            (False, True, "annotations/test_annotation.json", "summary.md"),
+        ],
+        ids=["papers", "summaries", "annotations"],
+    )
+    def test_build_with_papers(
+        self,
+        prebuilt_data_dir: Path,
+        tmp_path: Path,
+        include_summaries: bool,
+        include_annotations: bool,
+        expected: str,
+        excluded: str,
+    ) -> None:
+        """Test building a package includes exactly the requested paper files."""
         paper_id = "2401.12345"
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": paper_id, "title": "Test Paper"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
-
-        # Create index
-        index_dir = temp_data_dir / "index"
-        index_dir.mkdir(parents=True, exist_ok=True)
-        index_data: dict[str, Any] = {
-            "version": "1.0",
-            "papers": {paper_id: {"title": "Test Paper"}},
-        }
-        (index_dir / "papers.json").write_text(json.dumps(index_data), encoding="utf-8")
-
-        # Build package
-        output_path = temp_data_dir / "test.zip"
+
+        output_path = tmp_path / "test.zip"
         count, ids = build_package(
-            data_dir=temp_data_dir,
+            data_dir=prebuilt_data_dir,
             output_path=output_path,
             paper_ids=None,
-            include_summaries=False,
-            include_annotations=False,
+            include_summaries=include_summaries,
+            include_annotations=include_annotations,
             username="test",
             description="Test",
         )
 
         assert count == 1
-        assert paper_id in ids
-        assert output_path.exists()
+        assert ids == [paper_id]
 
         # Verify ZIP contents
-        with zipfile.ZipFile(output_path, "r") as zf:
-            assert "manifest.json" in zf.namelist()
-            assert f"papers/{paper_id}/metadata.json" in zf.namelist()
-            assert "index/papers.json" in zf.namelist()
-
-    def test_build_with_summaries(self, temp_data_dir: Path) -> None:
-        """Test including summaries in package."""
-        # Create paper with summary
+        names = set(_zip_names(output_path))
+        assert {"manifest.json", f"papers/{paper_id}/metadata.json", "index/papers.json"} <= names
+        assert f"papers/{paper_id}/{expected}" in names
+        assert not any(name.startswith(f"papers/{paper_id}/{excluded}") for name in names)
+
+    def test_build_skips_non_annotation_entries(
+        self, temp_data_dir: Path, seed_paper: Callable[..., Path]
+    ) -> None:
+        """Test only .json files from annotations/ are packaged, dotfiles included."""
         paper_id = "2401.12345"
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": paper_id, "title": "Test Paper"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
-        (paper_dir / "summary.md").write_text("# Summary\n\nTest summary.", encoding="utf-8")
-
-        # Create index
-        index_dir = temp_data_dir / "index"
-        index_dir.mkdir(parents=True, exist_ok=True)
-        index_data: dict[str, Any] = {
-            "version": "1.0",
-            "papers": {paper_id: {"title": "Test Paper"}},
-        }
-        (index_dir / "papers.json").write_text(json.dumps(index_data), encoding="utf-8")
-
-        # Build package with summaries
+        paper_dir = seed_paper(
+            paper_id,
+            metadata={"id": paper_id, "title": "Test Paper"},
+            with_index=True,
+            with_annotations=True,
+        )
+        annotations_dir = paper_dir / "annotations"
+        (annotations_dir / "note.json").write_text("{}", encoding="utf-8")
+        (annotations_dir / ".hidden.json").write_text("{}", encoding="utf-8")
+        (annotations_dir / "readme.txt").write_text("not an annotation", encoding="utf-8")
+        (annotations_dir / "nested.json").mkdir()
+
         output_path = temp_data_dir / "test.zip"
-        count, ids = build_package(
+        build_package(
             data_dir=temp_data_dir,
             output_path=output_path,
             paper_ids=None,
-            include_summaries=True,
-            include_annotations=False,
+            include_summaries=False,
+            include_annotations=True,
             username="test",
             description=None,
         )
 
-        # Verify summary included
-        with zipfile.ZipFile(output_path, "r") as zf:
-            assert f"papers/{paper_id}/summary.md" in zf.namelist()
+        annotation_names = sorted(n for n in _zip_names(output_path) if "/annotations/" in n)
+        assert annotation_names == [
+            f"papers/{paper_id}/annotations/.hidden.json",
+            f"papers/{paper_id}/annotations/note.json",
+        ]
 
-    def test_build_with_annotations(self, temp_data_dir: Path) -> None:
-        """Test including annotations in package."""
-        # Create paper with annotation
-        paper_id = "2401.12345"
-        paper_dir = temp_data_dir / "papers" / paper_id
-        annotations_dir = paper_dir / "annotations"
-        annotations_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": paper_id, "title": "Test Paper"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
-        annotation: dict[str, Any] = {"id": "abc123", "content": "Test note"}
-        (annotations_dir / "test_annotation.json").write_text(
-            json.dumps(annotation), encoding="utf-8"
-        )
 
-        # Create index
-        index_dir = temp_data_dir / "index"
-        index_dir.mkdir(parents=True, exist_ok=True)
-        index_data: dict[str, Any] = {
-            "version": "1.0",
-            "papers": {paper_id: {"title": "Test Paper"}},
-        }
-        (index_dir / "papers.json").write_text(json.dumps(index_data), encoding="utf-8")
+class TestPackageCompression:
+    """Tests for the compression of built packages."""
 
-        # Build package with annotations
-        output_path = temp_data_dir / "test.zip"
+    def test_entries_deflated_by_default(self, prebuilt_data_dir: Path, tmp_path: Path) -> None:
+        """Test packages are written with deflate compression."""
+        output_path = tmp_path / "test.zip"
         build_package(
-            data_dir=temp_data_dir,
+            data_dir=prebuilt_data_dir,
             output_path=output_path,
             paper_ids=None,
-            include_summaries=False,
+            include_summaries=True,
             include_annotations=True,
             username="test",
             description=None,
         )
 
-        # Verify annotation included
         with zipfile.ZipFile(output_path, "r") as zf:
-            names = zf.namelist()
-            assert any("annotations" in name for name in names)
+            assert {i.compress_type for i in zf.infolist()} == {zipfile.ZIP_DEFLATED}
 
 
+@pytest.mark.cli
+@pytest.mark.usefixtures("stored_packages")
 class TestMainFunction:
     """Tests for CLI interface."""
 
-    def test_valid_arguments(self, temp_data_dir: Path) -> None:
+    def test_valid_arguments(self, prebuilt_data_dir: Path, tmp_path: Path) -> None:
         """Test valid CLI arguments."""
-        # Create paper
-        paper_id = "2401.12345"
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-        metadata: dict[str, Any] = {"id": paper_id, "title": "Test Paper"}
-        (paper_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
-
-        # Create index
-        index_dir = temp_data_dir / "index"
-        index_dir.mkdir(parents=True, exist_ok=True)
-        index_data: dict[str, Any] = {
-            "version": "1.0",
-            "papers": {paper_id: {"title": "Test Paper"}},
-        }
-        (index_dir / "papers.json").write_text(json.dumps(index_data), encoding="utf-8")
-
-        output_path = temp_data_dir / "output.zip"
+        output_path = tmp_path / "output.zip"
 
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "share_collection.py",
                 "--output",
                 str(output_path),
                 "--data-dir",
-                str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 0
-            assert output_path.exists()
+                str(prebuilt_data_dir),
+            ]
+        )
+        assert result == 0
+        assert output_path.exists()
 
     def test_invalid_paper_id(self, temp_data_dir: Path) -> None:
         """Test invalid paper ID argument."""
         output_path = temp_data_dir / "output.zip"
 
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "share_collection.py",
                 "--output",
                 str(output_path),
                 "--paper-id",
                 "../invalid",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
 
     def test_missing_index(self, temp_data_dir: Path) -> None:
         """Test error when no papers collected."""
         output_path = temp_data_dir / "output.zip"
 
-        with patch(
-            "sys.argv",
+        result = main(
             [
-                "share_collection.py",
                 "--output",
                 str(output_path),
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            result = main()
-            assert result == 1
+            ]
+        )
+        assert result == 1
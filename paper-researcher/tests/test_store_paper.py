@@ -3,16 +3,11 @@
 from __future__ import annotations
 
 import json
-import sys
+import os
 from pathlib import Path
 from typing import Any
-from unittest.mock import patch
 
 import pytest
-
-# Add scripts directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "paper-collector" / "scripts"))
-
 from store_paper import (
     load_index,
     main,
@@ -25,47 +20,33 @@ from store_paper import (
 class TestValidateArxivId:
     """Tests for validate_arxiv_id function."""
 
-    def test_valid_arxiv_id(self) -> None:
-        """Test that valid arXiv IDs are accepted."""
-        assert validate_arxiv_id("2401.12345") is True
-        assert validate_arxiv_id("1234.5678") is True
-        assert validate_arxiv_id("2401.99999") is True  # 5-digit variant
-
-    def test_invalid_arxiv_id_format(self) -> None:
-        """Test that invalid arXiv ID formats are rejected."""
-        assert validate_arxiv_id("not-valid") is False
-        assert validate_arxiv_id("12345") is False
-        assert validate_arxiv_id("") is False
-        assert validate_arxiv_id("../../../etc/passwd") is False
+    @pytest.mark.parametrize(
+        ("arxiv_id", "expected"),
+        [
+            ("2401.12345", True),
+            ("1234.5678", True),
+            ("2401.99999", True),  # 5-digit variant
+            ("not-valid", False),
+            ("12345", False),
+            ("", False),
+            ("2401.12345\n", False),
+            ("../../../etc/passwd", False),
+        ],
+    )
+    def test_validate(self, arxiv_id: str, expected: bool) -> None:
+        """Test that valid arXiv IDs are accepted and invalid formats rejected."""
+        assert validate_arxiv_id(arxiv_id) is expected
 
 
 class TestLoadIndex:
     """Tests for load_index function."""
 
-    def test_load_existing_index(self, temp_data_dir: Path) -> None:
+    def test_load_existing_index(self, prebuilt_data_dir: Path) -> None:
         """Test loading an existing index file."""
-        index_data = {
-            "version": "1.0",
-            "updated_at": "2024-01-01T00:00:00",
-            "papers": {
-                "2401.12345": {
-                    "title": "Existing Paper",
-                    "authors": ["Author"],
-                    "topics": [],
-                    "collected_at": "2024-01-01T00:00:00",
-                    "has_summary": False,
-                }
-            },
-        }
-
-        index_path = temp_data_dir / "index" / "papers.json"
-        with index_path.open("w") as f:
-            json.dump(index_data, f)
-
-        loaded = load_index(temp_data_dir)
+        loaded = load_index(prebuilt_data_dir)
 
         assert loaded["version"] == "1.0"
-        assert "2401.12345" in loaded["papers"]
+        assert loaded["papers"]["2401.12345"]["title"] == "Test"
 
     def test_load_nonexistent_index(self, temp_data_dir: Path) -> None:
         """Test loading when index doesn't exist."""
@@ -85,6 +66,15 @@ class TestLoadIndex:
         assert loaded["version"] == "1.0"
         assert loaded["papers"] == {}
 
+    def test_load_non_utf8_index(self, temp_data_dir: Path) -> None:
+        """Test an index that is not UTF-8 is treated as corrupted."""
+        index_path = temp_data_dir / "index" / "papers.json"
+        index_path.write_bytes(b'{"version": "1.0", "papers": {"caf\xe9": {}}}')
+
+        loaded = load_index(temp_data_dir)
+
+        assert loaded["papers"] == {}
+
 
 class TestSavePaper:
     """Tests for save_paper function."""
@@ -184,6 +174,10 @@ class TestDuplicateDetection:
 
         assert result is False  # Should be detected as duplicate
 
+        # The original metadata is left untouched
+        metadata_path = temp_data_dir / "papers" / paper1["id"] / "metadata.json"
+        assert json.loads(metadata_path.read_bytes())["title"] == paper1["title"]
+
     def test_different_ids_not_duplicates(
         self, temp_data_dir: Path, sample_papers: list[dict[str, Any]]
     ) -> None:
@@ -196,6 +190,17 @@ class TestDuplicateDetection:
         assert all(results)
         assert len(results) == len(sample_papers)
 
+    def test_save_into_existing_paper_dir(
+        self, temp_data_dir: Path, sample_paper: dict[str, Any]
+    ) -> None:
+        """Test a paper directory without metadata does not count as a duplicate."""
+        paper_dir = temp_data_dir / "papers" / sample_paper["id"]
+        os.makedirs(paper_dir / "annotations")
+
+        assert save_paper(sample_paper, temp_data_dir) is True
+        assert (paper_dir / "metadata.json").exists()
+        assert (paper_dir / "annotations").is_dir()
+
 
 class TestUpdateIndex:
     """Tests for update_index function."""
@@ -260,6 +265,8 @@ class TestUpdateIndex:
 
         saved_ids = {p["id"] for p in sample_papers}
         update_index(index, sample_papers, temp_data_dir, saved_ids)
+        index_path = temp_data_dir / "index" / "papers.json"
+        first_write = index_path.stat()
 
         # Update again with same papers
         update_index(index, sample_papers, temp_data_dir, saved_ids)
@@ -267,41 +274,63 @@ class TestUpdateIndex:
         # Should still have same count (no duplicates)
         assert len(index["papers"]) == len(sample_papers)
 
+        # Nothing changed, so the index file was not rewritten
+        second = index_path.stat()
+        assert (second.st_ino, second.st_mtime_ns) == (first_write.st_ino, first_write.st_mtime_ns)
+
+    def test_unchanged_index_written_when_missing(
+        self, temp_data_dir: Path, sample_papers: list[dict[str, Any]]
+    ) -> None:
+        """Test an index with nothing new is still written if no file exists yet."""
+        index: dict[str, Any] = {
+            "version": "1.0",
+            "updated_at": "",
+            "papers": {p["id"]: {"title": p["title"]} for p in sample_papers},
+        }
+
+        update_index(index, sample_papers, temp_data_dir, set())
+
+        assert (temp_data_dir / "index" / "papers.json").exists()
+
+    def test_corrupted_index_rewritten_with_nothing_added(self, temp_data_dir: Path) -> None:
+        """Test a corrupted index is regenerated even when no papers are added."""
+        index_path = temp_data_dir / "index" / "papers.json"
+        index_path.write_text("not valid json {{{")
+
+        update_index(load_index(temp_data_dir), [], temp_data_dir, set())
+
+        rewritten = json.loads(index_path.read_text())
+        assert rewritten["version"] == "1.0"
+        assert rewritten["papers"] == {}
+
 
+@pytest.mark.cli
 class TestCliArguments:
     """Tests for CLI argument parsing."""
 
     def test_required_input_argument(self) -> None:
         """Test that --input is required."""
         with pytest.raises(SystemExit):
-            with patch("sys.argv", ["store_paper.py"]):
-                main()
+            main([])
 
     def test_input_file_not_found(self, tmp_path: Path) -> None:
         """Test handling of non-existent input file."""
         nonexistent = tmp_path / "does_not_exist.json"
 
-        with patch(
-            "sys.argv",
-            ["store_paper.py", "--input", str(nonexistent)],
-        ):
-            exit_code = main()
+        exit_code = main(["--input", str(nonexistent)])
 
         assert exit_code == 1
 
     def test_full_workflow(self, temp_fetch_output: Path, temp_data_dir: Path) -> None:
         """Test full CLI workflow."""
-        with patch(
-            "sys.argv",
+        exit_code = main(
             [
-                "store_paper.py",
                 "--input",
                 str(temp_fetch_output),
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            exit_code = main()
+            ]
+        )
 
         assert exit_code == 0
 
@@ -320,11 +349,7 @@ class TestCliArguments:
         # Change to tmp_path so default ./data is created there
         monkeypatch.chdir(tmp_path)
 
-        with patch(
-            "sys.argv",
-            ["store_paper.py", "--input", str(temp_fetch_output)],
-        ):
-            exit_code = main()
+        exit_code = main(["--input", str(temp_fetch_output)])
 
         assert exit_code == 0
         assert (tmp_path / "data" / "index" / "papers.json").exists()
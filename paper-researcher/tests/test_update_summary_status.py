@@ -3,18 +3,11 @@
 from __future__ import annotations
 
 import json
-import sys
+import os
 from pathlib import Path
 from typing import Any
-from unittest.mock import patch
 
 import pytest
-
-# Add scripts directory to path for imports
-sys.path.insert(
-    0, str(Path(__file__).parent.parent / "skills" / "paper-summarizer" / "scripts")
-)
-
 from update_summary_status import (
     main,
     update_index,
@@ -22,54 +15,105 @@ from update_summary_status import (
     validate_arxiv_id,
 )
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
 
-class TestValidateArxivId:
-    """Tests for validate_arxiv_id function."""
 
-    def test_valid_arxiv_id(self) -> None:
-        """Test that valid arXiv IDs are accepted."""
-        assert validate_arxiv_id("2401.12345") is True
-        assert validate_arxiv_id("1234.5678") is True
-        assert validate_arxiv_id("2401.99999") is True  # 5-digit variant
+def _dumps(obj: Any) -> bytes:
+    """Serialize a test fixture as JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
 
-    def test_invalid_arxiv_id_format(self) -> None:
-        """Test that invalid arXiv ID formats are rejected."""
-        assert validate_arxiv_id("not-valid") is False
-        assert validate_arxiv_id("12345") is False
-        assert validate_arxiv_id("") is False
-        assert validate_arxiv_id("../../../etc/passwd") is False
 
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_bytes())
 
-class TestUpdateMetadata:
-    """Tests for update_metadata function."""
 
-    def test_update_existing_metadata(
-        self, temp_data_dir: Path, sample_paper: dict[str, Any]
-    ) -> None:
-        """Test updating existing metadata file."""
-        paper_id = sample_paper["id"]
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-
-        # Create initial metadata
-        metadata_path = paper_dir / "metadata.json"
-        initial_metadata = {
+@pytest.fixture(scope="session")
+def unsummarized_metadata(sample_paper: dict[str, Any]) -> bytes:
+    """metadata.json contents of the sample paper before summarization."""
+    return _dumps(
+        {
             **sample_paper,
             "collected_at": "2024-01-01T00:00:00",
             "topics": [],
             "has_summary": False,
         }
-        with metadata_path.open("w") as f:
-            json.dump(initial_metadata, f)
+    )
+
+
+@pytest.fixture(scope="session")
+def unsummarized_index(sample_paper: dict[str, Any]) -> bytes:
+    """index/papers.json contents listing the sample paper before summarization."""
+    return _dumps(
+        {
+            "version": "1.0",
+            "updated_at": "2024-01-01T00:00:00",
+            "papers": {
+                sample_paper["id"]: {
+                    "title": sample_paper["title"],
+                    "authors": sample_paper["authors"],
+                    "topics": [],
+                    "collected_at": "2024-01-01T00:00:00",
+                    "has_summary": False,
+                }
+            },
+        }
+    )
+
+
+@pytest.fixture
+def unsummarized_paper(
+    temp_data_dir: Path, sample_paper: dict[str, Any], unsummarized_metadata: bytes
+) -> Path:
+    """Paper directory holding the sample paper's unsummarized metadata.json."""
+    paper_dir: Path = temp_data_dir / "papers" / sample_paper["id"]
+    os.makedirs(paper_dir)
+    (paper_dir / "metadata.json").write_bytes(unsummarized_metadata)
+    return paper_dir
+
+
+class TestValidateArxivId:
+    """Tests for validate_arxiv_id function."""
+
+    @pytest.mark.parametrize(
+        ("arxiv_id", "expected"),
+        [
+            ("2401.12345", True),
+            ("1234.5678", True),
+            ("2401.99999", True),  # 5-digit variant
+            ("not-valid", False),
+            ("12345", False),
+            ("", False),
+            ("2401.12345\n", False),
+            ("../../../etc/passwd", False),
+        ],
+    )
+    def test_validate(self, arxiv_id: str, expected: bool) -> None:
+        """Test that valid arXiv IDs are accepted and invalid formats rejected."""
+        assert validate_arxiv_id(arxiv_id) is expected
+
+
+class TestUpdateMetadata:
+    """Tests for update_metadata function."""
+
+    def test_update_existing_metadata(self, temp_data_dir: Path, unsummarized_paper: Path) -> None:
+        """Test updating existing metadata file."""
+        metadata_path = unsummarized_paper / "metadata.json"
 
         # Update metadata
-        result = update_metadata(paper_id, temp_data_dir)
+        result = update_metadata(unsummarized_paper.name, temp_data_dir)
 
         assert result is True
 
         # Verify update
-        with metadata_path.open() as f:
-            updated = json.load(f)
+        updated = _read_json(metadata_path)
 
         assert updated["has_summary"] is True
         assert "summary_generated_at" in updated
@@ -79,19 +123,19 @@ class TestUpdateMetadata:
         result = update_metadata("2401.99999", temp_data_dir)
         assert result is False
 
-    def test_update_corrupted_metadata(
-        self, temp_data_dir: Path, sample_paper: dict[str, Any]
-    ) -> None:
+    def test_update_corrupted_metadata(self, temp_data_dir: Path, unsummarized_paper: Path) -> None:
         """Test handling of corrupted metadata file."""
-        paper_id = sample_paper["id"]
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
+        # Corrupt the metadata
+        (unsummarized_paper / "metadata.json").write_bytes(b"not valid json {{{")
+
+        result = update_metadata(unsummarized_paper.name, temp_data_dir)
+        assert result is False
 
-        # Create corrupted metadata
-        metadata_path = paper_dir / "metadata.json"
-        metadata_path.write_text("not valid json {{{")
+    def test_update_non_utf8_metadata(self, temp_data_dir: Path, unsummarized_paper: Path) -> None:
+        """Test a metadata file that is not UTF-8 is reported, not raised."""
+        (unsummarized_paper / "metadata.json").write_bytes(b'{"title": "caf\xe9"}')
 
-        result = update_metadata(paper_id, temp_data_dir)
+        result = update_metadata(unsummarized_paper.name, temp_data_dir)
         assert result is False
 
 
@@ -99,29 +143,14 @@ class TestUpdateIndex:
     """Tests for update_index function."""
 
     def test_update_existing_index(
-        self, temp_data_dir: Path, sample_paper: dict[str, Any]
+        self, temp_data_dir: Path, sample_paper: dict[str, Any], unsummarized_index: bytes
     ) -> None:
         """Test updating existing index file."""
         paper_id = sample_paper["id"]
 
         # Create index with paper entry
-        index_data = {
-            "version": "1.0",
-            "updated_at": "2024-01-01T00:00:00",
-            "papers": {
-                paper_id: {
-                    "title": sample_paper["title"],
-                    "authors": sample_paper["authors"],
-                    "topics": [],
-                    "collected_at": "2024-01-01T00:00:00",
-                    "has_summary": False,
-                }
-            },
-        }
-
         index_path = temp_data_dir / "index" / "papers.json"
-        with index_path.open("w") as f:
-            json.dump(index_data, f)
+        index_path.write_bytes(unsummarized_index)
 
         # Update index
         result = update_index(paper_id, temp_data_dir)
@@ -129,8 +158,7 @@ class TestUpdateIndex:
         assert result is True
 
         # Verify update
-        with index_path.open() as f:
-            updated = json.load(f)
+        updated = _read_json(index_path)
 
         assert updated["papers"][paper_id]["has_summary"] is True
         assert updated["updated_at"] != "2024-01-01T00:00:00"
@@ -155,8 +183,7 @@ class TestUpdateIndex:
         }
 
         index_path = temp_data_dir / "index" / "papers.json"
-        with index_path.open("w") as f:
-            json.dump(index_data, f)
+        index_path.write_bytes(_dumps(index_data))
 
         result = update_index("2401.99999", temp_data_dir)
         assert result is False
@@ -164,7 +191,7 @@ class TestUpdateIndex:
     def test_update_corrupted_index(self, temp_data_dir: Path) -> None:
         """Test handling of corrupted index file."""
         index_path = temp_data_dir / "index" / "papers.json"
-        index_path.write_text("not valid json {{{")
+        index_path.write_bytes(b"not valid json {{{")
 
         result = update_index("2401.12345", temp_data_dir)
         assert result is False
@@ -173,188 +200,135 @@ class TestUpdateIndex:
 class TestAtomicWrite:
     """Tests for atomic file writing behavior."""
 
-    def test_metadata_atomic_update(
-        self, temp_data_dir: Path, sample_paper: dict[str, Any]
-    ) -> None:
+    def test_metadata_atomic_update(self, temp_data_dir: Path, unsummarized_paper: Path) -> None:
         """Test that metadata update is atomic."""
-        paper_id = sample_paper["id"]
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-
-        # Create initial metadata
-        metadata_path = paper_dir / "metadata.json"
-        initial_metadata = {
-            **sample_paper,
-            "collected_at": "2024-01-01T00:00:00",
-            "topics": [],
-            "has_summary": False,
-        }
-        with metadata_path.open("w") as f:
-            json.dump(initial_metadata, f)
+        metadata_path = unsummarized_paper / "metadata.json"
 
         # Update should complete atomically
-        result = update_metadata(paper_id, temp_data_dir)
+        result = update_metadata(unsummarized_paper.name, temp_data_dir)
         assert result is True
 
-        # File should be valid JSON after update
-        with metadata_path.open() as f:
-            updated = json.load(f)
-        assert updated["has_summary"] is True
+        # The temp file was renamed over the original, leaving nothing behind
+        assert [p.name for p in unsummarized_paper.iterdir()] == ["metadata.json"]
+        assert _read_json(metadata_path)["has_summary"] is True
+
+    def test_failed_replace_keeps_original(
+        self,
+        temp_data_dir: Path,
+        unsummarized_paper: Path,
+        unsummarized_metadata: bytes,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test a failed rename leaves the original metadata and no temp file."""
+
+        def fail_replace(self: Path, target: Path) -> Path:
+            raise OSError("rename failed")
+
+        monkeypatch.setattr(Path, "replace", fail_replace)
+
+        assert update_metadata(unsummarized_paper.name, temp_data_dir) is False
+
+        assert [p.name for p in unsummarized_paper.iterdir()] == ["metadata.json"]
+        assert (unsummarized_paper / "metadata.json").read_bytes() == unsummarized_metadata
+
+    def test_metadata_written_indented(self, temp_data_dir: Path, unsummarized_paper: Path) -> None:
+        """Test metadata is rewritten as indented UTF-8 JSON."""
+        metadata_path = unsummarized_paper / "metadata.json"
+        metadata_path.write_bytes(_dumps({"id": unsummarized_paper.name, "title": "Café"}))
+
+        assert update_metadata(unsummarized_paper.name, temp_data_dir) is True
+
+        raw = metadata_path.read_bytes()
+        assert b'\n  "has_summary": true' in raw
+        assert "Café".encode() in raw
 
     def test_index_atomic_update(
-        self, temp_data_dir: Path, sample_paper: dict[str, Any]
+        self, temp_data_dir: Path, sample_paper: dict[str, Any], unsummarized_index: bytes
     ) -> None:
         """Test that index update is atomic."""
         paper_id = sample_paper["id"]
 
         # Create index
-        index_data = {
-            "version": "1.0",
-            "updated_at": "2024-01-01T00:00:00",
-            "papers": {
-                paper_id: {
-                    "title": sample_paper["title"],
-                    "authors": sample_paper["authors"],
-                    "topics": [],
-                    "collected_at": "2024-01-01T00:00:00",
-                    "has_summary": False,
-                }
-            },
-        }
-
         index_path = temp_data_dir / "index" / "papers.json"
-        with index_path.open("w") as f:
-            json.dump(index_data, f)
+        index_path.write_bytes(unsummarized_index)
 
         # Update should complete atomically
         result = update_index(paper_id, temp_data_dir)
         assert result is True
 
-        # File should be valid JSON after update
-        with index_path.open() as f:
-            updated = json.load(f)
-        assert updated["papers"][paper_id]["has_summary"] is True
+        # The temp file was renamed over the original, leaving nothing behind
+        assert [p.name for p in index_path.parent.iterdir()] == ["papers.json"]
+        assert _read_json(index_path)["papers"][paper_id]["has_summary"] is True
 
 
+@pytest.mark.cli
 class TestCliArguments:
     """Tests for CLI argument parsing."""
 
     def test_required_paper_id_argument(self) -> None:
         """Test that --paper-id is required."""
         with pytest.raises(SystemExit):
-            with patch("sys.argv", ["update_summary_status.py"]):
-                main()
+            main([])
 
     def test_invalid_paper_id_format(self, tmp_path: Path) -> None:
         """Test handling of invalid paper ID format."""
-        with patch(
-            "sys.argv",
+        exit_code = main(
             [
-                "update_summary_status.py",
                 "--paper-id",
                 "not-valid-id",
                 "--data-dir",
                 str(tmp_path),
-            ],
-        ):
-            exit_code = main()
+            ]
+        )
 
         assert exit_code == 1
 
     def test_paper_not_found(self, temp_data_dir: Path) -> None:
         """Test handling of paper not in collection."""
-        with patch(
-            "sys.argv",
+        exit_code = main(
             [
-                "update_summary_status.py",
                 "--paper-id",
                 "2401.99999",
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            exit_code = main()
+            ]
+        )
 
         assert exit_code == 1
 
     def test_full_workflow(
-        self, temp_data_dir: Path, sample_paper: dict[str, Any]
+        self, temp_data_dir: Path, unsummarized_paper: Path, unsummarized_index: bytes
     ) -> None:
         """Test full CLI workflow."""
-        paper_id = sample_paper["id"]
-
-        # Setup: Create paper directory and metadata
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-
-        metadata = {
-            **sample_paper,
-            "collected_at": "2024-01-01T00:00:00",
-            "topics": [],
-            "has_summary": False,
-        }
-        with (paper_dir / "metadata.json").open("w") as f:
-            json.dump(metadata, f)
+        paper_dir = unsummarized_paper
+        paper_id = paper_dir.name
 
         # Setup: Create index
-        index_data = {
-            "version": "1.0",
-            "updated_at": "2024-01-01T00:00:00",
-            "papers": {
-                paper_id: {
-                    "title": sample_paper["title"],
-                    "authors": sample_paper["authors"],
-                    "topics": [],
-                    "collected_at": "2024-01-01T00:00:00",
-                    "has_summary": False,
-                }
-            },
-        }
-        with (temp_data_dir / "index" / "papers.json").open("w") as f:
-            json.dump(index_data, f)
+        (temp_data_dir / "index" / "papers.json").write_bytes(unsummarized_index)
 
         # Run CLI
-        with patch(
-            "sys.argv",
+        exit_code = main(
             [
-                "update_summary_status.py",
                 "--paper-id",
                 paper_id,
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            exit_code = main()
+            ]
+        )
 
         assert exit_code == 0
 
         # Verify both files were updated
-        with (paper_dir / "metadata.json").open() as f:
-            updated_metadata = json.load(f)
+        updated_metadata = _read_json(paper_dir / "metadata.json")
         assert updated_metadata["has_summary"] is True
 
-        with (temp_data_dir / "index" / "papers.json").open() as f:
-            updated_index = json.load(f)
+        updated_index = _read_json(temp_data_dir / "index" / "papers.json")
         assert updated_index["papers"][paper_id]["has_summary"] is True
 
-    def test_metadata_only_update(
-        self, temp_data_dir: Path, sample_paper: dict[str, Any]
-    ) -> None:
+    def test_metadata_only_update(self, temp_data_dir: Path, unsummarized_paper: Path) -> None:
         """Test workflow when index update fails but metadata succeeds."""
-        paper_id = sample_paper["id"]
-
-        # Setup: Create paper directory and metadata only (no index)
-        paper_dir = temp_data_dir / "papers" / paper_id
-        paper_dir.mkdir(parents=True)
-
-        metadata = {
-            **sample_paper,
-            "collected_at": "2024-01-01T00:00:00",
-            "topics": [],
-            "has_summary": False,
-        }
-        with (paper_dir / "metadata.json").open("w") as f:
-            json.dump(metadata, f)
+        paper_dir = unsummarized_paper
+        paper_id = paper_dir.name
 
         # Remove index file if exists
         index_path = temp_data_dir / "index" / "papers.json"
@@ -362,22 +336,18 @@ class TestCliArguments:
             index_path.unlink()
 
         # Run CLI - should succeed even if index update fails
-        with patch(
-            "sys.argv",
+        exit_code = main(
             [
-                "update_summary_status.py",
                 "--paper-id",
                 paper_id,
                 "--data-dir",
                 str(temp_data_dir),
-            ],
-        ):
-            exit_code = main()
+            ]
+        )
 
         # Should succeed (metadata updated even if index failed)
         assert exit_code == 0
 
         # Verify metadata was updated
-        with (paper_dir / "metadata.json").open() as f:
-            updated_metadata = json.load(f)
+        updated_metadata = _read_json(paper_dir / "metadata.json")
         assert updated_metadata["has_summary"] is True